@@ -1,110 +1,117 @@
 import asyncio
+import hashlib
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import os
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, List, Dict, Any, Optional, Tuple
 from datetime import datetime
-import random
 
-from .product_manager_agent import ProductManagerAgent
-from .tech_architect_agent import TechArchitectAgent
-from .market_analyst_agent import MarketAnalystAgent
-from .pitch_writer_agent import PitchWriterAgent
-from .sprint_planner_agent import SprintPlannerAgent
+from .base_agent import BaseAgent
+from .registry import AgentRegistry
+from .scheduler import AgentScheduler, Priority
+from .routing import IntentMatch, IntentRouter
+from .memory import ConversationContext, ConversationMemory
+from .orchestration import Orchestrator, Stage, Workflow
 from models.schemas import Agent, AgentResponse, MarketResearch, ProjectAnalysis
+from models.serialization import AGENT_LIST
+from services.latency import LatencyModel, RollingPercentile, create_latency_model
+from services.metrics import (
+    AGENT_RESPONSE_SECONDS, AGENT_GATHER_SECONDS, AGENT_FANOUT_SIZE, AGENT_ERRORS_TOTAL,
+    AGENT_DEADLINE_EXCEEDED_TOTAL, AGENT_HEDGES_TOTAL
+)
+from services.tracing import tracer
+from services.admission import AdmissionController, Bulkhead, OverloadedError
+from services.logging_setup import log_fields
+
+if TYPE_CHECKING:
+    from .intent_classifier import IntentClassifier
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on a whole chat turn; per-agent deadlines live in agent_configs
+DEFAULT_REQUEST_DEADLINE = float(os.getenv("AGENT_REQUEST_DEADLINE_SECONDS", "15"))
+# Hours per week assumed for sprint planning when a project analysis names no team
+DEFAULT_TEAM_CAPACITY = {"frontend": 40, "backend": 40, "fullstack": 20}
+# Percentile of an agent's recent latency after which a hedged retry fires
+HEDGE_PERCENTILE = 95.0
+
+# Called with (follow_up_response, placeholder_response) when a late agent finishes
+LateResponseCallback = Callable[[AgentResponse, AgentResponse], Awaitable[None]]
+# Called with each agent's response as soon as it is ready, before the turn completes
+ResponseCallback = Callable[[AgentResponse], Awaitable[None]]
+
 class AgentManager:
-    def __init__(self):
-        self.agents = {
-            'pm': ProductManagerAgent(),
-            'tech': TechArchitectAgent(),
-            'market': MarketAnalystAgent(),
-            'pitch': PitchWriterAgent(),
-            'sprint': SprintPlannerAgent()
-        }
+    def __init__(self, latency_model: Optional[LatencyModel] = None, hedging: Optional[bool] = None,
+                 registry: Optional[AgentRegistry] = None):
+        self.latency_model = latency_model or create_latency_model()
+        self.request_deadline = DEFAULT_REQUEST_DEADLINE
+        self.hedging = hedging if hedging is not None else os.getenv("AGENT_HEDGING", "0") == "1"
+        # Agent configs are discovered up front; agent modules are imported on first use
+        self.agents = registry or AgentRegistry.discover()
+        self.agents.on_load = self._on_agent_load
+        self.agents.add_reload_listener(self._on_agent_reload)
+        self.agent_configs = self.agents.configs
+        self.latency_trackers = {agent_id: RollingPercentile() for agent_id in self.agents}
+        self._follow_ups: set = set()
+        self.scheduler = AgentScheduler.from_env()
+        # Bumped on every agent config change so cached catalogs know to rebuild
+        self.catalog_version = 0
         
-        self.agent_configs = {
-            'pm': {
-                'id': 'pm',
-                'name': 'Product Manager',
-                'role': 'PM Agent',
-                'active': True,
-                'avatar': '👨‍💼',
-                'description': 'Breaks down feature ideas into specs and milestones, manages product roadmap',
-                'capabilities': [
-                    'Feature specification',
-                    'Roadmap planning',
-                    'User story creation',
-                    'Requirements analysis'
-                ],
-                'expertise': 'Product Strategy, User Experience, Agile Methodology'
-            },
-            'tech': {
-                'id': 'tech',
-                'name': 'Tech Architect',
-                'role': 'Technical Architect',
-                'active': True,
-                'avatar': '👨‍💻',
-                'description': 'Suggests tech stack, builds initial design, and provides technical guidance',
-                'capabilities': [
-                    'Architecture design',
-                    'Technology recommendations',
-                    'Technical feasibility analysis',
-                    'Code structure planning'
-                ],
-                'expertise': 'Full-stack Development, Cloud Architecture, DevOps'
-            },
-            'market': {
-                'id': 'market',
-                'name': 'Market Analyst',
-                'role': 'Market Analyst',
-                'active': True,
-                'avatar': '📊',
-                'description': 'Scrapes and summarizes competitor strategies, analyzes market opportunities',
-                'capabilities': [
-                    'Competitive analysis',
-                    'Market research',
-                    'Trend identification',
-                    'Pricing strategy'
-                ],
-                'expertise': 'Market Research, Business Intelligence, Data Analysis'
-            },
-            'pitch': {
-                'id': 'pitch',
-                'name': 'Pitch Writer',
-                'role': 'Pitch Writer',
-                'active': True,
-                'avatar': '✍️',
-                'description': 'Drafts presentations, decks, and compelling content for stakeholders',
-                'capabilities': [
-                    'Presentation creation',
-                    'Content writing',
-                    'Storytelling',
-                    'Stakeholder communication'
-                ],
-                'expertise': 'Business Writing, Presentation Design, Communications'
-            },
-            'sprint': {
-                'id': 'sprint',
-                'name': 'Sprint Planner',
-                'role': 'Sprint Planner',
-                'active': True,
-                'avatar': '📋',
-                'description': 'Allocates tasks over weekly sprints and manages project timelines',
-                'capabilities': [
-                    'Sprint planning',
-                    'Task allocation',
-                    'Timeline management',
-                    'Progress tracking'
-                ],
-                'expertise': 'Agile Planning, Project Management, Resource Allocation'
-            }
+        # Intent routing shared by all agents, so each message is scored once per turn
+        self.router = IntentRouter(self.agents, self._train_intent_classifier)
+        # Recent turns per session and agent, for turns that carry a session id
+        self.memory = ConversationMemory.from_env()
+        # Multi-agent workflows, with stage results memoized per input
+        self.orchestrator = Orchestrator()
+        self.project_workflow = self._build_project_workflow()
+        self.plan_workflow = self._build_plan_workflow()
+        
+        # Global admission control plus a bulkhead per agent (limits from each agent's config)
+        self.admission = AdmissionController.from_env()
+        self.bulkheads = {
+            agent_id: Bulkhead(agent_id, config.get('max_concurrency', 16), config.get('max_queue', 64))
+            for agent_id, config in self.agent_configs.items()
         }
 
+    def _on_agent_load(self, agent: BaseAgent):
+        agent.set_latency_model(self.latency_model)
+
+    def _on_agent_reload(self, agent_id: str):
+        """Drop state tied to the old version of a reloaded agent"""
+        self.router.forget(agent_id)
+        self.orchestrator.forget()
+        self.latency_trackers[agent_id] = RollingPercentile()
+        self.catalog_version += 1
+
+    def _train_intent_classifier(self) -> Optional["IntentClassifier"]:
+        """Intent classifier over the example prompts in the agent configs, built on first routing.
+
+        None when numpy is not installed (requirements-minimal.txt); routing
+        then uses the keyword rules alone.
+        """
+        # Imported here so numpy only loads once a message needs routing
+        try:
+            from .intent_classifier import IntentClassifier
+        except ImportError as e:
+            logger.warning(f"Intent classifier unavailable, routing by keyword rules: {e}")
+            return None
+        with tracer.span("agent_manager.train_intent_classifier"):
+            return IntentClassifier.from_configs(self.agent_configs)
+
+    def reload_agent(self, agent_id: str) -> List[str]:
+        """Hot-reload an agent's config and module; in-flight requests finish on the old instance"""
+        if agent_id not in self.agents:
+            raise ValueError(f"Agent {agent_id} not found")
+        return self.agents.reload(agent_id)
+
+    def list_agents(self) -> List[Agent]:
+        """All agents with their current configuration"""
+        return AGENT_LIST.validate_python(list(self.agent_configs.values()))
+
     async def get_all_agents(self) -> List[Agent]:
         """Get all agents with their current configuration"""
-        return [Agent(**config) for config in self.agent_configs.values()]
+        return self.list_agents()
 
     async def toggle_agent(self, agent_id: str) -> Agent:
         """Toggle agent active status"""
@@ -112,83 +119,297 @@ class AgentManager:
             raise ValueError(f"Agent {agent_id} not found")
         
         self.agent_configs[agent_id]['active'] = not self.agent_configs[agent_id]['active']
+        self.catalog_version += 1
         logger.info(f"Agent {agent_id} active status: {self.agent_configs[agent_id]['active']}")
         
         return Agent(**self.agent_configs[agent_id])
 
-    async def process_user_message(self, message: str, active_agent_ids: List[str]) -> List[AgentResponse]:
-        """Process user message and generate responses from active agents"""
+    async def process_user_message(self, message: str, active_agent_ids: List[str],
+                                   deadline: Optional[float] = None,
+                                   on_late_response: Optional[LateResponseCallback] = None,
+                                   priority: Priority = Priority.INTERACTIVE,
+                                   on_response: Optional[ResponseCallback] = None,
+                                   session_id: Optional[str] = None) -> List[AgentResponse]:
+        """Process user message and generate responses from active agents.
+
+        Each agent gets min(its configured deadline, the request deadline).
+        Agents that miss it are returned as a "still working" placeholder; if
+        ``on_late_response`` is given their real response is delivered to it
+        when ready, otherwise the late work is cancelled.
+        
+        ``on_response`` receives each on-time response as its agent finishes,
+        for callers that stream instead of waiting for the whole turn.
+        
+        With a ``session_id`` each agent sees its earlier turns in that
+        session, and this turn is remembered for the next one.
+        
+        Agent work runs through the scheduler in ``priority``'s class.
+        Raises OverloadedError when admission control sheds the turn.
+        """
+        admitted_at = self.admission.acquire()
+        try:
+            return await self._fan_out(message, active_agent_ids, deadline, on_late_response, priority,
+                                       on_response=on_response, session_id=session_id)
+        finally:
+            self.admission.release(admitted_at)
+
+    async def process_batch(self, items: List[Tuple[str, List[str]]],
+                            max_parallel: int = 8) -> AsyncIterator[Tuple[List[int], List[AgentResponse], Optional[Exception]]]:
+        """Run many (message, agent ids) chat turns as bulk work.
+
+        Identical items run once and are reported for every index they appear
+        at. Intents for the whole batch are routed up front, at most
+        ``max_parallel`` turns run at once, and results are yielded as
+        (indices, responses, error) in completion order. Each turn is
+        admitted on its own, so bulk turns count against the in-flight
+        limit; a shed turn is yielded with an OverloadedError. Bulk turns
+        stay out of the latency average that sheds interactive turns.
+        """
+        unique: Dict[Tuple[str, Tuple[str, ...]], List[int]] = {}
+        for index, (message, agent_ids) in enumerate(items):
+            unique.setdefault((message, tuple(agent_ids)), []).append(index)
+        keys = list(unique)
+        with tracer.span("agent_manager.route_batch", items=len(items), unique=len(keys)):
+            routed = self.router.route_batch([message for message, _ in keys])
+        semaphore = asyncio.Semaphore(max_parallel)
+        
+        async def run(message: str, agent_ids: Tuple[str, ...],
+                      intents: Dict[str, IntentMatch]) -> List[AgentResponse]:
+            async with semaphore:
+                admitted_at = self.admission.acquire()
+                try:
+                    return await self._fan_out(message, list(agent_ids), None, None, Priority.BULK, intents)
+                finally:
+                    self.admission.release(admitted_at, record_latency=False)
+        
+        tasks = {
+            asyncio.create_task(run(message, agent_ids, intents)): (message, agent_ids)
+            for (message, agent_ids), intents in zip(keys, routed)
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    indices = unique[tasks[task]]
+                    if task.exception() is not None:
+                        yield indices, [], task.exception()
+                    else:
+                        yield indices, task.result(), None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _fan_out(self, message: str, active_agent_ids: List[str], deadline: Optional[float],
+                       on_late_response: Optional[LateResponseCallback],
+                       priority: Priority, intents: Optional[Dict[str, IntentMatch]] = None,
+                       on_response: Optional[ResponseCallback] = None,
+                       session_id: Optional[str] = None) -> List[AgentResponse]:
+        """Run the admitted chat turn across the participating agents"""
         responses = []
         
-        # Filter to only active agents
-        participating_agents = [
-            agent_id for agent_id in active_agent_ids 
-            if agent_id in self.agent_configs and self.agent_configs[agent_id]['active']
-        ]
+        # Filter to only active agents and route the message once for all of them
+        with tracer.span("agent_manager.route", requested=len(active_agent_ids)):
+            participating_agents = [
+                agent_id for agent_id in active_agent_ids 
+                if agent_id in self.agent_configs and self.agent_configs[agent_id]['active']
+            ]
+            contexts: Dict[str, Optional[ConversationContext]] = {}
+            if session_id is not None:
+                contexts = {agent_id: self.memory.context(session_id, agent_id) for agent_id in participating_agents}
+            if intents is None:
+                # Follow-ups that name no topic stay on each agent's previous intent
+                fallbacks = {agent_id: context.last_intent for agent_id, context in contexts.items() if context}
+                intents = self.router.classify(message, participating_agents, fallbacks)
         
-        logger.info(f"Processing message with {len(participating_agents)} agents: {participating_agents}")
+        logger.debug("Processing message with %d agents: %s", len(participating_agents), participating_agents)
+        
+        request_deadline = min(deadline or self.request_deadline, self.request_deadline)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
         
         # Generate responses from each participating agent
-        tasks = []
+        tasks: Dict[str, asyncio.Task] = {}
+        deadlines: Dict[str, float] = {}
         for agent_id in participating_agents:
             if agent_id in self.agents:
-                logger.info(f"Creating task for agent: {agent_id}")
-                task = self._generate_agent_response(agent_id, message)
-                tasks.append(task)
+                logger.debug("Creating task for agent: %s", agent_id)
+                tasks[agent_id] = asyncio.create_task(
+                    self._run_agent(agent_id, message, priority, intents.get(agent_id),
+                                    session_id, contexts.get(agent_id))
+                )
+                agent_deadline = self.agent_configs[agent_id].get('deadline', request_deadline)
+                deadlines[agent_id] = started + min(agent_deadline, request_deadline)
             else:
-                logger.warning(f"Agent {agent_id} not found in self.agents")
+                logger.warning("Agent %s not found in self.agents", agent_id)
         
-        logger.info(f"Created {len(tasks)} tasks for agent processing")
+        logger.debug("Created %d tasks for agent processing", len(tasks))
         
-        # Execute all agent responses concurrently
+        # Execute all agent responses concurrently, bounded by their deadlines
         if tasks:
-            logger.info("Starting asyncio.gather for agent responses")
-            agent_responses = await asyncio.gather(*tasks, return_exceptions=True)
-            logger.info(f"Received {len(agent_responses)} responses from asyncio.gather")
+            AGENT_FANOUT_SIZE.observe(len(tasks))
+            gather_started = time.perf_counter()
+            with tracer.span("agent_manager.gather", agents=len(tasks)):
+                late = await self._wait_with_deadlines(tasks, deadlines, on_response)
+            AGENT_GATHER_SECONDS.observe(time.perf_counter() - gather_started)
             
-            for i, response in enumerate(agent_responses):
-                if isinstance(response, Exception):
-                    logger.error(f"Error from agent {participating_agents[i]}: {response}")
-                    import traceback
-                    logger.error(f"Exception traceback: {traceback.format_exc()}")
-                elif response:
-                    logger.info(f"Adding response from agent {participating_agents[i]}: {type(response)}")
-                    responses.append(response)
+            for agent_id, task in tasks.items():
+                if agent_id in late:
+                    AGENT_DEADLINE_EXCEEDED_TOTAL.labels(agent_id).inc()
+                    placeholder = self._build_placeholder(agent_id)
+                    responses.append(placeholder)
+                    if on_late_response is not None:
+                        follow_up = asyncio.create_task(self._deliver_late(task, placeholder, on_late_response))
+                        self._follow_ups.add(follow_up)
+                        follow_up.add_done_callback(self._follow_ups.discard)
+                    else:
+                        task.cancel()
+                    continue
+                
+                error = task.exception()
+                if error is not None:
+                    AGENT_ERRORS_TOTAL.labels(agent_id).inc()
+                    logger.error("Error from agent %s: %s", agent_id, error, exc_info=error)
+                elif task.result():
+                    logger.debug("Adding response from agent %s", agent_id)
+                    responses.append(task.result())
                 else:
-                    logger.warning(f"Empty response from agent {participating_agents[i]}")
+                    logger.warning("Empty response from agent %s", agent_id)
         else:
             logger.warning("No tasks created for agent processing")
         
-        logger.info(f"Returning {len(responses)} total responses")
+        logger.info("Chat turn completed", extra=log_fields(agents=participating_agents, responses=len(responses)))
         return responses
 
-    async def _generate_agent_response(self, agent_id: str, message: str) -> Optional[AgentResponse]:
-        """Generate a response from a specific agent"""
+    async def _wait_with_deadlines(self, tasks: Dict[str, asyncio.Task], deadlines: Dict[str, float],
+                                   on_response: Optional[ResponseCallback] = None) -> set:
+        """Wait for agent tasks until each finishes or passes its deadline; return the late agent ids"""
+        loop = asyncio.get_running_loop()
+        agent_for_task = {task: agent_id for agent_id, task in tasks.items()}
+        pending = set(tasks.values())
+        late = set()
+        while pending:
+            timeout = min(deadlines[agent_for_task[task]] for task in pending) - loop.time()
+            if timeout > 0:
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if on_response is not None:
+                    for task in done:
+                        if task.exception() is None and task.result():
+                            await on_response(task.result())
+            now = loop.time()
+            for task in [task for task in pending if deadlines[agent_for_task[task]] <= now]:
+                pending.discard(task)
+                late.add(agent_for_task[task])
+        return late
+
+    async def _run_agent(self, agent_id: str, message: str, priority: Priority, route: Optional[IntentMatch] = None,
+                         session_id: Optional[str] = None,
+                         context: Optional[ConversationContext] = None) -> Optional[AgentResponse]:
+        """Run one agent and remember the turn in its session"""
+        response = await self._run_hedged(agent_id, message, priority, route, context)
+        if response is not None and session_id is not None:
+            self.memory.record(session_id, agent_id, message, response.content, route.intent if route else None)
+        return response
+
+    async def _run_hedged(self, agent_id: str, message: str, priority: Priority, route: Optional[IntentMatch] = None,
+                          context: Optional[ConversationContext] = None) -> Optional[AgentResponse]:
+        """Run one agent, firing a hedged retry if it runs past its recent p95 latency"""
+        hedge_after = self.latency_trackers[agent_id].percentile(HEDGE_PERCENTILE) if self.hedging else None
+        if hedge_after is None:
+            return await self._generate_agent_response(agent_id, message, priority, route, context)
+        
+        primary = asyncio.create_task(self._generate_agent_response(agent_id, message, priority, route, context))
+        pending = {primary}
         try:
-            logger.info(f"Starting _generate_agent_response for agent {agent_id}")
-            agent = self.agents[agent_id]
-            config = self.agent_configs[agent_id]
+            # Inside the try, so a caller cancelled while waiting doesn't leave the primary running
+            done, _ = await asyncio.wait(pending, timeout=hedge_after)
+            if done:
+                return primary.result()
             
-            logger.info(f"Calling agent.process_message for agent {agent_id}")
-            # Generate response using the agent
-            content = await agent.process_message(message)
-            logger.info(f"Agent {agent_id} returned content: {content[:100] if content else 'None'}...")
-            
-            # Create response object
-            response = AgentResponse(
-                id=f"{agent_id}_{int(datetime.now().timestamp() * 1000)}",
-                content=content,
-                timestamp=datetime.now().isoformat(),
-                sender=config['name'],
-                agentId=agent_id,
-                avatar=config['avatar'],
-                confidence=random.uniform(0.8, 0.95)  # Simulate confidence score
-            )
-            
-            logger.info(f"Created AgentResponse object for agent {agent_id}")
-            return response
+            hedge = asyncio.create_task(self._generate_agent_response(agent_id, message, priority, route, context))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    # Prefer a real response; a failed attempt waits for the other one
+                    if task.result() is not None or not pending:
+                        AGENT_HEDGES_TOTAL.labels(agent_id, "hedge" if task is hedge else "primary").inc()
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _build_placeholder(self, agent_id: str) -> AgentResponse:
+        """Stand-in response for an agent that missed the turn deadline"""
+        config = self.agent_configs[agent_id]
+        return AgentResponse(
+            id=f"{agent_id}_{int(datetime.now().timestamp() * 1000)}_pending",
+            content=f"I'm still working on this and will follow up as soon as my analysis is ready.\n\n— {config['name']}",
+            timestamp=datetime.now().isoformat(),
+            sender=config['name'],
+            agentId=agent_id,
+            avatar=config['avatar'],
+            pending=True
+        )
+
+    async def _deliver_late(self, task: asyncio.Task, placeholder: AgentResponse,
+                            on_late_response: LateResponseCallback):
+        """Hand a late agent's response to the caller once it finishes"""
+        try:
+            response = await task
+            if response:
+                await on_late_response(response, placeholder)
+        except Exception as e:
+            logger.error("Error delivering follow-up for %s: %s", placeholder.agentId, e)
+
+    async def _generate_agent_response(self, agent_id: str, message: str,
+                                       priority: Priority = Priority.INTERACTIVE,
+                                       route: Optional[IntentMatch] = None,
+                                       context: Optional[ConversationContext] = None) -> Optional[AgentResponse]:
+        """Generate a response from a specific agent, for the routed intent when one is given"""
+        intent = route.intent if route else None
+        started = time.perf_counter()
+        try:
+            with tracer.span("agent.generate_response", agent=agent_id):
+                logger.debug("Starting _generate_agent_response for agent %s", agent_id)
+                agent = self.agents[agent_id]
+                config = self.agent_configs[agent_id]
+                
+                logger.debug("Calling agent.process_message for agent %s", agent_id)
+                # Generate response using the agent, within its bulkhead
+                async with self.bulkheads[agent_id]:
+                    # Only agents with history get a context, so plugins without the parameter keep working
+                    if context is not None:
+                        content = await self.scheduler.submit(priority, agent.process_message, message,
+                                                              intent=intent, context=context)
+                    else:
+                        content = await self.scheduler.submit(priority, agent.process_message, message, intent=intent)
+                logger.debug("Agent %s returned content", agent_id, extra=log_fields(content=content))
+                
+                # Create response object
+                with tracer.span("agent.build_response", agent=agent_id):
+                    response = AgentResponse(
+                        id=f"{agent_id}_{int(datetime.now().timestamp() * 1000)}",
+                        content=content,
+                        timestamp=datetime.now().isoformat(),
+                        sender=config['name'],
+                        agentId=agent_id,
+                        avatar=config['avatar'],
+                        # The router's calibrated confidence; None when keyword rules picked the intent
+                        confidence=route.confidence if route else None
+                    )
+                
+                logger.debug("Created AgentResponse object for agent %s", agent_id)
+                elapsed = time.perf_counter() - started
+                AGENT_RESPONSE_SECONDS.labels(agent_id).observe(elapsed)
+                self.latency_trackers[agent_id].observe(elapsed)
+                return response
             
+        except OverloadedError as e:
+            logger.warning("Skipping agent %s: %s", agent_id, e)
+            return None
         except Exception as e:
+            AGENT_ERRORS_TOTAL.labels(agent_id).inc()
             logger.error(f"Error generating response from agent {agent_id}: {e}")
             import traceback
             logger.error(f"Exception traceback: {traceback.format_exc()}")
@@ -198,28 +419,146 @@ class AgentManager:
         """Get market research data"""
         try:
             market_agent = self.agents['market']
-            research_data = await market_agent.conduct_research(query)
+            research_data = await self.scheduler.submit(Priority.BACKGROUND, market_agent.conduct_research, query)
             return research_data
         except Exception as e:
             logger.error(f"Error getting market research: {e}")
             raise
 
-    async def analyze_project(self, description: str) -> ProjectAnalysis:
-        """Analyze a project using multiple agents"""
+    def _build_project_workflow(self) -> Workflow:
+        """PM breaks the project down; PM, Tech and Market work from that in parallel and the results
+        are merged, so the analysis takes the breakdown plus the slowest single agent"""
+        return Workflow("project_analysis", [
+            Stage("features", self._stage_features),
+            Stage("pm", self._stage_pm, depends_on=["features"]),
+            Stage("tech", self._stage_tech, depends_on=["features"]),
+            Stage("market", self._stage_market, depends_on=["features"]),
+            Stage("analysis", self._stage_analysis, depends_on=["pm", "tech", "market"]),
+        ])
+
+    def _build_plan_workflow(self) -> Workflow:
+        """Sprint plan and pitch, both built on the tech stack and the market research.
+
+        Shares its first stages with the analysis workflow, so after an
+        analysis they come from the stage memo and only sprint and pitch run.
+        """
+        return Workflow("project_plan", [
+            Stage("features", self._stage_features),
+            Stage("tech", self._stage_tech, depends_on=["features"]),
+            Stage("market", self._stage_market, depends_on=["features"]),
+            Stage("sprint", self._stage_sprint, depends_on=["tech", "market"]),
+            Stage("pitch", self._stage_pitch, depends_on=["features", "tech", "market"]),
+        ])
+
+    async def _stage_features(self, inputs: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.scheduler.submit(Priority.BACKGROUND, self.agents['pm'].break_down_features,
+                                           inputs["description"])
+
+    async def _stage_tech(self, inputs: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
+        requirements = f"{inputs['description']}\nFeatures: {', '.join(upstream['features']['features'])}"
+        return await self.scheduler.submit(Priority.BACKGROUND, self.agents['tech'].get_tech_recommendations,
+                                           requirements)
+
+    async def _stage_market(self, inputs: Dict[str, Any], upstream: Dict[str, Any]) -> MarketResearch:
+        query = f"{inputs['description']} for {upstream['features']['audience']}"
+        return await self.scheduler.submit(Priority.BACKGROUND, self.agents['market'].conduct_research, query)
+
+    async def _stage_sprint(self, inputs: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.scheduler.submit(Priority.BACKGROUND, self.agents['sprint'].create_sprint_plan,
+                                           inputs["description"], inputs["team_capacity"],
+                                           upstream['tech'], upstream['market'])
+
+    async def _stage_pitch(self, inputs: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.scheduler.submit(Priority.BACKGROUND, self.agents['pitch'].create_pitch_deck,
+                                           inputs["description"], upstream['features']['audience'],
+                                           upstream['market'], upstream['tech'])
+
+    async def _stage_pm(self, inputs: Dict[str, Any], upstream: Dict[str, Any]) -> ProjectAnalysis:
+        return await self.scheduler.submit(Priority.BACKGROUND, self.agents['pm'].analyze_project,
+                                           inputs["description"], upstream['features'])
+
+    async def _stage_analysis(self, inputs: Dict[str, Any], upstream: Dict[str, Any]) -> ProjectAnalysis:
+        """Fold the tech and market output into the PM's analysis"""
+        analysis = upstream['pm']
+        tech, market = upstream['tech'], upstream['market']
+        return analysis.model_copy(update={
+            "tech_stack": [f"{layer.title()}: {choices['framework']}" for layer, choices in tech.items()
+                           if isinstance(choices, dict) and 'framework' in choices] or analysis.tech_stack,
+            "timeline": {**analysis.timeline, **{
+                phase: estimate for phase, estimate in tech.get("estimated_timeline", {}).items()
+                if phase.lower() not in {existing.lower() for existing in analysis.timeline}
+            }},
+            "opportunities": analysis.opportunities + market.opportunities,
+            "market_research": market.model_dump(),
+        })
+
+    @staticmethod
+    def analysis_key(description: str, team_capacity: Optional[Dict[str, int]] = None) -> str:
+        """Digest of a project analysis's inputs, so cache keys stay small however long the description"""
+        digest = hashlib.blake2b(description.encode("utf-8"), digest_size=16)
+        digest.update(json.dumps(sorted((team_capacity or DEFAULT_TEAM_CAPACITY).items())).encode("utf-8"))
+        return digest.hexdigest()
+
+    async def analyze_project(self, description: str,
+                              team_capacity: Optional[Dict[str, int]] = None) -> ProjectAnalysis:
+        """Analyze a project with the PM, Tech and Market agents, as the project workflow DAG.
+
+        Independent stages run in parallel, so the analysis takes as long as
+        its critical path rather than the sum of the agents. Stage results
+        are memoized per description and team capacity. The sprint plan and
+        pitch are started in the background without being waited for; get
+        them from ``plan_project``.
+        """
         try:
-            # Get analysis from PM agent
-            pm_agent = self.agents['pm']
-            analysis = await pm_agent.analyze_project(description)
-            return analysis
+            team_capacity = team_capacity or DEFAULT_TEAM_CAPACITY
+            inputs = {"description": description, "team_capacity": team_capacity}
+            key = self.analysis_key(description, team_capacity)
+            result = await self.orchestrator.run(self.project_workflow, inputs, key=key)
+            critical_seconds, critical_path = self.project_workflow.critical_path(result.seconds)
+            logger.info("Project analysis finished", extra=log_fields(
+                elapsed=round(result.elapsed, 3), critical_path=critical_path,
+                critical_seconds=round(critical_seconds, 3), memo_hits=result.memo_hits))
+            # Warm the stage memo for the plan, reusing the tech and market results just computed
+            follow_up = asyncio.create_task(self._plan_in_background(inputs, key))
+            self._follow_ups.add(follow_up)
+            follow_up.add_done_callback(self._follow_ups.discard)
+            return result.results["analysis"]
         except Exception as e:
             logger.error(f"Error analyzing project: {e}")
             raise
 
-    async def create_sprint_plan(self, project_description: str, team_capacity: Dict[str, int]) -> Dict[str, Any]:
+    async def _plan_in_background(self, inputs: Dict[str, Any], key: str):
+        try:
+            await self.orchestrator.run(self.plan_workflow, inputs, key=key)
+        except Exception as e:
+            logger.error(f"Error planning project: {e}")
+
+    async def plan_project(self, description: str,
+                           team_capacity: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Sprint plan and pitch deck for a project, built on its tech stack and market research.
+
+        Shares memoized stages with ``analyze_project``, so right after an
+        analysis only the sprint and pitch stages are left to run, if that.
+        """
+        try:
+            team_capacity = team_capacity or DEFAULT_TEAM_CAPACITY
+            inputs = {"description": description, "team_capacity": team_capacity}
+            result = await self.orchestrator.run(self.plan_workflow, inputs,
+                                                 key=self.analysis_key(description, team_capacity))
+            return {"sprint_plan": result.results["sprint"], "pitch_deck": result.results["pitch"]}
+        except Exception as e:
+            logger.error(f"Error planning project: {e}")
+            raise
+
+    async def create_sprint_plan(self, project_description: str,
+                                 team_capacity: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
         """Create a sprint plan using the sprint planner agent"""
         try:
+            team_capacity = team_capacity or DEFAULT_TEAM_CAPACITY
             sprint_agent = self.agents['sprint']
-            plan = await sprint_agent.create_sprint_plan(project_description, team_capacity)
+            plan = await self.scheduler.submit(
+                Priority.BACKGROUND, sprint_agent.create_sprint_plan, project_description, team_capacity
+            )
             return plan
         except Exception as e:
             logger.error(f"Error creating sprint plan: {e}")
@@ -229,7 +568,9 @@ class AgentManager:
         """Generate a pitch deck using the pitch writer agent"""
         try:
             pitch_agent = self.agents['pitch']
-            deck = await pitch_agent.create_pitch_deck(project_description, target_audience)
+            deck = await self.scheduler.submit(
+                Priority.BACKGROUND, pitch_agent.create_pitch_deck, project_description, target_audience
+            )
             return deck
         except Exception as e:
             logger.error(f"Error generating pitch deck: {e}")
@@ -239,7 +580,9 @@ class AgentManager:
         """Get technical recommendations from the tech architect"""
         try:
             tech_agent = self.agents['tech']
-            recommendations = await tech_agent.get_tech_recommendations(requirements)
+            recommendations = await self.scheduler.submit(
+                Priority.BACKGROUND, tech_agent.get_tech_recommendations, requirements
+            )
             return recommendations
         except Exception as e:
             logger.error(f"Error getting tech recommendations: {e}")
@@ -1,27 +1,89 @@
 import asyncio
+import functools
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
 from datetime import datetime
 
+from services.latency import LatencyModel, UniformLatency
+from services.metrics import AGENT_INTENT_SECONDS
+from services.tracing import tracer
+from services.logging_setup import log_fields
+from services.tokenizer import tokenize
+
+if TYPE_CHECKING:
+    from .memory import ConversationContext
+
 logger = logging.getLogger(__name__)
 
+def intent_handler(func):
+    """Mark an agent method as an intent handler, recording latency and a trace span per intent"""
+    intent = func.__name__.lstrip('_')
+    
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            with tracer.span("agent.intent", agent=self.agent_id, intent=intent):
+                return await func(self, *args, **kwargs)
+        finally:
+            AGENT_INTENT_SECONDS.labels(self.agent_id, intent).observe(time.perf_counter() - started)
+    
+    wrapper.intent = intent
+    return wrapper
+
 class BaseAgent(ABC):
     """Base class for all AI agents in the team strategy system"""
     
-    def __init__(self, agent_id: str, name: str, role: str):
+    # Ordered (intent, keywords) rules; the first rule with a keyword in the message wins
+    intent_rules: List[Tuple[str, List[str]]] = []
+    # Intent used when no rule matches
+    default_intent: str = ''
+    
+    def __init__(self, agent_id: str, name: str, role: str, latency_model: Optional[LatencyModel] = None):
         self.agent_id = agent_id
         self.name = name
         self.role = role
         self.created_at = datetime.now()
         self.message_count = 0
         self.active = True
+        self.latency_model = latency_model or UniformLatency()
         
     @abstractmethod
-    async def process_message(self, message: str) -> str:
-        """Process a user message and return a response"""
+    async def process_message(self, message: str, intent: Optional[str] = None,
+                              context: Optional["ConversationContext"] = None) -> str:
+        """Process a user message and return a response.
+
+        ``intent`` skips routing when already known; ``context`` holds this
+        agent's earlier turns in the session, when the caller has a session.
+        """
         pass
     
+    def route_intent(self, message: str, context: Optional["ConversationContext"] = None) -> str:
+        """Pick the intent for a message from ``intent_rules``.
+
+        A follow-up that matches no rule stays on the previous turn's topic.
+        """
+        message_lower = tokenize(message).lower
+        for intent, keywords in self.intent_rules:
+            if any(keyword in message_lower for keyword in keywords):
+                return intent
+        if context is not None and context.last_intent:
+            return context.last_intent
+        return self.default_intent
+    
+    def data_files(self) -> List[str]:
+        """Data files this agent read when it was built; editing one hot reloads the agent"""
+        return []
+    
+    async def handle_intent(self, intent: str, message: str) -> str:
+        """Dispatch a message to the handler for ``intent``"""
+        handler = getattr(self, f"_{intent}", None)
+        if getattr(handler, 'intent', None) != intent:
+            raise ValueError(f"Agent {self.agent_id} has no intent {intent}")
+        return await handler(message)
+    
     async def get_status(self) -> Dict[str, Any]:
         """Get current agent status"""
         return {
@@ -43,14 +105,8 @@ class BaseAgent(ABC):
         self.message_count += 1
     
     def _extract_keywords(self, text: str) -> List[str]:
-        """Extract keywords from text for analysis"""
-        import re
-        # Simple keyword extraction
-        words = re.findall(r'\w+', text.lower())
-        # Filter out common words
-        common_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an', 'as', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can'}
-        keywords = [word for word in words if word not in common_words and len(word) > 2]
-        return list(set(keywords))  # Remove duplicates
+        """Distinct keywords of a text, in order of first appearance (tokenized once per text and shared)"""
+        return list(tokenize(text).keywords)
     
     def _format_response(self, content: str, add_signature: bool = True) -> str:
         """Format response with agent signature if needed"""
@@ -61,12 +117,15 @@ class BaseAgent(ABC):
     def _log_interaction(self, message: str, response: str):
         """Log agent interactions for monitoring"""
         self._increment_message_count()
-        logger.info(f"Agent {self.agent_id} processed message. Count: {self.message_count}")
-        logger.debug(f"Input: {message[:100]}...")
-        logger.debug(f"Output: {response[:100]}...")
+        logger.debug(
+            "Agent %s processed message. Count: %d", self.agent_id, self.message_count,
+            extra=log_fields(input=message, output=response)
+        )
+    
+    def set_latency_model(self, latency_model: LatencyModel):
+        """Swap the latency model used for simulated processing time"""
+        self.latency_model = latency_model
     
     async def _simulate_processing_time(self, min_seconds: float = 0.5, max_seconds: float = 2.0):
-        """Simulate realistic processing time"""
-        import random
-        delay = random.uniform(min_seconds, max_seconds)
-        await asyncio.sleep(delay)
\ No newline at end of file
+        """Simulate realistic processing time using the injected latency model"""
+        await self.latency_model.wait(min_seconds, max_seconds, key=self.agent_id)
\ No newline at end of file
@@ -0,0 +1,55 @@
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional
+
+from .registry import AgentRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class AgentFileWatcher:
+    """Polls agent config and module files and reloads the agents whose files changed.
+
+    Polling mtimes keeps this dependency-free; a one second interval is
+    plenty for editing templates and rules on a running server.
+    """
+
+    def __init__(self, registry: AgentRegistry, interval: float = 1.0):
+        self.registry = registry
+        self.interval = interval
+        self._mtimes: Dict[str, Optional[float]] = {}
+        self.check()
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[float]:
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def check(self) -> List[str]:
+        """Reload agents whose files changed since the last check; returns the reloaded ids"""
+        changed_agents: List[str] = []
+        for path, agent_ids in self.registry.watched_files().items():
+            mtime = self._mtime(path)
+            previous = self._mtimes.get(path, mtime)
+            self._mtimes[path] = mtime
+            if mtime != previous:
+                changed_agents.extend(agent_id for agent_id in agent_ids if agent_id not in changed_agents)
+
+        reloaded: List[str] = []
+        for agent_id in changed_agents:
+            if agent_id in reloaded:
+                continue
+            try:
+                reloaded.extend(self.registry.reload(agent_id))
+            except Exception as e:
+                logger.error(f"Hot reload of agent {agent_id} failed, keeping the running version: {e}")
+        return reloaded
+
+    async def run(self):
+        """Background task: check for changes every ``interval`` seconds"""
+        while True:
+            await asyncio.sleep(self.interval)
+            self.check()
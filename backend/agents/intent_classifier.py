@@ -0,0 +1,162 @@
+import logging
+import math
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .routing import IntentMatch
+from services.tokenizer import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Temperatures tried when calibrating confidences
+TEMPERATURES = np.logspace(-1.5, 1.5, 61)
+CALIBRATION_FOLDS = 5
+# Words are matched on their first letters: competitor, competitors and competition share one term
+STEM_LENGTH = 5
+
+
+def _terms(text: str) -> Counter:
+    """Keyword counts with words cut to a common stem, so inflections share a term"""
+    terms: Counter = Counter()
+    for word, count in tokenize(text).counts.items():
+        terms[word[:STEM_LENGTH]] += count
+    return terms
+
+
+class IntentClassifier:
+    """BM25 intent classifier over labeled example prompts for every agent's intents.
+
+    Each (agent, intent) is one document made of its examples. The
+    document side of BM25 is precomputed into a terms x intents weight
+    matrix, so scoring messages is a sparse (messages x terms) matrix
+    times that matrix: one product scores every intent of every agent.
+    Each agent's scores go through a softmax whose temperature is fitted
+    on out-of-fold examples, so confidences are calibrated rather than
+    just normalized scores. Messages sharing no term with an agent's
+    examples get no match for that agent.
+    """
+
+    def __init__(self, examples: Mapping[str, Mapping[str, Sequence[str]]], k1: float = 1.2, b: float = 0.75,
+                 temperature: Optional[float] = None):
+        self.k1 = k1
+        self.b = b
+        self.labels: List[Tuple[str, str]] = [
+            (agent_id, intent) for agent_id, intents in examples.items() for intent in intents
+        ]
+        # Columns of the weight matrix holding each agent's intents
+        self.agent_columns: Dict[str, np.ndarray] = {
+            agent_id: np.array([column for column, label in enumerate(self.labels) if label[0] == agent_id])
+            for agent_id in examples
+        }
+        self.vocabulary, self.weights = self._fit([list(examples[agent_id][intent]) for agent_id, intent in self.labels])
+        self.temperature = temperature if temperature is not None else self._calibrate(examples)
+
+    @classmethod
+    def from_configs(cls, configs: Mapping[str, Mapping[str, Any]]) -> "IntentClassifier":
+        """Train on the ``intent_examples`` of each agent config that has them"""
+        return cls({agent_id: config["intent_examples"] for agent_id, config in configs.items()
+                    if config.get("intent_examples")})
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self.agent_columns
+
+    def _fit(self, documents: List[List[str]]) -> Tuple[Dict[str, int], np.ndarray]:
+        """Vocabulary and the BM25 terms x intents weight matrix for the given example documents"""
+        counts = [sum((_terms(text) for text in texts), Counter()) for texts in documents]
+        vocabulary = {term: index for index, term in enumerate(sorted({term for count in counts for term in count}))}
+        lengths = np.array([sum(count.values()) for count in counts], dtype=np.float64)
+        average_length = lengths.mean() if len(lengths) and lengths.mean() > 0 else 1.0
+
+        tf = np.zeros((len(vocabulary), len(documents)), dtype=np.float64)
+        for column, count in enumerate(counts):
+            for term, frequency in count.items():
+                tf[vocabulary[term], column] = frequency
+        document_frequency = (tf > 0).sum(axis=1)
+        idf = np.log(1 + (len(documents) - document_frequency + 0.5) / (document_frequency + 0.5))
+        saturation = tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * lengths / average_length))
+        return vocabulary, (idf[:, None] * saturation).astype(np.float32)
+
+    @staticmethod
+    def _sparse_queries(messages: Iterable[str], vocabulary: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR (indptr, indices) of known terms per message; terms count once per message"""
+        indptr = [0]
+        indices: List[int] = []
+        for message in messages:
+            indices.extend(sorted(vocabulary[term] for term in _terms(message) if term in vocabulary))
+            indptr.append(len(indices))
+        return np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64)
+
+    @staticmethod
+    def _score(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Sparse queries times the weight matrix: (messages x terms) @ (terms x intents)"""
+        scores = np.zeros((len(indptr) - 1, weights.shape[1]), dtype=np.float32)
+        rows = np.flatnonzero(np.diff(indptr))
+        if len(rows):
+            # Sum the weight rows of each message's terms; empty messages stay at zero
+            scores[rows] = np.add.reduceat(weights[indices], indptr[rows], axis=0)
+        return scores
+
+    def scores(self, messages: Sequence[str]) -> np.ndarray:
+        """BM25 score of every intent of every agent, one row per message"""
+        indptr, indices = self._sparse_queries(messages, self.vocabulary)
+        return self._score(indptr, indices, self.weights)
+
+    @staticmethod
+    def _softmax(scores: np.ndarray, temperature: float) -> np.ndarray:
+        shifted = scores / temperature
+        shifted = shifted - shifted.max(axis=-1, keepdims=True)
+        exp = np.exp(shifted)
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def _calibrate(self, examples: Mapping[str, Mapping[str, Sequence[str]]]) -> float:
+        """Temperature minimizing the log loss of out-of-fold predictions within each agent"""
+        held_out: List[Tuple[np.ndarray, int]] = []
+        for fold in range(CALIBRATION_FOLDS):
+            documents, tests = [], []
+            for column, (agent_id, intent) in enumerate(self.labels):
+                texts = examples[agent_id][intent]
+                documents.append([text for index, text in enumerate(texts) if index % CALIBRATION_FOLDS != fold])
+                tests.extend((text, column) for index, text in enumerate(texts) if index % CALIBRATION_FOLDS == fold)
+            if not tests:
+                continue
+            vocabulary, weights = self._fit(documents)
+            indptr, indices = self._sparse_queries([text for text, _ in tests], vocabulary)
+            scores = self._score(indptr, indices, weights)
+            for row, (_, column) in zip(scores, tests):
+                columns = self.agent_columns[self.labels[column][0]]
+                held_out.append((row[columns], int(np.flatnonzero(columns == column)[0])))
+        if not held_out:
+            return 1.0
+
+        losses = []
+        for temperature in TEMPERATURES:
+            loss = -sum(math.log(max(float(self._softmax(row, temperature)[target]), 1e-12))
+                        for row, target in held_out)
+            losses.append(loss / len(held_out))
+        best = float(TEMPERATURES[int(np.argmin(losses))])
+        logger.info("Calibrated intent classifier: temperature %.3f, log loss %.3f over %d held-out examples",
+                    best, min(losses), len(held_out))
+        return best
+
+    def classify_batch(self, messages: Sequence[str],
+                       agent_ids: Optional[Iterable[str]] = None) -> List[Dict[str, IntentMatch]]:
+        """Best intent and calibrated confidence per agent for each message"""
+        agent_ids = [agent_id for agent_id in (self.agent_columns if agent_ids is None else agent_ids)
+                     if agent_id in self.agent_columns]
+        scores = self.scores(messages)
+        results: List[Dict[str, IntentMatch]] = [{} for _ in range(len(scores))]
+        for agent_id in agent_ids:
+            columns = self.agent_columns[agent_id]
+            agent_scores = scores[:, columns]
+            probabilities = self._softmax(agent_scores, self.temperature)
+            best = probabilities.argmax(axis=1)
+            confidences = probabilities[np.arange(len(best)), best].tolist()
+            # Messages sharing no term with this agent's examples get no match
+            for row in np.flatnonzero(agent_scores.max(axis=1) > 0):
+                results[row][agent_id] = IntentMatch(self.labels[columns[best[row]]][1], round(confidences[row], 4))
+        return results
+
+    def classify(self, message: str, agent_ids: Optional[Iterable[str]] = None) -> Dict[str, IntentMatch]:
+        return self.classify_batch([message], agent_ids)[0]
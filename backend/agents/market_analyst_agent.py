@@ -1,12 +1,21 @@
 import asyncio
 import logging
-from typing import Dict, List, Any
-from .base_agent import BaseAgent
+from typing import Dict, List, Any, Optional
+from .base_agent import BaseAgent, intent_handler
+from .memory import ConversationContext
 from models.schemas import MarketResearch
 
 logger = logging.getLogger(__name__)
 
 class MarketAnalystAgent(BaseAgent):
+    intent_rules = [
+        ('analyze_competitors', ['competitor', 'competition', 'competitive']),
+        ('analyze_market', ['market', 'industry', 'sector']),
+        ('analyze_pricing', ['pricing', 'price', 'monetization']),
+        ('identify_trends', ['trend', 'trends', 'opportunity']),
+    ]
+    default_intent = 'general_market_advice'
+    
     def __init__(self):
         super().__init__(
             agent_id="market",
@@ -14,28 +23,18 @@ class MarketAnalystAgent(BaseAgent):
             role="Market Research & Competitive Analysis"
         )
 
-    async def process_message(self, message: str) -> str:
+    async def process_message(self, message: str, intent: Optional[str] = None,
+                              context: Optional[ConversationContext] = None) -> str:
         """Process user message and provide market insights"""
         try:
             await self._simulate_processing_time()
             
-            message_lower = message.lower()
-            
-            if any(keyword in message_lower for keyword in ['competitor', 'competition', 'competitive']):
-                return await self._analyze_competitors(message)
-            elif any(keyword in message_lower for keyword in ['market', 'industry', 'sector']):
-                return await self._analyze_market(message)
-            elif any(keyword in message_lower for keyword in ['pricing', 'price', 'monetization']):
-                return await self._analyze_pricing(message)
-            elif any(keyword in message_lower for keyword in ['trend', 'trends', 'opportunity']):
-                return await self._identify_trends(message)
-            else:
-                return await self._general_market_advice(message)
-                
+            return await self.handle_intent(intent or self.route_intent(message, context), message)
         except Exception as e:
             logger.error(f"Error in MarketAnalystAgent.process_message: {e}")
             return "I encountered an issue with market analysis. Could you specify what market information you need?"
 
+    @intent_handler
     async def _analyze_competitors(self, message: str) -> str:
         """Analyze competitive landscape"""
         response = "I'll analyze the competitive landscape for you:\n\n"
@@ -65,6 +64,7 @@ class MarketAnalystAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _analyze_market(self, message: str) -> str:
         """Analyze market size and opportunities"""
         response = "Here's my market analysis:\n\n"
@@ -95,6 +95,7 @@ class MarketAnalystAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _analyze_pricing(self, message: str) -> str:
         """Analyze pricing strategies and recommendations"""
         response = "Let me break down pricing strategy options:\n\n"
@@ -126,6 +127,7 @@ class MarketAnalystAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _identify_trends(self, message: str) -> str:
         """Identify market trends and opportunities"""
         response = "Here are the key market trends I'm tracking:\n\n"
@@ -156,6 +158,7 @@ class MarketAnalystAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _general_market_advice(self, message: str) -> str:
         """Provide general market research guidance"""
         response = "From a market perspective, I recommend focusing on:\n\n"
@@ -0,0 +1,289 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set
+
+from services.metrics import REGISTRY
+from services.tokenizer import WORD_PATTERN, is_keyword
+
+logger = logging.getLogger(__name__)
+
+MEMORY_SESSIONS = REGISTRY.gauge("conversation_sessions", "Sessions held in conversation memory")
+MEMORY_CHARS = REGISTRY.gauge("conversation_memory_chars", "Characters of turns and summaries held in conversation memory")
+MEMORY_EVICTIONS_TOTAL = REGISTRY.counter(
+    "conversation_sessions_evicted_total", "Sessions dropped from conversation memory", ["reason"])
+
+# Over the cap, a session is folded down to this fraction of it so the next turns don't fold again
+CAP_TARGET = 0.75
+# Fixed per-turn overhead counted against the budget (slots object, deque cell, small strings)
+TURN_OVERHEAD_CHARS = 200
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+class Turn:
+    """One exchange with an agent: the user's message, the reply and the intent that handled it"""
+    __slots__ = ("message", "response", "intent", "size")
+
+    def __init__(self, message: str, response: str, intent: Optional[str]):
+        self.message = message
+        self.response = response
+        self.intent = intent
+        self.size = len(message) + len(response) + TURN_OVERHEAD_CHARS
+
+
+class ConversationContext:
+    """Read-only snapshot of what an agent remembers of a session, handed to ``process_message``"""
+
+    def __init__(self, session_id: str, agent_id: str, summary: str, turns: List[Turn],
+                 last_intent: Optional[str] = None):
+        self.session_id = session_id
+        self.agent_id = agent_id
+        self.summary = summary
+        self.turns = turns
+        # Intent of the most recent turn, used to route follow-ups that name no topic
+        self.last_intent = last_intent
+
+    def text(self, include_responses: bool = True) -> str:
+        """Summary followed by the recent turns, oldest first; optionally the user's side only"""
+        lines = [self.summary] if self.summary else []
+        for turn in self.turns:
+            lines.append(f"User: {turn.message}")
+            if include_responses:
+                lines.append(f"Agent: {turn.response}")
+        return "\n".join(lines)
+
+
+def summarize(texts: List[str], max_chars: int) -> str:
+    """Extractive summary: the highest scoring sentences, kept in their original order.
+
+    Sentences are scored by the average frequency of their non-stop words
+    across all of ``texts``, so sentences about recurring topics survive.
+    Repeated sentences (a context pasted again) count once.
+    """
+    sentences = list(dict.fromkeys(
+        sentence.strip() for text in texts for sentence in _SENTENCE_SPLIT.split(text) if sentence.strip()))
+    if not sentences:
+        return ""
+    words = [[word for word in WORD_PATTERN.findall(sentence.lower()) if is_keyword(word)] for sentence in sentences]
+    frequencies = Counter(word for sentence_words in words for word in sentence_words)
+    scores = [sum(frequencies[word] for word in sentence_words) / (len(sentence_words) or 1)
+              for sentence_words in words]
+
+    chosen: Set[int] = set()
+    used = 0
+    for index in sorted(range(len(sentences)), key=lambda i: -scores[i]):
+        length = len(sentences[index]) + 1
+        if used + length <= max_chars:
+            chosen.add(index)
+            used += length
+    return " ".join(sentences[index] for index in sorted(chosen))
+
+
+class AgentMemory:
+    """An agent's view of a session: a ring buffer of recent turns plus a summary of older ones.
+
+    ``size`` is kept up to date by every change; the methods return the
+    change in size so the session total can follow along.
+    """
+    __slots__ = ("recent", "summary", "overflow", "size", "last_intent")
+
+    def __init__(self, recent_turns: int):
+        self.recent: Deque[Turn] = deque(maxlen=recent_turns)
+        self.summary = ""
+        # Turns pushed out of the ring buffer, waiting to be folded into the summary
+        self.overflow: List[Turn] = []
+        self.size = 0
+        self.last_intent: Optional[str] = None
+
+    def add(self, turn: Turn) -> int:
+        if len(self.recent) == self.recent.maxlen:
+            self.overflow.append(self.recent[0])
+        self.recent.append(turn)
+        self.last_intent = turn.intent
+        self.size += turn.size
+        return turn.size
+
+    def shift(self) -> int:
+        """Move the oldest recent turn to the overflow; returns its size"""
+        turn = self.recent.popleft()
+        self.overflow.append(turn)
+        return turn.size
+
+    def compact(self, summary_chars: int) -> int:
+        """Fold overflowed turns into the summary"""
+        if not self.overflow:
+            return 0
+        before = self.size
+        texts = [self.summary] if self.summary else []
+        for turn in self.overflow:
+            texts.extend((turn.message, turn.response))
+            self.size -= turn.size
+        self.size -= len(self.summary)
+        self.summary = summarize(texts, summary_chars)
+        self.size += len(self.summary)
+        self.overflow = []
+        return self.size - before
+
+
+class SessionMemory:
+    __slots__ = ("agents", "size", "last_used")
+
+    def __init__(self):
+        self.agents: Dict[str, AgentMemory] = {}
+        self.size = 0
+        self.last_used = time.monotonic()
+
+
+class ConversationMemory:
+    """Per-session conversation memory with a predictable memory budget.
+
+    Each agent keeps its last ``recent_turns`` turns of a session verbatim
+    (messages and replies truncated to ``max_turn_chars``); turns that fall
+    out of that ring buffer are compacted into an extractive summary of at
+    most ``summary_chars`` by ``compact_pending``, which ``run`` calls in
+    the background. When a session passes ``max_session_chars`` its oldest
+    turns are folded into the summaries on the spot, so as long as the
+    agents' summaries fit in the cap the store stays under
+    ``max_sessions * max_session_chars`` characters. The least recently
+    used session is evicted when a new one would pass ``max_sessions``,
+    and sessions idle for ``idle_seconds`` are dropped.
+    """
+
+    def __init__(self, max_sessions: int = 10000, recent_turns: int = 8, max_session_chars: int = 16000,
+                 max_turn_chars: int = 2000, summary_chars: int = 1000, idle_seconds: float = 1800):
+        self.max_sessions = max_sessions
+        self.recent_turns = recent_turns
+        self.max_session_chars = max_session_chars
+        self.max_turn_chars = max_turn_chars
+        self.summary_chars = summary_chars
+        self.idle_seconds = idle_seconds
+        self.sessions: "OrderedDict[str, SessionMemory]" = OrderedDict()
+        self.total_chars = 0
+        self._dirty: Set[str] = set()
+
+    @classmethod
+    def from_env(cls) -> "ConversationMemory":
+        return cls(
+            max_sessions=int(os.getenv("MEMORY_MAX_SESSIONS", "10000")),
+            recent_turns=int(os.getenv("MEMORY_RECENT_TURNS", "8")),
+            max_session_chars=int(os.getenv("MEMORY_SESSION_CHARS", "16000")),
+            idle_seconds=float(os.getenv("MEMORY_IDLE_SECONDS", "1800"))
+        )
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def context(self, session_id: str, agent_id: str) -> Optional[ConversationContext]:
+        """What ``agent_id`` remembers of the session, or None if it has no history there"""
+        session = self.sessions.get(session_id)
+        memory = session.agents.get(agent_id) if session is not None else None
+        if memory is None:
+            return None
+        self._touch(session_id, session)
+        return ConversationContext(session_id, agent_id, memory.summary, list(memory.recent), memory.last_intent)
+
+    def record(self, session_id: str, agent_id: str, message: str, response: str, intent: Optional[str] = None):
+        """Remember a turn, enforcing the session's memory cap"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = SessionMemory()
+            self._evict_over_capacity()
+        self._touch(session_id, session)
+
+        memory = session.agents.get(agent_id)
+        if memory is None:
+            memory = session.agents[agent_id] = AgentMemory(self.recent_turns)
+        turn = Turn(message[:self.max_turn_chars], response[:self.max_turn_chars], intent)
+        self._resize(session, memory.add(turn))
+        if memory.overflow:
+            self._dirty.add(session_id)
+        if session.size > self.max_session_chars:
+            self._enforce_cap(session_id, session)
+        MEMORY_CHARS.set(self.total_chars)
+
+    def forget(self, session_id: str):
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            self._drop(session_id, session)
+
+    def _touch(self, session_id: str, session: SessionMemory):
+        session.last_used = time.monotonic()
+        self.sessions.move_to_end(session_id)
+
+    def _resize(self, session: SessionMemory, delta: int):
+        session.size += delta
+        self.total_chars += delta
+
+    def _enforce_cap(self, session_id: str, session: SessionMemory):
+        """Fold the oldest turns of the largest agents into their summaries until under the cap"""
+        target = int(self.max_session_chars * CAP_TARGET)
+        while session.size > target:
+            excess = session.size - target
+            candidates = [memory for memory in session.agents.values() if memory.recent]
+            while excess > 0 and candidates:
+                memory = max(candidates, key=lambda memory: memory.size - len(memory.summary))
+                excess -= memory.shift()
+                if not memory.recent:
+                    candidates.remove(memory)
+            for memory in session.agents.values():
+                self._resize(session, memory.compact(self.summary_chars))
+            if not candidates:
+                # Nothing but summaries left, each already within summary_chars
+                break
+        self._dirty.discard(session_id)
+
+    def _drop(self, session_id: str, session: SessionMemory):
+        self._dirty.discard(session_id)
+        self.total_chars -= session.size
+        MEMORY_CHARS.set(self.total_chars)
+        MEMORY_SESSIONS.set(len(self.sessions))
+
+    def _evict_over_capacity(self):
+        while len(self.sessions) > self.max_sessions:
+            session_id, session = self.sessions.popitem(last=False)
+            self._drop(session_id, session)
+            MEMORY_EVICTIONS_TOTAL.labels("capacity").inc()
+        MEMORY_SESSIONS.set(len(self.sessions))
+
+    def evict_idle(self) -> int:
+        """Drop sessions idle for longer than ``idle_seconds``; returns how many were dropped"""
+        cutoff = time.monotonic() - self.idle_seconds
+        evicted = 0
+        # Sessions are kept in least recently used order, so stop at the first recent one
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+            if session.last_used > cutoff:
+                break
+            del self.sessions[session_id]
+            self._drop(session_id, session)
+            evicted += 1
+        if evicted:
+            MEMORY_EVICTIONS_TOTAL.labels("idle").inc(evicted)
+        return evicted
+
+    def compact_pending(self) -> int:
+        """Summarize turns that have left the ring buffers; returns the number of sessions compacted"""
+        dirty, self._dirty = self._dirty, set()
+        compacted = 0
+        for session_id in dirty:
+            session = self.sessions.get(session_id)
+            if session is None:
+                continue
+            for memory in session.agents.values():
+                self._resize(session, memory.compact(self.summary_chars))
+            compacted += 1
+        MEMORY_CHARS.set(self.total_chars)
+        return compacted
+
+    async def run(self, interval: float = 1.0):
+        """Background task: compact overflowed turns and evict idle sessions every ``interval`` seconds"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.compact_pending()
+                self.evict_idle()
+            except Exception as e:
+                logger.error(f"Conversation memory maintenance failed: {e}")
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from services.catalog import KeyedCache
+from services.metrics import REGISTRY
+from services.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+WORKFLOW_SECONDS = REGISTRY.histogram(
+    "workflow_seconds", "End-to-end time of an agent workflow run", ["workflow"])
+WORKFLOW_STAGE_SECONDS = REGISTRY.histogram(
+    "workflow_stage_seconds", "Time of each workflow stage that ran (memo hits excluded)", ["workflow", "stage"])
+
+# Called with (workflow inputs, results of the stages it depends on by name)
+StageFunc = Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Any]]
+
+
+class Stage:
+    """One step of a workflow: an async function of the inputs and its dependencies' results.
+
+    The stage name identifies the computation in the memo, so two stages
+    with the same name must compute the same thing from the same inputs.
+    """
+
+    def __init__(self, name: str, run: StageFunc, depends_on: Sequence[str] = ()):
+        self.name = name
+        self.run = run
+        self.depends_on = tuple(depends_on)
+
+
+class Workflow:
+    """A DAG of stages, checked for unknown dependencies and cycles when built"""
+
+    def __init__(self, name: str, stages: List[Stage]):
+        self.name = name
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError(f"Workflow {name} has duplicate stage names")
+        for stage in stages:
+            unknown = [dependency for dependency in stage.depends_on if dependency not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage {stage.name} of workflow {name} depends on unknown stages {unknown}")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        remaining = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+        order: List[str] = []
+        while remaining:
+            ready = [name for name, dependencies in remaining.items() if not dependencies]
+            if not ready:
+                raise ValueError(f"Workflow {self.name} has a cycle among {sorted(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+        return order
+
+    def critical_path(self, seconds: Dict[str, float]) -> Tuple[float, List[str]]:
+        """Longest chain of stage durations: the least time the whole workflow can take"""
+        finish: Dict[str, Tuple[float, List[str]]] = {}
+        for name in self.order:
+            before = max((finish[dependency] for dependency in self.stages[name].depends_on),
+                         key=lambda chain: chain[0], default=(0.0, []))
+            finish[name] = (before[0] + seconds.get(name, 0.0), before[1] + [name])
+        return max(finish.values(), key=lambda chain: chain[0], default=(0.0, []))
+
+
+class WorkflowResult:
+    def __init__(self, results: Dict[str, Any], seconds: Dict[str, float], memo_hits: List[str], elapsed: float):
+        self.results = results
+        # Run time of each stage that executed; memo hits are 0
+        self.seconds = seconds
+        self.memo_hits = memo_hits
+        self.elapsed = elapsed
+
+
+class Orchestrator:
+    """Runs workflows, starting each stage as soon as the stages it depends on finish.
+
+    With a ``key`` identifying the inputs, stage results are memoized per
+    (stage, key), so repeated or concurrent runs over the same inputs
+    share each stage's work. If a stage fails, the stages still running
+    are cancelled and the error propagates.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024):
+        self.memo = KeyedCache("workflow_stages", ttl=ttl, max_entries=max_entries)
+
+    def forget(self):
+        """Drop all memoized stage results, e.g. after an agent is reloaded"""
+        self.memo.invalidate()
+
+    async def run(self, workflow: Workflow, inputs: Dict[str, Any], key: Optional[Hashable] = None) -> WorkflowResult:
+        started = time.perf_counter()
+        seconds: Dict[str, float] = {}
+        memo_hits: List[str] = []
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def execute(stage: Stage, upstream: Dict[str, Any]) -> Any:
+            stage_started = time.perf_counter()
+            with tracer.span("workflow.stage", workflow=workflow.name, stage=stage.name):
+                result = await stage.run(inputs, upstream)
+            seconds[stage.name] = time.perf_counter() - stage_started
+            WORKFLOW_STAGE_SECONDS.labels(workflow.name, stage.name).observe(seconds[stage.name])
+            return result
+
+        async def run_stage(stage: Stage) -> Any:
+            # Tasks are created in topological order, so every dependency already has one
+            dependencies = [tasks[name] for name in stage.depends_on]
+            upstream = dict(zip(stage.depends_on, await asyncio.gather(*dependencies))) if dependencies else {}
+            if key is None:
+                return await execute(stage, upstream)
+            result = await self.memo.get((stage.name, key), lambda: execute(stage, upstream))
+            if stage.name not in seconds:
+                seconds[stage.name] = 0.0
+                memo_hits.append(stage.name)
+            return result
+
+        with tracer.span("workflow.run", workflow=workflow.name, stages=len(workflow.order)):
+            for name in workflow.order:
+                tasks[name] = asyncio.create_task(run_stage(workflow.stages[name]))
+            try:
+                done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+            finally:
+                for task in tasks.values():
+                    task.cancel()
+            # Surface the first failure; stages cancelled because of it are not errors of their own
+            for name in workflow.order:
+                task = tasks[name]
+                if task in done and not task.cancelled() and task.exception() is not None:
+                    logger.error(f"Stage {name} of workflow {workflow.name} failed: {task.exception()}")
+                    raise task.exception()
+
+        elapsed = time.perf_counter() - started
+        WORKFLOW_SECONDS.labels(workflow.name).observe(elapsed)
+        results = {name: tasks[name].result() for name in workflow.order}
+        return WorkflowResult(results, seconds, memo_hits, elapsed)
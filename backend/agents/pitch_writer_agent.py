@@ -1,11 +1,20 @@
 import asyncio
 import logging
-from typing import Dict, List, Any
-from .base_agent import BaseAgent
+from typing import Dict, List, Any, Optional
+from .base_agent import BaseAgent, intent_handler
+from .memory import ConversationContext
+from models.schemas import MarketResearch
 
 logger = logging.getLogger(__name__)
 
 class PitchWriterAgent(BaseAgent):
+    intent_rules = [
+        ('create_pitch_outline', ['pitch', 'presentation', 'deck']),
+        ('provide_content_strategy', ['content', 'copy', 'writing']),
+        ('develop_narrative', ['story', 'narrative', 'messaging']),
+    ]
+    default_intent = 'general_content_advice'
+    
     def __init__(self):
         super().__init__(
             agent_id="pitch",
@@ -13,26 +22,18 @@ class PitchWriterAgent(BaseAgent):
             role="Content & Presentation Creation"
         )
 
-    async def process_message(self, message: str) -> str:
+    async def process_message(self, message: str, intent: Optional[str] = None,
+                              context: Optional[ConversationContext] = None) -> str:
         """Process user message and provide content creation insights"""
         try:
             await self._simulate_processing_time()
             
-            message_lower = message.lower()
-            
-            if any(keyword in message_lower for keyword in ['pitch', 'presentation', 'deck']):
-                return await self._create_pitch_outline(message)
-            elif any(keyword in message_lower for keyword in ['content', 'copy', 'writing']):
-                return await self._provide_content_strategy(message)
-            elif any(keyword in message_lower for keyword in ['story', 'narrative', 'messaging']):
-                return await self._develop_narrative(message)
-            else:
-                return await self._general_content_advice(message)
-                
+            return await self.handle_intent(intent or self.route_intent(message, context), message)
         except Exception as e:
             logger.error(f"Error in PitchWriterAgent.process_message: {e}")
             return "I encountered an issue with content creation. Could you specify what type of content you need?"
 
+    @intent_handler
     async def _create_pitch_outline(self, message: str) -> str:
         """Create a compelling pitch deck outline"""
         response = "I'll help you create a compelling pitch deck structure:\n\n"
@@ -77,6 +78,7 @@ class PitchWriterAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _provide_content_strategy(self, message: str) -> str:
         """Provide content marketing and messaging strategy"""
         response = "Here's a comprehensive content strategy framework:\n\n"
@@ -122,6 +124,7 @@ class PitchWriterAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _develop_narrative(self, message: str) -> str:
         """Develop compelling narrative and messaging"""
         response = "Let me help you craft a compelling brand narrative:\n\n"
@@ -175,6 +178,7 @@ class PitchWriterAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _general_content_advice(self, message: str) -> str:
         """Provide general content and communications advice"""
         response = "Here's my content strategy recommendation:\n\n"
@@ -215,11 +219,28 @@ class PitchWriterAgent(BaseAgent):
         
         return response
 
-    async def create_pitch_deck(self, project_description: str, target_audience: str) -> Dict[str, Any]:
-        """Create a detailed pitch deck structure"""
+    async def create_pitch_deck(self, project_description: str, target_audience: str,
+                                market: Optional[MarketResearch] = None,
+                                tech_stack: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Create a detailed pitch deck structure, sizing the market and naming competitors from ``market``
+        and naming what the product is built on from ``tech_stack``"""
         try:
             await self._simulate_processing_time(2.0, 3.5)
             
+            market_content = "TAM, SAM, SOM analysis with growth projections"
+            competition_content = "Competitive landscape and differentiation"
+            if market is not None:
+                if market.market_size:
+                    market_content = f"{market.market_size}; {market_content}"
+                if market.competitors:
+                    names = ", ".join(competitor["name"] for competitor in market.competitors if "name" in competitor)
+                    competition_content = f"{competition_content} against {names}"
+            demo_content = "Live demo or compelling product screenshots"
+            frameworks = [choices["framework"] for choices in (tech_stack or {}).values()
+                          if isinstance(choices, dict) and "framework" in choices]
+            if frameworks:
+                demo_content = f"{demo_content}, built on {' and '.join(frameworks)}"
+            
             deck = {
                 "title": f"Pitch Deck: {project_description}",
                 "target_audience": target_audience,
@@ -245,13 +266,13 @@ class PitchWriterAgent(BaseAgent):
                     {
                         "slide_number": 4,
                         "title": "Market Opportunity",
-                        "content": "TAM, SAM, SOM analysis with growth projections",
+                        "content": market_content,
                         "speaker_notes": "Focus on realistic capture, not just total market"
                     },
                     {
                         "slide_number": 5,
                         "title": "Product Demo",
-                        "content": "Live demo or compelling product screenshots",
+                        "content": demo_content,
                         "speaker_notes": "Show, don't tell - let the product speak"
                     },
                     {
@@ -269,7 +290,7 @@ class PitchWriterAgent(BaseAgent):
                     {
                         "slide_number": 8,
                         "title": "Competition",
-                        "content": "Competitive landscape and differentiation",
+                        "content": competition_content,
                         "speaker_notes": "Acknowledge competition but highlight your edge"
                     },
                     {
@@ -1,16 +1,26 @@
 import asyncio
 import json
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import re
 
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, intent_handler
+from .memory import ConversationContext
+from .taxonomy import DomainTaxonomy
 from models.schemas import ProjectAnalysis
 
 logger = logging.getLogger(__name__)
 
 class ProductManagerAgent(BaseAgent):
+    intent_rules = [
+        ('analyze_product_idea', ['idea', 'product', 'feature', 'build', 'create', 'develop']),
+        ('create_requirements', ['requirements', 'specs', 'specification']),
+        ('create_roadmap', ['roadmap', 'timeline', 'planning']),
+        ('analyze_users', ['user', 'customer', 'personas']),
+    ]
+    default_intent = 'general_product_advice'
+    
     def __init__(self):
         super().__init__(
             agent_id="pm",
@@ -27,33 +37,31 @@ class ProductManagerAgent(BaseAgent):
             "MVP definition",
             "User experience planning"
         ]
+        # Domains, synonyms, features and audiences, compiled once per agent instance
+        self.taxonomy = DomainTaxonomy.load()
 
-    async def process_message(self, message: str) -> str:
+    def data_files(self) -> List[str]:
+        return [self.taxonomy.path] if self.taxonomy.path else []
+
+    async def process_message(self, message: str, intent: Optional[str] = None,
+                              context: Optional[ConversationContext] = None) -> str:
         """Process user message and provide product management insights"""
         try:
-            # Analyze the message for product-related keywords
-            message_lower = message.lower()
-            
-            # Determine response type based on message content
-            if any(keyword in message_lower for keyword in ['idea', 'product', 'feature', 'build', 'create', 'develop']):
-                return await self._analyze_product_idea(message)
-            elif any(keyword in message_lower for keyword in ['requirements', 'specs', 'specification']):
-                return await self._create_requirements(message)
-            elif any(keyword in message_lower for keyword in ['roadmap', 'timeline', 'planning']):
-                return await self._create_roadmap(message)
-            elif any(keyword in message_lower for keyword in ['user', 'customer', 'personas']):
-                return await self._analyze_users(message)
-            else:
-                return await self._general_product_advice(message)
-                
+            intent = intent or self.route_intent(message, context)
+            if intent == 'analyze_product_idea' and context is not None:
+                # Follow-ups ("make it work offline") rarely restate the product; the earlier turns name it.
+                # Our own replies are left out so features we listed don't pull in other domains.
+                return await self._analyze_product_idea(message, context.text(include_responses=False))
+            return await self.handle_intent(intent, message)
         except Exception as e:
             logger.error(f"Error in ProductManagerAgent.process_message: {e}")
             return "I encountered an issue analyzing your request. Could you please rephrase your product requirements?"
 
-    async def _analyze_product_idea(self, idea: str) -> str:
-        """Analyze a product idea and break it down"""
+    @intent_handler
+    async def _analyze_product_idea(self, idea: str, history: str = "") -> str:
+        """Analyze a product idea and break it down, reading the product from ``history`` too"""
         # Extract key components from the idea
-        components = await self._extract_product_components(idea)
+        components = await self._extract_product_components(f"{history}\n{idea}" if history else idea)
         
         response = f"Excellent! I'll help break down '{idea}' into actionable components:\n\n"
         
@@ -78,6 +86,7 @@ class ProductManagerAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _create_requirements(self, request: str) -> str:
         """Create detailed requirements based on request"""
         response = "I'll help create comprehensive requirements:\n\n"
@@ -103,6 +112,7 @@ class ProductManagerAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _create_roadmap(self, request: str) -> str:
         """Create a product roadmap"""
         response = "Here's a strategic product roadmap:\n\n"
@@ -129,6 +139,7 @@ class ProductManagerAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _analyze_users(self, request: str) -> str:
         """Analyze user needs and create personas"""
         response = "Let me help define your target users:\n\n"
@@ -156,6 +167,7 @@ class ProductManagerAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _general_product_advice(self, message: str) -> str:
         """Provide general product management advice"""
         advice_options = [
@@ -185,65 +197,17 @@ class ProductManagerAgent(BaseAgent):
         return response
 
     async def _extract_product_components(self, idea: str) -> Dict[str, Any]:
-        """Extract key product components from an idea description"""
-        components = {
-            'purpose': 'Solve user problems efficiently',
-            'audience': 'Early adopters and tech-savvy users',
-            'features': []
-        }
-        
-        # Simple keyword-based feature extraction
-        idea_lower = idea.lower()
-        
-        if 'ai' in idea_lower or 'artificial intelligence' in idea_lower:
-            components['features'].extend([
-                'AI-powered core functionality',
-                'Machine learning algorithms',
-                'Intelligent recommendations'
-            ])
-        
-        if 'finance' in idea_lower or 'financial' in idea_lower:
-            components['features'].extend([
-                'Financial data integration',
-                'Transaction tracking',
-                'Budget management',
-                'Reporting and analytics'
-            ])
-            components['audience'] = 'Finance professionals and business owners'
-        
-        if 'voice' in idea_lower or 'speech' in idea_lower:
-            components['features'].extend([
-                'Voice recognition',
-                'Speech-to-text conversion',
-                'Audio processing',
-                'Voice commands'
-            ])
-        
-        if 'tutor' in idea_lower or 'education' in idea_lower:
-            components['features'].extend([
-                'Personalized learning paths',
-                'Progress tracking',
-                'Interactive lessons',
-                'Performance analytics'
-            ])
-            components['audience'] = 'Students, parents, and educators'
-        
-        # Default features if none detected
-        if not components['features']:
-            components['features'] = [
-                'User registration and profiles',
-                'Core functionality',
-                'Data management',
-                'User dashboard',
-                'Settings and preferences'
-            ]
-        
-        return components
+        """Extract key product components from an idea description via the domain taxonomy"""
+        return self.taxonomy.components(idea)
+
+    async def break_down_features(self, description: str) -> Dict[str, Any]:
+        """Purpose, audience and features of a project, the input to the other agents' planning"""
+        return await self._extract_product_components(description)
 
-    async def analyze_project(self, description: str) -> ProjectAnalysis:
-        """Provide comprehensive project analysis"""
+    async def analyze_project(self, description: str, components: Optional[Dict[str, Any]] = None) -> ProjectAnalysis:
+        """Provide comprehensive project analysis; ``components`` skips re-matching an already broken-down project"""
         try:
-            components = await self._extract_product_components(description)
+            components = components or await self._extract_product_components(description)
             
             analysis = ProjectAnalysis(
                 summary=f"Strategic analysis of: {description}",
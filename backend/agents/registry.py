@@ -0,0 +1,238 @@
+import glob
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .base_agent import BaseAgent
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+AGENT_IMPORT_SECONDS = REGISTRY.histogram(
+    "agent_import_seconds", "Time to import and instantiate an agent on first use", ["agent"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config")
+ENTRY_POINT_GROUP = "team_strategy.agents"
+REQUIRED_KEYS = ("id", "name", "role", "avatar", "entry_point")
+
+
+def _read_config(filename: str) -> Dict[str, Any]:
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_config_dir(path: str) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+    configs = []
+    for filename in sorted(glob.glob(os.path.join(path, "*.json"))):
+        try:
+            configs.append((filename, _read_config(filename)))
+        except (OSError, ValueError) as e:
+            logger.error(f"Skipping agent config {filename}: {e}")
+    return configs
+
+
+def _load_entry_points(group: str) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+    """Configs published by installed plugins; each entry point resolves to a config dict"""
+    configs = []
+    for entry_point in entry_points(group=group):
+        try:
+            config = dict(entry_point.load())
+            config.setdefault("id", entry_point.name)
+            configs.append((None, config))
+        except Exception as e:
+            logger.error(f"Skipping agent plugin {entry_point.name}: {e}")
+    return configs
+
+
+def _module_name(entry_point: str) -> str:
+    return entry_point.partition(":")[0]
+
+
+def _import_class(path: str) -> type:
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class AgentRegistry:
+    """Agent configs discovered up front, agent modules imported on first use.
+
+    Configs come from JSON files in the config directories and from plugin
+    entry points (later sources override earlier ones by id). Each config
+    names its class as ``entry_point = "module:Class"``; the module is only
+    imported when the agent is first looked up, so listing agents and
+    serving the catalog never pay for agent imports.
+
+    A config may also carry ``intent_rules`` (a list of [intent, [keywords]]
+    pairs) and ``default_intent``, which override the class's routing so
+    rules can change without touching code.
+    """
+
+    def __init__(self, configs: List[Tuple[Optional[str], Dict[str, Any]]],
+                 on_load: Optional[Callable[[BaseAgent], None]] = None):
+        self.configs: Dict[str, Dict[str, Any]] = {}
+        # Config file each agent came from, for reloads (None for plugin entry points)
+        self.sources: Dict[str, Optional[str]] = {}
+        for source, config in sorted(configs, key=lambda item: item[1].get("order", 1000)):
+            if not self._valid(config):
+                continue
+            config.setdefault("active", True)
+            self.configs[config["id"]] = config
+            self.sources[config["id"]] = source
+        self.on_load = on_load
+        self.import_seconds: Dict[str, float] = {}
+        self._instances: Dict[str, BaseAgent] = {}
+        self._reload_listeners: List[Callable[[str], None]] = []
+
+    @staticmethod
+    def _valid(config: Dict[str, Any]) -> bool:
+        missing = [key for key in REQUIRED_KEYS if key not in config]
+        if missing:
+            logger.error(f"Skipping agent config {config.get('id', '?')}: missing {missing}")
+        return not missing
+
+    @classmethod
+    def discover(cls, config_dirs: Optional[List[str]] = None, group: str = ENTRY_POINT_GROUP,
+                 on_load: Optional[Callable[[BaseAgent], None]] = None) -> "AgentRegistry":
+        """Build a registry from config directories (default: built-in plus AGENT_CONFIG_DIRS) and plugins"""
+        if config_dirs is None:
+            extra = os.getenv("AGENT_CONFIG_DIRS", "")
+            config_dirs = [CONFIG_DIR] + [path for path in extra.split(os.pathsep) if path]
+        configs = []
+        for path in config_dirs:
+            configs.extend(_load_config_dir(path))
+        configs.extend(_load_entry_points(group))
+        return cls(configs, on_load=on_load)
+
+    def _instantiate(self, config: Dict[str, Any]) -> BaseAgent:
+        agent = _import_class(config["entry_point"])()
+        if "intent_rules" in config:
+            agent.intent_rules = [(intent, list(keywords)) for intent, keywords in config["intent_rules"]]
+        if "default_intent" in config:
+            agent.default_intent = config["default_intent"]
+        if self.on_load is not None:
+            self.on_load(agent)
+        return agent
+
+    def _load(self, agent_id: str) -> BaseAgent:
+        config = self.configs[agent_id]
+        started = time.perf_counter()
+        agent = self._instantiate(config)
+        elapsed = time.perf_counter() - started
+        self.import_seconds[agent_id] = elapsed
+        AGENT_IMPORT_SECONDS.labels(agent_id).observe(elapsed)
+        logger.info("Loaded agent %s from %s in %.1fms", agent_id, config["entry_point"], elapsed * 1000)
+        return agent
+
+    def add_reload_listener(self, listener: Callable[[str], None]):
+        """Call ``listener(agent_id)`` after each agent is reloaded, to drop state tied to it"""
+        self._reload_listeners.append(listener)
+
+    def reload(self, agent_id: str) -> List[str]:
+        """Re-read an agent's config file and module, then swap in a fresh instance.
+
+        Requests already running keep the instance they started with. Other
+        loaded agents defined in the same module are replaced too. If the
+        config or the module fails to load, the old ones stay in place and
+        the error propagates. Returns the ids of the reloaded agents.
+        """
+        if agent_id not in self.configs:
+            raise KeyError(agent_id)
+        source = self.sources.get(agent_id)
+        config = _read_config(source) if source else dict(self.configs[agent_id])
+        if config.get("id") != agent_id or not self._valid(config):
+            raise ValueError(f"Invalid config for agent {agent_id}")
+        # Runtime state such as a toggle outlives the reload
+        config["active"] = self.configs[agent_id].get("active", True)
+
+        module_name = _module_name(config["entry_point"])
+        affected = [agent_id] + [
+            other for other in self._instances
+            if other != agent_id and _module_name(self.configs[other]["entry_point"]) == module_name
+        ]
+        module = sys.modules.get(module_name)
+        if module is not None:
+            importlib.invalidate_caches()
+            importlib.reload(module)
+
+        # Build everything before swapping so a failure leaves the old agents serving
+        replacements = {
+            other: self._instantiate(config if other == agent_id else self.configs[other])
+            for other in affected if other in self._instances or other == agent_id
+        }
+        # Update in place so references held elsewhere (agent_configs) see the change
+        self.configs[agent_id].clear()
+        self.configs[agent_id].update(config)
+        self._instances.update(replacements)
+        for other in affected:
+            logger.info("Reloaded agent %s from %s", other, self.configs[other]["entry_point"])
+            for listener in self._reload_listeners:
+                listener(other)
+        return affected
+
+    def watched_files(self) -> Dict[str, List[str]]:
+        """Config, module and data files of the agents, mapped to the agent ids they define"""
+        files: Dict[str, List[str]] = {}
+        for agent_id, config in self.configs.items():
+            source = self.sources.get(agent_id)
+            if source:
+                files.setdefault(source, []).append(agent_id)
+            module = sys.modules.get(_module_name(config["entry_point"]))
+            if module is not None and getattr(module, "__file__", None):
+                files.setdefault(module.__file__, []).append(agent_id)
+            # Data files (such as the PM's domain taxonomy) are only known once the agent is built
+            agent = self._instances.get(agent_id)
+            if agent is not None:
+                for path in agent.data_files():
+                    files.setdefault(path, []).append(agent_id)
+        return files
+
+    def __getitem__(self, agent_id: str) -> BaseAgent:
+        agent = self._instances.get(agent_id)
+        if agent is None:
+            if agent_id not in self.configs:
+                raise KeyError(agent_id)
+            agent = self._instances[agent_id] = self._load(agent_id)
+        return agent
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self.configs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.configs)
+
+    def __len__(self) -> int:
+        return len(self.configs)
+
+    def keys(self):
+        return self.configs.keys()
+
+    def values(self) -> List[BaseAgent]:
+        """Every agent, loading any that are not loaded yet"""
+        return [self[agent_id] for agent_id in self.configs]
+
+    def items(self):
+        return [(agent_id, self[agent_id]) for agent_id in self.configs]
+
+    def loaded(self) -> Dict[str, BaseAgent]:
+        """Agents that have been loaded so far, without loading the rest"""
+        return dict(self._instances)
+
+    def preload(self):
+        """Load every agent now, e.g. at worker startup when warm agents matter more than boot time"""
+        self.values()
+
+
+if __name__ == "__main__":
+    # Report discovered agents and per-agent import cost: python -m agents.registry
+    started = time.perf_counter()
+    registry = AgentRegistry.discover()
+    print(f"Discovered {len(registry)} agents in {(time.perf_counter() - started) * 1000:.1f}ms")
+    registry.preload()
+    for agent_id, config in registry.configs.items():
+        print(f"  {agent_id:<10}{config['entry_point']:<55}{registry.import_seconds[agent_id] * 1000:>8.1f}ms")
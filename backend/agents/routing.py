@@ -0,0 +1,134 @@
+import logging
+import os
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from .base_agent import BaseAgent
+from services.tokenizer import tokenize
+
+if TYPE_CHECKING:
+    from .intent_classifier import IntentClassifier
+
+logger = logging.getLogger(__name__)
+
+# Classifier picks below this confidence are left to the keyword rules and fallbacks
+DEFAULT_MIN_CONFIDENCE = float(os.getenv("INTENT_MIN_CONFIDENCE", "0.3"))
+
+
+class IntentMatch(NamedTuple):
+    """The intent picked for an agent and how sure the pick is (None when decided by keyword rules)"""
+    intent: str
+    confidence: Optional[float] = None
+
+
+class IntentRouter:
+    """Routes messages to an intent per agent with one keyword scan per message.
+
+    Every agent's rules are compiled into a single shared keyword table, so
+    a message is lowercased and scanned once no matter how many agents take
+    part, and each agent then picks its first matching rule from the set of
+    keywords found. Rule results match ``BaseAgent.route_intent``.
+
+    An agent's rules are added the first time it is routed to, so agents
+    that are never used are never loaded.
+
+    With a ``classifier_factory``, agents the trained classifier knows are
+    routed by it instead, with a calibrated confidence; the keyword rules
+    remain for other agents, for messages the classifier has no match for
+    and for matches below ``min_confidence``. The classifier is trained on
+    first use; if the factory returns None, the keyword rules route everything.
+    """
+
+    def __init__(self, agents: Mapping[str, BaseAgent],
+                 classifier_factory: Optional[Callable[[], Optional["IntentClassifier"]]] = None,
+                 min_confidence: float = DEFAULT_MIN_CONFIDENCE):
+        self.agents = agents
+        self.classifier_factory = classifier_factory
+        self.min_confidence = min_confidence
+        self._classifier: Optional["IntentClassifier"] = None
+        self.keywords: Tuple[str, ...] = ()
+        self.rules: Dict[str, List[Tuple[str, FrozenSet[str]]]] = {}
+        self.defaults: Dict[str, str] = {}
+
+    @property
+    def classifier(self) -> Optional["IntentClassifier"]:
+        if self._classifier is None and self.classifier_factory is not None:
+            self._classifier = self.classifier_factory()
+            if self._classifier is None:
+                # No classifier can be built (e.g. numpy missing); keep to the keyword rules
+                self.classifier_factory = None
+        return self._classifier
+
+    def _ensure(self, agent_ids: Iterable[str]):
+        missing = [agent_id for agent_id in agent_ids if agent_id not in self.rules and agent_id in self.agents]
+        for agent_id in missing:
+            agent = self.agents[agent_id]
+            self.rules[agent_id] = [(intent, frozenset(keywords)) for intent, keywords in agent.intent_rules]
+            self.defaults[agent_id] = agent.default_intent
+        if missing:
+            self._rebuild_keywords()
+
+    def _rebuild_keywords(self):
+        self.keywords = tuple(sorted({
+            keyword for rules in self.rules.values() for _, keywords in rules for keyword in keywords
+        }))
+
+    def forget(self, agent_id: str):
+        """Drop an agent's compiled rules and the classifier; both are rebuilt on next use"""
+        self._classifier = None
+        if self.rules.pop(agent_id, None) is not None:
+            self.defaults.pop(agent_id, None)
+            self._rebuild_keywords()
+
+    def _matched_keywords(self, message: str) -> FrozenSet[str]:
+        message_lower = tokenize(message).lower
+        return frozenset(keyword for keyword in self.keywords if keyword in message_lower)
+
+    def _pick(self, agent_id: str, matched: FrozenSet[str], fallback: Optional[str] = None) -> str:
+        for intent, keywords in self.rules[agent_id]:
+            if not keywords.isdisjoint(matched):
+                return intent
+        return fallback or self.defaults[agent_id]
+
+    def _classify(self, message: str, agent_ids: List[str], fallbacks: Mapping[str, str],
+                  classified: Mapping[str, IntentMatch]) -> Dict[str, IntentMatch]:
+        matched: Optional[FrozenSet[str]] = None
+        matches = {}
+        for agent_id in agent_ids:
+            if agent_id not in self.rules:
+                continue
+            match = classified.get(agent_id)
+            if match is None or match.confidence < self.min_confidence:
+                if matched is None:
+                    matched = self._matched_keywords(message)
+                match = IntentMatch(self._pick(agent_id, matched, fallbacks.get(agent_id)))
+            matches[agent_id] = match
+        return matches
+
+    def classify(self, message: str, agent_ids: Optional[Iterable[str]] = None,
+                 fallbacks: Optional[Mapping[str, str]] = None) -> Dict[str, IntentMatch]:
+        """Intent and confidence for each of ``agent_ids`` (default: every agent).
+
+        ``fallbacks`` maps agent ids to the intent to use instead of the
+        agent's default when nothing matches (the previous turn's intent).
+        """
+        agent_ids = list(self.agents if agent_ids is None else agent_ids)
+        self._ensure(agent_ids)
+        classifier = self.classifier
+        classified = classifier.classify(message, agent_ids) if classifier is not None else {}
+        return self._classify(message, agent_ids, fallbacks or {}, classified)
+
+    def route(self, message: str, agent_ids: Optional[Iterable[str]] = None,
+              fallbacks: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+        """Intent for each of ``agent_ids``, as ``classify`` without the confidences"""
+        return {agent_id: match.intent for agent_id, match in self.classify(message, agent_ids, fallbacks).items()}
+
+    def route_batch(self, messages: List[str]) -> List[Dict[str, IntentMatch]]:
+        """Classify many messages for every agent in one scoring pass; repeats are scored once"""
+        unique = list(dict.fromkeys(messages))
+        agent_ids = list(self.agents)
+        self._ensure(agent_ids)
+        classifier = self.classifier
+        classified = classifier.classify_batch(unique, agent_ids) if classifier is not None else [{}] * len(unique)
+        routed = {message: self._classify(message, agent_ids, {}, matches)
+                  for message, matches in zip(unique, classified)}
+        return [routed[message] for message in messages]
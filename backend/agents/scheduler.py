@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "scheduler_queue_wait_seconds", "Time agent jobs wait for an execution slot", ["priority"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+SCHEDULER_QUEUE_DEPTH = REGISTRY.gauge(
+    "scheduler_queue_depth", "Agent jobs waiting for an execution slot", ["priority"])
+SCHEDULER_RUNNING = REGISTRY.gauge(
+    "scheduler_running", "Agent jobs holding an execution slot")
+
+
+class Priority(str, Enum):
+    INTERACTIVE = "interactive"
+    BACKGROUND = "background"
+    BULK = "bulk"
+
+
+DEFAULT_WEIGHTS = {
+    Priority.INTERACTIVE: 8,
+    Priority.BACKGROUND: 2,
+    Priority.BULK: 1
+}
+
+
+class AgentScheduler:
+    """Runs agent jobs in a fixed number of slots with weighted fair dispatch.
+
+    Jobs start immediately while slots are free. Once saturated, each
+    priority class queues FIFO and freed slots go to the classes in
+    proportion to their weights (smooth weighted round robin), so
+    interactive chat keeps moving while background and bulk work still
+    make progress.
+    """
+
+    def __init__(self, max_workers: int = 64, weights: Optional[Dict[Priority, int]] = None):
+        self.max_workers = max_workers
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.running = 0
+        self._queues: Dict[Priority, Deque[Tuple[float, asyncio.Future]]] = {p: deque() for p in Priority}
+        self._current: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._waits: Dict[Priority, Tuple[int, float]] = {p: (0, 0.0) for p in Priority}
+        SCHEDULER_QUEUE_DEPTH.set_function(
+            lambda: {(p.value,): len(queue) for p, queue in self._queues.items()})
+
+    @classmethod
+    def from_env(cls) -> "AgentScheduler":
+        return cls(max_workers=int(os.getenv("SCHEDULER_MAX_WORKERS", "64")))
+
+    async def submit(self, priority: Priority, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Wait for a slot in ``priority``'s class, then run ``func(*args, **kwargs)``"""
+        await self._acquire(priority)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: Priority):
+        if self.running < self.max_workers and not any(self._queues.values()):
+            self._take_slot(priority, 0.0)
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (time.perf_counter(), waiter)
+        self._queues[priority].append(entry)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # The slot may have been granted just before we were cancelled
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            else:
+                # Leave no dead entry behind to count as queued or win a dispatch turn
+                self._queues[priority].remove(entry)
+            raise
+
+    def _take_slot(self, priority: Priority, waited: float):
+        self.running += 1
+        SCHEDULER_RUNNING.set(self.running)
+        SCHEDULER_QUEUE_WAIT_SECONDS.labels(priority.value).observe(waited)
+        count, total = self._waits[priority]
+        self._waits[priority] = (count + 1, total + waited)
+
+    def _release(self):
+        self.running -= 1
+        SCHEDULER_RUNNING.set(self.running)
+        self._dispatch()
+
+    def _next_class(self) -> Optional[Priority]:
+        """Smooth weighted round robin over the classes with queued jobs"""
+        ready = [p for p, queue in self._queues.items() if queue]
+        if not ready:
+            return None
+        total = 0
+        for p in ready:
+            self._current[p] += self.weights[p]
+            total += self.weights[p]
+        chosen = max(ready, key=lambda p: self._current[p])
+        self._current[chosen] -= total
+        return chosen
+
+    def _dispatch(self):
+        while self.running < self.max_workers:
+            priority = self._next_class()
+            if priority is None:
+                return
+            enqueued_at, waiter = self._queues[priority].popleft()
+            if waiter.cancelled():
+                continue
+            self._take_slot(priority, time.perf_counter() - enqueued_at)
+            waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and average queue wait per priority class"""
+        return {
+            "max_workers": self.max_workers,
+            "running": self.running,
+            "classes": {
+                p.value: {
+                    "weight": self.weights[p],
+                    "queued": len(self._queues[p]),
+                    "dispatched": self._waits[p][0],
+                    "avg_wait_seconds": self._waits[p][1] / self._waits[p][0] if self._waits[p][0] else 0.0
+                }
+                for p in Priority
+            }
+        }
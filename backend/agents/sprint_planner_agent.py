@@ -1,12 +1,22 @@
 import asyncio
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, intent_handler
+from .memory import ConversationContext
+from models.schemas import MarketResearch
 
 logger = logging.getLogger(__name__)
 
 class SprintPlannerAgent(BaseAgent):
+    intent_rules = [
+        ('create_sprint_plan', ['sprint', 'planning', 'scrum']),
+        ('manage_tasks', ['task', 'tasks', 'backlog']),
+        ('create_timeline', ['timeline', 'schedule', 'roadmap']),
+        ('analyze_capacity', ['capacity', 'estimation', 'velocity']),
+    ]
+    default_intent = 'general_planning_advice'
+    
     def __init__(self):
         super().__init__(
             agent_id="sprint",
@@ -14,28 +24,18 @@ class SprintPlannerAgent(BaseAgent):
             role="Agile Planning & Task Management"
         )
 
-    async def process_message(self, message: str) -> str:
+    async def process_message(self, message: str, intent: Optional[str] = None,
+                              context: Optional[ConversationContext] = None) -> str:
         """Process user message and provide sprint planning insights"""
         try:
             await self._simulate_processing_time()
             
-            message_lower = message.lower()
-            
-            if any(keyword in message_lower for keyword in ['sprint', 'planning', 'scrum']):
-                return await self._create_sprint_plan(message)
-            elif any(keyword in message_lower for keyword in ['task', 'tasks', 'backlog']):
-                return await self._manage_tasks(message)
-            elif any(keyword in message_lower for keyword in ['timeline', 'schedule', 'roadmap']):
-                return await self._create_timeline(message)
-            elif any(keyword in message_lower for keyword in ['capacity', 'estimation', 'velocity']):
-                return await self._analyze_capacity(message)
-            else:
-                return await self._general_planning_advice(message)
-                
+            return await self.handle_intent(intent or self.route_intent(message, context), message)
         except Exception as e:
             logger.error(f"Error in SprintPlannerAgent.process_message: {e}")
             return "I encountered an issue with sprint planning. Could you specify what planning aspect you need help with?"
 
+    @intent_handler
     async def _create_sprint_plan(self, message: str) -> str:
         """Create a comprehensive sprint plan"""
         response = "I'll help you create an effective sprint plan:\n\n"
@@ -87,6 +87,7 @@ class SprintPlannerAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _manage_tasks(self, message: str) -> str:
         """Provide task management and backlog guidance"""
         response = "Here's how I recommend managing your product backlog and tasks:\n\n"
@@ -140,6 +141,7 @@ class SprintPlannerAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _create_timeline(self, message: str) -> str:
         """Create project timeline and milestones"""
         response = "I'll help you create a realistic project timeline:\n\n"
@@ -198,6 +200,7 @@ class SprintPlannerAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _analyze_capacity(self, message: str) -> str:
         """Analyze team capacity and velocity"""
         response = "Let me help you analyze team capacity and planning:\n\n"
@@ -261,6 +264,7 @@ class SprintPlannerAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _general_planning_advice(self, message: str) -> str:
         """Provide general agile planning guidance"""
         response = "Here's my agile planning guidance for your project:\n\n"
@@ -309,29 +313,43 @@ class SprintPlannerAgent(BaseAgent):
         
         return response
 
-    async def create_sprint_plan(self, project_description: str, team_capacity: Dict[str, int]) -> Dict[str, Any]:
-        """Create a detailed sprint plan"""
+    async def create_sprint_plan(self, project_description: str, team_capacity: Dict[str, int],
+                                 tech_stack: Optional[Dict[str, Any]] = None,
+                                 market: Optional[MarketResearch] = None) -> Dict[str, Any]:
+        """Create a detailed sprint plan, with setup tasks naming ``tech_stack``'s tools and a goal
+        scoping the MVP against ``market``'s competitors when given"""
         try:
             await self._simulate_processing_time(2.0, 3.0)
             
+            frontend = (tech_stack or {}).get("frontend", {})
+            backend = (tech_stack or {}).get("backend", {})
+            infrastructure = (tech_stack or {}).get("infrastructure", {})
+            
             # Calculate total capacity
             total_capacity = sum(team_capacity.values())
             
+            goals = [
+                "Establish development environment and CI/CD pipeline",
+                "Implement core user authentication system",
+                "Create basic UI framework and components",
+                "Set up testing infrastructure"
+            ]
+            competitors = [competitor["name"] for competitor in (market.competitors if market else [])
+                           if "name" in competitor]
+            if competitors:
+                goals.append(f"Scope the MVP against {', '.join(competitors)}")
+            
             # Create sprint plan
             plan = {
                 "sprint_name": "Sprint 1 - Foundation",
                 "duration": 2,  # weeks
-                "goals": [
-                    "Establish development environment and CI/CD pipeline",
-                    "Implement core user authentication system", 
-                    "Create basic UI framework and components",
-                    "Set up testing infrastructure"
-                ],
+                "goals": goals,
                 "tasks": [
                     {
                         "id": "S1-T1",
                         "title": "Development Environment Setup",
-                        "description": "Configure development tools, databases, and deployment pipeline",
+                        "description": f"Configure development tools, {backend.get('database', 'databases')}, "
+                                       f"and {infrastructure.get('ci_cd', 'deployment')} pipeline",
                         "assigned_to": "backend",
                         "estimated_hours": 16,
                         "priority": "high",
@@ -349,7 +367,7 @@ class SprintPlannerAgent(BaseAgent):
                     {
                         "id": "S1-T3",
                         "title": "UI Component Library",
-                        "description": "Create reusable React components and design system",
+                        "description": f"Create reusable {frontend.get('framework', 'React')} components and design system",
                         "assigned_to": "frontend",
                         "estimated_hours": 20,
                         "priority": "medium",
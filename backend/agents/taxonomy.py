@@ -0,0 +1,112 @@
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.tokenizer import WORD_PATTERN, tokenize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "domains.json")
+
+# Trie key holding the domains a synonym ending at that node belongs to; words are never empty
+_END = ""
+
+
+class Domain:
+    """A product domain: the phrases that name it and what it implies for the product"""
+
+    def __init__(self, domain_id: str, synonyms: List[str], features: List[str], audience: Optional[str] = None):
+        self.id = domain_id
+        self.synonyms = synonyms
+        self.features = features
+        self.audience = audience
+
+
+class DomainTaxonomy:
+    """Domains compiled into a trie over words, matched against a text in one pass.
+
+    Every synonym is a path of lowercased words from the root, so matching
+    walks the text once and at each word follows the trie only as deep as
+    the longest synonym. The cost per message depends on the message and
+    the longest synonym, not on how many domains there are. Matches are
+    leftmost-longest: "machine learning" is one phrase, not "learning".
+    """
+
+    def __init__(self, domains: List[Domain], default: Optional[Dict[str, Any]] = None):
+        self.domains = domains
+        self.default = default or {}
+        # File the taxonomy was loaded from, watched for hot reloads
+        self.path: Optional[str] = None
+        self._trie: Dict[str, Any] = {}
+        ids = set()
+        for index, domain in enumerate(domains):
+            if domain.id in ids:
+                raise ValueError(f"Duplicate domain {domain.id} in taxonomy")
+            ids.add(domain.id)
+            for synonym in domain.synonyms:
+                self._add(synonym, index)
+
+    def _add(self, phrase: str, index: int):
+        words = WORD_PATTERN.findall(phrase.lower())
+        if not words:
+            raise ValueError(f"Empty synonym for domain {self.domains[index].id}")
+        node = self._trie
+        for word in words:
+            node = node.setdefault(word, {})
+        node.setdefault(_END, []).append(index)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "DomainTaxonomy":
+        """Compile the taxonomy file (default: DOMAIN_TAXONOMY_PATH or the built-in one)"""
+        path = path or os.getenv("DOMAIN_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        domains = [Domain(entry["id"], entry["synonyms"], entry.get("features", []), entry.get("audience"))
+                   for entry in data.get("domains", [])]
+        taxonomy = cls(domains, data.get("default"))
+        taxonomy.path = path
+        logger.info("Loaded %d domains from %s", len(domains), path)
+        return taxonomy
+
+    def _matches(self, words: Tuple[str, ...]) -> List[int]:
+        found = set()
+        position = 0
+        while position < len(words):
+            node = self._trie
+            longest: Optional[Tuple[int, List[int]]] = None
+            end = position
+            while end < len(words):
+                node = node.get(words[end])
+                if node is None:
+                    break
+                end += 1
+                if _END in node:
+                    longest = (end, node[_END])
+            if longest is None:
+                position += 1
+            else:
+                position, indices = longest
+                found.update(indices)
+        return sorted(found)
+
+    def match(self, text: str) -> List[Domain]:
+        """Domains named in ``text``, in taxonomy order"""
+        return [self.domains[index] for index in self._matches(tokenize(text).words)]
+
+    def components(self, text: str) -> Dict[str, Any]:
+        """Purpose, audience and features of a product idea from the domains it names.
+
+        Features of every matched domain are combined; the audience comes
+        from the last matched domain that names one, so more specific
+        domains go later in the file. With no match the defaults apply.
+        """
+        domains = self.match(text)
+        features = list(dict.fromkeys(feature for domain in domains for feature in domain.features))
+        audiences = [domain.audience for domain in domains if domain.audience]
+        return {
+            'purpose': self.default.get('purpose', 'Solve user problems efficiently'),
+            'audience': audiences[-1] if audiences else self.default.get('audience', 'Early adopters and tech-savvy users'),
+            'features': features or list(self.default.get('features', [])),
+            'domains': [domain.id for domain in domains],
+        }
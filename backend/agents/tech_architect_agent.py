@@ -1,11 +1,20 @@
 import asyncio
 import logging
-from typing import Dict, List, Any
-from .base_agent import BaseAgent
+from typing import Dict, List, Any, Optional
+from .base_agent import BaseAgent, intent_handler
+from .memory import ConversationContext
 
 logger = logging.getLogger(__name__)
 
 class TechArchitectAgent(BaseAgent):
+    intent_rules = [
+        ('provide_architecture_advice', ['architecture', 'design', 'system']),
+        ('recommend_tech_stack', ['tech stack', 'technology', 'framework']),
+        ('discuss_scalability', ['scalability', 'scale', 'performance']),
+        ('provide_security_guidance', ['security', 'authentication', 'auth']),
+    ]
+    default_intent = 'general_tech_advice'
+    
     def __init__(self):
         super().__init__(
             agent_id="tech",
@@ -22,28 +31,18 @@ class TechArchitectAgent(BaseAgent):
             "DevOps and deployment"
         ]
 
-    async def process_message(self, message: str) -> str:
+    async def process_message(self, message: str, intent: Optional[str] = None,
+                              context: Optional[ConversationContext] = None) -> str:
         """Process user message and provide technical insights"""
         try:
             await self._simulate_processing_time()
             
-            message_lower = message.lower()
-            
-            if any(keyword in message_lower for keyword in ['architecture', 'design', 'system']):
-                return await self._provide_architecture_advice(message)
-            elif any(keyword in message_lower for keyword in ['tech stack', 'technology', 'framework']):
-                return await self._recommend_tech_stack(message)
-            elif any(keyword in message_lower for keyword in ['scalability', 'scale', 'performance']):
-                return await self._discuss_scalability(message)
-            elif any(keyword in message_lower for keyword in ['security', 'authentication', 'auth']):
-                return await self._provide_security_guidance(message)
-            else:
-                return await self._general_tech_advice(message)
-                
+            return await self.handle_intent(intent or self.route_intent(message, context), message)
         except Exception as e:
             logger.error(f"Error in TechArchitectAgent.process_message: {e}")
             return "I encountered a technical issue processing your request. Could you provide more specific technical requirements?"
 
+    @intent_handler
     async def _provide_architecture_advice(self, message: str) -> str:
         """Provide system architecture recommendations"""
         response = "From a technical architecture perspective, I recommend:\n\n"
@@ -70,6 +69,7 @@ class TechArchitectAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _recommend_tech_stack(self, message: str) -> str:
         """Recommend appropriate technology stack"""
         response = "Here's my recommended technology stack:\n\n"
@@ -103,6 +103,7 @@ class TechArchitectAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _discuss_scalability(self, message: str) -> str:
         """Discuss scalability considerations"""
         response = "Let me address scalability from multiple angles:\n\n"
@@ -133,6 +134,7 @@ class TechArchitectAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _provide_security_guidance(self, message: str) -> str:
         """Provide security architecture guidance"""
         response = "Security should be built into every layer:\n\n"
@@ -163,6 +165,7 @@ class TechArchitectAgent(BaseAgent):
         
         return response
 
+    @intent_handler
     async def _general_tech_advice(self, message: str) -> str:
         """Provide general technical guidance"""
         response = "From a technical standpoint, I recommend focusing on:\n\n"
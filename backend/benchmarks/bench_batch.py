@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Compare looping over POST /api/chat/message with one POST /api/chat/batch.
+
+Runs the app in-process through httpx's ASGI transport with the zero
+latency model, so only server overhead is measured:
+
+    python benchmarks/bench_batch.py --messages 2000 --unique 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("AGENT_LATENCY_MODE", "zero")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx
+
+from main import app
+
+SCRIPT = [
+    "I have an idea for an AI finance tool",
+    "What tech stack and architecture should we use?",
+    "Who are our competitors and how should we price it?",
+    "Help me write the pitch deck",
+    "Plan the first sprint and timeline",
+]
+AGENTS = ["pm", "tech", "market", "pitch", "sprint"]
+
+
+def build_messages(count: int, unique: int):
+    return [
+        {"content": f"{SCRIPT[i % len(SCRIPT)]} (variant {i % unique})", "agents": AGENTS}
+        for i in range(count)
+    ]
+
+
+async def run_single(client: httpx.AsyncClient, messages, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(message):
+        async with semaphore:
+            response = await client.post("/api/chat/message", json=message)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*[send(message) for message in messages])
+    return time.perf_counter() - started
+
+
+async def run_batch(client: httpx.AsyncClient, messages, parallel: int) -> float:
+    started = time.perf_counter()
+    lines = 0
+    async with client.stream("POST", "/api/chat/batch",
+                             json={"messages": messages, "max_parallel": parallel}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line:
+                json.loads(line)
+                lines += 1
+    assert lines == len(messages), f"expected {len(messages)} results, got {lines}"
+    return time.perf_counter() - started
+
+
+async def main(args):
+    messages = build_messages(args.messages, args.unique)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        single = await run_single(client, messages, args.parallel)
+        batch = await run_batch(client, messages, args.parallel)
+
+    print(f"messages={len(messages)} unique={min(args.unique, len(messages))} parallel={args.parallel}")
+    print(f"  single endpoint: {single:8.2f}s  {len(messages) / single:10.1f} msg/s")
+    print(f"  batch endpoint:  {batch:8.2f}s  {len(messages) / batch:10.1f} msg/s")
+    print(f"  speedup:         {single / batch:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the batch chat endpoint")
+    parser.add_argument("--messages", type=int, default=2000, help="Messages to send")
+    parser.add_argument("--unique", type=int, default=200, help="Distinct messages among them")
+    parser.add_argument("--parallel", type=int, default=8, help="Concurrent requests / batch max_parallel")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Cost of ULID task ids and of answering a retried request from the
+Idempotency-Key store, next to the old timestamp ids and how often they
+collide when many tasks are created at once.
+
+    python benchmarks/bench_idempotency.py --ids 200000 --replays 100000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from services.idempotency import IdempotencyStore
+from services.ids import new_id
+
+
+def time_ids(make, count: int):
+    started = time.perf_counter()
+    ids = [make() for _ in range(count)]
+    return (time.perf_counter() - started) / count, count - len(set(ids))
+
+
+async def time_replays(store: IdempotencyStore, replays: int) -> float:
+    payload = {"content": "Plan the next sprint", "agents": ["sprint", "pm"]}
+
+    async def build():
+        return {"responses": [{"agentId": "sprint", "content": "x" * 2000}]}
+
+    await store.run("ip:1", "/api/chat/message", "key", payload, build)
+    started = time.perf_counter()
+    for _ in range(replays):
+        await store.run("ip:1", "/api/chat/message", "key", payload, build)
+    return (time.perf_counter() - started) / replays
+
+
+def main(args):
+    timestamp, timestamp_collisions = time_ids(lambda: str(datetime.now().timestamp()), args.ids)
+    ulid, ulid_collisions = time_ids(new_id, args.ids)
+    replay = asyncio.run(time_replays(IdempotencyStore(), args.replays))
+    print(f"ids={args.ids} replays={args.replays}")
+    print(f"  timestamp ids: {timestamp * 1e6:.2f}us per id, {timestamp_collisions} collisions")
+    print(f"  ULIDs:         {ulid * 1e6:.2f}us per id, {ulid_collisions} collisions")
+    print(f"  replayed response: {replay * 1e6:.2f}us per request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark task ids and idempotent replays")
+    parser.add_argument("--ids", type=int, default=200_000, help="Ids generated per scheme")
+    parser.add_argument("--replays", type=int, default=100_000, help="Replayed requests timed")
+    main(parser.parse_args())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Background jobs: how long a submit holds the caller, and how dedup
+collapses a burst of identical requests into one agent run.
+
+    python benchmarks/bench_jobs.py --jobs 200 --distinct 20 --workers 8
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from agents.agent_manager import AgentManager
+from models.schemas import TechRecommendationsJob
+from services.jobs import JobManager, JobStatus
+from services.latency import UniformLatency
+
+
+async def main(args):
+    manager = AgentManager(latency_model=UniformLatency(seed=0))
+    jobs = JobManager(workers=args.workers, max_pending=args.jobs)
+    jobs.register("tech_recommendations", manager.get_tech_recommendations, TechRecommendationsJob)
+    jobs.start()
+
+    submit_seconds = []
+    ids = set()
+    started = time.perf_counter()
+    for index in range(args.jobs):
+        submitted = time.perf_counter()
+        job, _ = jobs.submit("tech_recommendations", {"requirements": f"Project {index % args.distinct}"})
+        submit_seconds.append(time.perf_counter() - submitted)
+        ids.add(job.id)
+    while any(jobs.get(job_id).status not in (JobStatus.SUCCEEDED, JobStatus.FAILED) for job_id in ids):
+        await asyncio.sleep(0.01)
+    drained = time.perf_counter() - started
+    await jobs.stop()
+
+    submit_seconds.sort()
+    print(f"submissions={args.jobs} distinct={args.distinct} workers={args.workers}")
+    print(f"  submit: p50 {submit_seconds[len(submit_seconds) // 2] * 1e6:.0f}us  "
+          f"max {submit_seconds[-1] * 1e6:.0f}us (the request returns after this)")
+    print(f"  agent runs: {len(ids)} for {args.jobs} submissions, all finished in {drained:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark background jobs")
+    parser.add_argument("--jobs", type=int, default=200, help="Submissions in the burst")
+    parser.add_argument("--distinct", type=int, default=20, help="Distinct parameter sets among them")
+    parser.add_argument("--workers", type=int, default=8, help="Job worker tasks")
+    asyncio.run(main(parser.parse_args()))
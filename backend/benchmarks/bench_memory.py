@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Fill conversation memory with many long-running sessions and report the
+heap it actually uses against its configured character budget.
+
+Every session talks to every agent for more turns than the ring buffer
+holds, with long pasted messages, so each one hits the per-session cap:
+
+    python benchmarks/bench_memory.py --sessions 10000 --turns 20
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from agents.memory import ConversationMemory
+
+AGENTS = ["pm", "tech", "market", "pitch", "sprint"]
+# A pasted product context followed by a new question, and a long templated reply
+CONTEXT = ("Here is the full context of our product again. We are building an AI tool for small finance teams. "
+           "It reconciles invoices, flags anomalies and forecasts cash flow. Pricing is per seat. ")
+RESPONSE = ("Based on your requirements, I recommend starting with invoice reconciliation. "
+            "Anomaly detection can follow once the data pipeline is reliable. ") * 8
+
+
+def message(session: int, turn: int) -> str:
+    return (CONTEXT * 10 + f"Question {turn} for team {session}: what should we focus on in "
+            f"week {turn} given {session % 7} engineers and a runway of {turn + 6} months?")
+
+
+def main(args):
+    memory = ConversationMemory(max_sessions=args.sessions, max_session_chars=args.session_chars)
+    tracemalloc.start()
+    started = time.perf_counter()
+    for turn in range(args.turns):
+        for session in range(args.sessions):
+            for agent_id in AGENTS:
+                memory.record(f"session-{session}", agent_id, message(session, turn), RESPONSE, "general")
+        memory.compact_pending()
+    elapsed = time.perf_counter() - started
+    heap, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    records = args.turns * args.sessions * len(AGENTS)
+    budget = args.sessions * args.session_chars
+    print(f"sessions={len(memory)} turns={args.turns} agents={len(AGENTS)}")
+    print(f"  record:        {records / elapsed:10.0f} turns/s ({elapsed:.2f}s incl. compaction)")
+    print(f"  held chars:    {memory.total_chars / 1e6:10.1f}M of a {budget / 1e6:.1f}M budget")
+    print(f"  heap:          {heap / 1e6:10.1f}MB (peak {peak / 1e6:.1f}MB)")
+    print(f"  per session:   {heap / max(len(memory), 1) / 1e3:10.1f}KB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark conversation memory footprint")
+    parser.add_argument("--sessions", type=int, default=10000, help="Active sessions")
+    parser.add_argument("--turns", type=int, default=20, help="Turns per session and agent")
+    parser.add_argument("--session-chars", type=int, default=16000, help="Per-session cap")
+    main(parser.parse_args())
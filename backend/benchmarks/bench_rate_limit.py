@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Cost of a rate limit check with the in-memory buckets, for one hot client
+and for many distinct clients, on both the allowed and the rejected path.
+
+    python benchmarks/bench_rate_limit.py --checks 200000 --clients 100000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from services.rate_limit import MemoryBucketStore, RateLimitedError, RateLimiter
+
+
+async def per_check(limiter: RateLimiter, keys, checks: int) -> float:
+    started = time.perf_counter()
+    for index in range(checks):
+        try:
+            await limiter.check(keys[index % len(keys)], "bench")
+        except RateLimitedError:
+            pass
+    return (time.perf_counter() - started) / checks
+
+
+async def main(args):
+    clients = [f"ip:10.0.{index // 256}.{index % 256}" for index in range(args.clients)]
+    allowed = await per_check(RateLimiter(rate=1e9, burst=1e9), clients, args.checks)
+    rejected = await per_check(RateLimiter(rate=1e-9, burst=0), clients[:1], args.checks)
+    bounded = RateLimiter(rate=1e9, burst=1e9, store=MemoryBucketStore(max_keys=args.clients // 10))
+    evicting = await per_check(bounded, clients, args.checks)
+    print(f"checks={args.checks} clients={args.clients}")
+    print(f"  allowed, {args.clients} clients:  {allowed * 1e6:.2f}us per check")
+    print(f"  rejected, 1 client:        {rejected * 1e6:.2f}us per check")
+    print(f"  allowed, LRU evicting:     {evicting * 1e6:.2f}us per check")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark rate limit checks")
+    parser.add_argument("--checks", type=int, default=200_000, help="Checks timed per case")
+    parser.add_argument("--clients", type=int, default=100_000, help="Distinct client keys")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Per-response serialization cost: model_dump + json.dumps (the old path)
+versus the serialization layer in models/serialization.py.
+
+    python benchmarks/bench_serialization.py --iterations 20000
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from agents.agent_manager import AgentManager
+from models.schemas import Agent, AgentResponse
+from models.serialization import AGENT_LIST, dumps, dumps_str, response_frame
+from services.latency import ZeroLatency
+
+CONTENT = ("**📋 Product Management Framework I recommend:**\n1. Define the problem clearly\n" * 20
+           + "\n— Product Manager")
+
+
+def response_fields():
+    return dict(
+        id=f"pm_{int(datetime.now().timestamp() * 1000)}",
+        content=CONTENT,
+        timestamp=datetime.now().isoformat(),
+        sender="Product Manager",
+        agentId="pm",
+        avatar="👨‍💼",
+        confidence=0.9
+    )
+
+
+def frame_before():
+    response = AgentResponse(**response_fields())
+    return json.dumps({"type": "agent_response", **response.model_dump()})
+
+
+def frame_construct():
+    response = AgentResponse.model_construct(**response_fields())
+    return dumps_str(response_frame("agent_response", response))
+
+
+def frame_after():
+    response = AgentResponse(**response_fields())
+    return dumps_str(response_frame("agent_response", response))
+
+
+def agents_before(configs):
+    return json.dumps({"agents": [Agent(**config).model_dump() for config in configs]})
+
+
+def agents_after(configs):
+    return dumps({"agents": AGENT_LIST.validate_python(configs)})
+
+
+def report(label: str, before, after, iterations: int):
+    old = min(timeit.repeat(before, number=iterations, repeat=3)) / iterations * 1e6
+    new = min(timeit.repeat(after, number=iterations, repeat=3)) / iterations * 1e6
+    print(f"  {label:<28}{old:>10.2f}{new:>10.2f}{old / new:>9.1f}x")
+
+
+def main(args):
+    configs = list(AgentManager(latency_model=ZeroLatency()).agent_configs.values())
+    print(f"iterations={args.iterations}")
+    print(f"  {'operation':<28}{'before':>10}{'after':>10}{'speedup':>10}  (µs/op)")
+    report("agent response frame", frame_before, frame_after, args.iterations)
+    # model_construct runs in Python and is slower than pydantic-core validation for these models
+    report("frame via model_construct", frame_before, frame_construct, args.iterations)
+    report("agent catalog", lambda: agents_before(configs), lambda: agents_after(configs), args.iterations // 5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark response serialization")
+    parser.add_argument("--iterations", type=int, default=20000, help="Operations per measurement")
+    main(parser.parse_args())
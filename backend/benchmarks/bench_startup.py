@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Cold start cost of the agent layer, each scenario in a fresh interpreter.
+
+- lazy:    import AgentManager and construct it (agent modules not imported)
+- first:   lazy, then answer one message with a single agent
+- preload: construct and import every agent up front (the old eager behaviour)
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "lazy": "manager = AgentManager(latency_model=ZeroLatency())",
+    "first": ("manager = AgentManager(latency_model=ZeroLatency())\n"
+              "asyncio.run(manager.process_user_message('Build a product', ['pm']))"),
+    "preload": "manager = AgentManager(latency_model=ZeroLatency())\nmanager.agents.preload()",
+}
+
+TEMPLATE = """
+import time
+started = time.perf_counter()
+import asyncio
+from agents.agent_manager import AgentManager
+from services.latency import ZeroLatency
+{body}
+print(time.perf_counter() - started)
+"""
+
+
+def run(body: str) -> float:
+    env = dict(os.environ, LOG_LEVEL="WARNING")
+    output = subprocess.run(
+        [sys.executable, "-c", TEMPLATE.format(body=body)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main(args):
+    print(f"runs={args.runs}")
+    for name, body in SCENARIOS.items():
+        times = [run(body) for _ in range(args.runs)]
+        print(f"  {name:<10}median {statistics.median(times) * 1000:8.1f}ms  min {min(times) * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark agent layer cold start")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per scenario")
+    main(parser.parse_args())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Task search over a large synthetic board: time to build the index
+incrementally, per-query latency for common query shapes, and the cost of
+updates and deletes, next to a linear scan like the client-side filter.
+
+    python benchmarks/bench_task_search.py --tasks 1000000 --queries 200
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from services.task_index import TaskStore
+
+STATUSES = ["todo", "inprogress", "review", "done"]
+AGENTS = ["pm", "tech", "market", "pitch", "sprint"]
+
+
+def synthetic_tasks(count: int, vocabulary: int, tags: int, seed: int):
+    rng = random.Random(seed)
+    words = [f"word{index}" for index in range(vocabulary)]
+    tag_names = [f"tag{index}" for index in range(tags)]
+    # Zipf-like word frequencies, as in real text
+    weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(vocabulary)))
+    for index in range(count):
+        yield {
+            "id": str(index),
+            "title": " ".join(rng.choices(words, cum_weights=weights, k=5)),
+            "description": " ".join(rng.choices(words, cum_weights=weights, k=15)),
+            "status": rng.choice(STATUSES),
+            "assignedTo": rng.choice(AGENTS),
+            "tags": rng.sample(tag_names, 3),
+        }
+
+
+def percentile(samples, fraction):
+    return sorted(samples)[int(fraction * (len(samples) - 1))]
+
+
+def time_queries(store: TaskStore, queries):
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        store.search(**query)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main(args):
+    rng = random.Random(args.seed + 1)
+    store = TaskStore()
+    started = time.perf_counter()
+    for task in synthetic_tasks(args.tasks, args.vocabulary, args.tags, args.seed):
+        store.add(task)
+    build = time.perf_counter() - started
+    print(f"tasks={args.tasks} vocabulary={args.vocabulary} tags={args.tags}")
+    print(f"  incremental build: {build:.1f}s ({build / args.tasks * 1e6:.1f}us per task)")
+
+    def word(limit):
+        return f"word{rng.randrange(limit)}"
+
+    shapes = {
+        "common word": lambda: {"text": word(10)},
+        "rare word": lambda: {"text": word(args.vocabulary)},
+        "two words": lambda: {"text": f"{word(50)} {word(200)}"},
+        "prefix": lambda: {"text": f"{word(50)} word12"},
+        "two tags": lambda: {"tags": [f"tag{rng.randrange(args.tags)}", f"tag{rng.randrange(args.tags)}"]},
+        "word + tag + status": lambda: {"text": word(100), "tags": [f"tag{rng.randrange(args.tags)}"],
+                                        "status": rng.choice(STATUSES)},
+        "filters only, page 50": lambda: {"status": "todo", "assignee": "pm", "offset": 1000},
+    }
+    for name, shape in shapes.items():
+        samples = time_queries(store, [shape() for _ in range(args.queries)])
+        print(f"  {name:<22} p50 {statistics.median(samples) * 1e3:6.2f}ms  p99 {percentile(samples, 0.99) * 1e3:6.2f}ms")
+
+    tasks = store.list()
+    started = time.perf_counter()
+    needle = f"word{args.vocabulary // 2}"
+    matches = [task for task in tasks if needle in task["title"].split() or needle in task["description"].split()]
+    print(f"  linear scan, 1 word:   {(time.perf_counter() - started) * 1e3:6.1f}ms ({len(matches)} matches)")
+
+    ids = [str(rng.randrange(args.tasks)) for _ in range(args.queries)]
+    started = time.perf_counter()
+    for task_id in ids:
+        store.update(task_id, {"title": "renamed word3 word7", "status": "done"})
+    updated = (time.perf_counter() - started) / len(ids)
+    started = time.perf_counter()
+    for task_id in dict.fromkeys(ids):
+        store.delete(task_id)
+    deleted = (time.perf_counter() - started) / len(set(ids))
+    print(f"  update: {updated * 1e6:.0f}us  delete: {deleted * 1e6:.0f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the task search index")
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="Tasks on the synthetic board")
+    parser.add_argument("--vocabulary", type=int, default=20_000, help="Distinct words in titles and descriptions")
+    parser.add_argument("--tags", type=int, default=200, help="Distinct tags")
+    parser.add_argument("--queries", type=int, default=200, help="Queries timed per shape")
+    parser.add_argument("--seed", type=int, default=7)
+    main(parser.parse_args())
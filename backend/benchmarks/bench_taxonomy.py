@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Domain matching as the taxonomy grows: one substring test per synonym
+(the old if-chain) vs. the compiled word trie.
+
+    python benchmarks/bench_taxonomy.py --domains 10 100 1000 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from agents.taxonomy import Domain, DomainTaxonomy
+from services.tokenizer import tokenize
+
+IDEA = ("An AI tutor for finance students that turns lecture audio into flashcards, "
+        "tracks progress and recommends courses based on exam results")
+
+
+def synthetic(count: int):
+    """The built-in domains plus made-up ones with one- and two-word synonyms"""
+    domains = list(DomainTaxonomy.load().domains)
+    for index in range(count - len(domains)):
+        domains.append(Domain(f"domain{index}", [f"niche{index}", f"vertical{index} market"], [f"Feature {index}"]))
+    return domains
+
+
+def linear_scan(domains, idea: str):
+    idea_lower = tokenize(idea).lower
+    return [domain.id for domain in domains if any(synonym in idea_lower for synonym in domain.synonyms)]
+
+
+def per_call(func, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+def main(args):
+    print(f"idea={len(IDEA)} chars")
+    for count in args.domains:
+        domains = synthetic(count)
+        started = time.perf_counter()
+        taxonomy = DomainTaxonomy(domains)
+        compile_seconds = time.perf_counter() - started
+        scan = per_call(lambda: linear_scan(domains, IDEA), args.repeat)
+        trie = per_call(lambda: taxonomy.match(IDEA), args.repeat)
+        print(f"  domains={count:5d} substring scan {scan * 1e6:8.1f}us  trie {trie * 1e6:6.1f}us "
+              f"({scan / trie:5.1f}x)  compile {compile_seconds * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark domain taxonomy matching")
+    parser.add_argument("--domains", type=int, nargs="+", default=[10, 100, 1000, 5000], help="Taxonomy sizes")
+    parser.add_argument("--repeat", type=int, default=200, help="Matches timed per size")
+    main(parser.parse_args())
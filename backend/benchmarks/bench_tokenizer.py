@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Keyword extraction for a large pasted spec: every agent on its own vs. the
+shared, memoized tokenizer, plus peak memory of the streaming counter
+against materializing the word list.
+
+    python benchmarks/bench_tokenizer.py --size-mb 1 --agents 5
+"""
+import argparse
+import os
+import re
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from services.tokenizer import STOP_WORDS, TokenCache, keyword_counts
+
+PARAGRAPH = ("The platform must support authentication, invoice reconciliation and anomaly detection. "
+             "Scalability targets are ten thousand tenants with a p99 under 300ms. "
+             "The tech stack should favour Python services behind an API gateway.\n")
+
+
+def per_agent_keywords(text: str):
+    """What each agent did before: compile, lowercase, findall and dedupe on every call"""
+    words = re.findall(r'\w+', text.lower())
+    common_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an'}
+    return list(set(word for word in words if word not in common_words and len(word) > 2))
+
+
+def timed(func) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main(args):
+    spec = PARAGRAPH * int(args.size_mb * 1024 * 1024 / len(PARAGRAPH))
+    before = timed(lambda: [per_agent_keywords(spec) for _ in range(args.agents)])
+    cache = TokenCache()
+    after = timed(lambda: [cache.get(spec).keywords for _ in range(args.agents)])
+    materialized = peak_memory(lambda: Counter(word for word in re.findall(r'\w+', spec.lower())
+                                               if word not in STOP_WORDS and len(word) > 2))
+    chunks = (spec[i:i + 65536] for i in range(0, len(spec), 65536))
+    streaming = peak_memory(lambda: keyword_counts(chunks))
+
+    print(f"spec={len(spec) / 1e6:.2f}MB agents={args.agents}")
+    print(f"  per agent:        {before * 1000:8.1f}ms per turn")
+    print(f"  shared tokenizer: {after * 1000:8.1f}ms per turn ({before / after:.1f}x)")
+    print(f"  peak memory:      {materialized / 1e6:8.1f}MB materialized vs {streaming / 1e6:.2f}MB streaming")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark keyword extraction")
+    parser.add_argument("--size-mb", type=float, default=1.0, help="Size of the pasted spec")
+    parser.add_argument("--agents", type=int, default=5, help="Agents reading the same message")
+    main(parser.parse_args())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Project analysis latency: stages one after another vs. the workflow DAG.
+
+Uses the agents' own simulated latency (seeded), so the DAG run should
+take about its critical path (the PM's breakdown, then the slowest single
+agent) while the sequential run takes the sum of the stages. The follow-up
+plan (sprint and pitch, on top of the memoized tech and market results)
+is timed separately; the analysis does not wait for it. Repeats are timed
+through the orchestrator's stage memo and through the endpoint's cache of
+serialized responses:
+
+    python benchmarks/bench_workflow.py --runs 3
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from agents.agent_manager import AgentManager, DEFAULT_TEAM_CAPACITY
+from services.catalog import KeyedResourceCache
+from services.latency import UniformLatency
+
+DESCRIPTION = "An AI voice tutor for finance students"
+
+
+async def run_sequential(manager: AgentManager, inputs) -> float:
+    """Every stage of the analysis and the plan, one at a time"""
+    started = time.perf_counter()
+    results = {}
+    for workflow in (manager.project_workflow, manager.plan_workflow):
+        for name in workflow.order:
+            if name in results:
+                continue
+            stage = workflow.stages[name]
+            results[name] = await stage.run(inputs, {dependency: results[dependency] for dependency in stage.depends_on})
+    return time.perf_counter() - started
+
+
+async def main(args):
+    inputs = {"description": DESCRIPTION, "team_capacity": DEFAULT_TEAM_CAPACITY}
+    for run in range(args.runs):
+        # Same seed for both so they sample the same delays
+        sequential = await run_sequential(AgentManager(latency_model=UniformLatency(seed=run)), inputs)
+        manager = AgentManager(latency_model=UniformLatency(seed=run))
+        result = await manager.orchestrator.run(manager.project_workflow, inputs, key=DESCRIPTION)
+        critical, path = manager.project_workflow.critical_path(result.seconds)
+        slowest_agent = max(result.seconds[name] for name in ["pm", "tech", "market"])
+        # Only the breakdown and the merge may add to the slowest agent
+        assert critical <= result.seconds["features"] + slowest_agent + result.seconds["analysis"] + 1e-6, path
+        started = time.perf_counter()
+        await manager.orchestrator.run(manager.plan_workflow, inputs, key=DESCRIPTION)
+        plan = time.perf_counter() - started
+        started = time.perf_counter()
+        await manager.orchestrator.run(manager.project_workflow, inputs, key=DESCRIPTION)
+        memoized = time.perf_counter() - started
+        cache = KeyedResourceCache("project_analysis")
+        key = manager.analysis_key(DESCRIPTION)
+        build = lambda: manager.analyze_project(DESCRIPTION)
+        await cache.get(key, build)
+        started = time.perf_counter()
+        await cache.get(key, build)
+        cached = time.perf_counter() - started
+        print(f"run {run}: sequential {sequential:5.2f}s  dag {result.elapsed:5.2f}s  "
+              f"critical path {critical:5.2f}s ({' -> '.join(path)})  slowest agent {slowest_agent:5.2f}s  "
+              f"plan after {plan:5.2f}s  memoized {memoized * 1000:.2f}ms  cached body {cached * 1e6:.0f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the project analysis workflow")
+    parser.add_argument("--runs", type=int, default=3, help="Runs with different latency seeds")
+    asyncio.run(main(parser.parse_args()))
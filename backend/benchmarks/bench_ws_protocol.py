@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Compare bytes per chat turn for each WebSocket subprotocol.
+
+Generates real agent frames with the zero latency model and encodes the
+same turns through every codec. "json + permessage-deflate" is plain
+deflate with context takeover and no dictionary, i.e. what a browser
+negotiates at the transport level for the default JSON protocol:
+
+    python benchmarks/bench_ws_protocol.py --turns 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from agents.agent_manager import AgentManager
+from services.latency import ZeroLatency
+from services.ws_protocol import CODECS, DeflateCodec, FrameCodec
+
+SCRIPT = [
+    "I have an idea for an AI finance tool",
+    "What tech stack and architecture should we use?",
+    "Who are our competitors and how should we price it?",
+    "Help me write the pitch deck",
+    "Plan the first sprint and timeline",
+]
+
+
+async def build_turns(count: int):
+    manager = AgentManager(latency_model=ZeroLatency())
+    turns = []
+    for i in range(count):
+        responses = await manager.process_user_message(SCRIPT[i % len(SCRIPT)], list(manager.agents))
+        frames = [{"type": "message_received", "message": "Message received, agents are processing..."}]
+        frames.extend({"type": "agent_response", **response.model_dump()} for response in responses)
+        frames.append({"type": "turn_complete", "responses": len(responses)})
+        turns.append(frames)
+    return turns
+
+
+def bytes_per_turn(codec: FrameCodec, turns) -> float:
+    total = 0
+    for frames in turns:
+        for frame in frames:
+            payload = codec.encode(frame)
+            total += len(payload.encode("utf-8") if isinstance(payload, str) else payload)
+    return total / len(turns)
+
+
+async def main(args):
+    turns = await build_turns(args.turns)
+    codecs = {name: factory for name, factory in CODECS.items()}
+    codecs["json + permessage-deflate"] = lambda: DeflateCodec(FrameCodec(), dictionary=b"")
+
+    baseline = bytes_per_turn(FrameCodec(), turns)
+    print(f"turns={len(turns)}")
+    print(f"  {'protocol':<28}{'bytes/turn':>12}{'vs json':>10}")
+    for name, factory in codecs.items():
+        size = bytes_per_turn(factory(), turns)
+        print(f"  {name:<28}{size:>12.0f}{size / baseline:>9.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark WebSocket frame encodings")
+    parser.add_argument("--turns", type=int, default=50, help="Chat turns to encode")
+    asyncio.run(main(parser.parse_args()))
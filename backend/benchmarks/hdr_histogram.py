@@ -0,0 +1,94 @@
+import math
+from typing import Dict, Iterable, List, Tuple
+
+
+class HdrHistogram:
+    """Log-linear latency histogram in the spirit of HdrHistogram.
+
+    Values are recorded as integer microseconds. Anything below the
+    sub-bucket count is stored exactly; larger values keep
+    ``significant_figures`` digits of precision, so memory stays bounded no
+    matter how many samples are recorded.
+    """
+
+    def __init__(self, significant_figures: int = 3):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        self.significant_figures = significant_figures
+        self._sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_figures))
+        self._sub_bucket_count = 1 << self._sub_bucket_bits
+        self._counts: Dict[Tuple[int, int], int] = {}
+        self.total_count = 0
+        self.min_value = 0
+        self.max_value = 0
+        self._sum = 0
+
+    def _key(self, value: int) -> Tuple[int, int]:
+        if value < self._sub_bucket_count:
+            return 0, value
+        shift = value.bit_length() - self._sub_bucket_bits
+        return shift, value >> shift
+
+    @staticmethod
+    def _lowest_equivalent(key: Tuple[int, int]) -> int:
+        shift, mantissa = key
+        return mantissa << shift
+
+    @staticmethod
+    def _highest_equivalent(key: Tuple[int, int]) -> int:
+        shift, mantissa = key
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_us: int, count: int = 1):
+        """Record a latency in microseconds"""
+        value_us = max(0, int(value_us))
+        key = self._key(value_us)
+        self._counts[key] = self._counts.get(key, 0) + count
+        if not self.total_count or value_us < self.min_value:
+            self.min_value = value_us
+        if value_us > self.max_value:
+            self.max_value = value_us
+        self.total_count += count
+        self._sum += value_us * count
+
+    def record_seconds(self, seconds: float):
+        self.record(round(seconds * 1_000_000))
+
+    def merge(self, other: "HdrHistogram"):
+        """Fold another histogram's samples into this one"""
+        if other.significant_figures != self.significant_figures:
+            raise ValueError("Cannot merge histograms with different precision")
+        for key, count in other._counts.items():
+            self._counts[key] = self._counts.get(key, 0) + count
+        if other.total_count:
+            if not self.total_count or other.min_value < self.min_value:
+                self.min_value = other.min_value
+            self.max_value = max(self.max_value, other.max_value)
+        self.total_count += other.total_count
+        self._sum += other._sum
+
+    def mean(self) -> float:
+        return self._sum / self.total_count if self.total_count else 0.0
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """Highest equivalent value at or below which ``percentile`` of samples fall"""
+        if not self.total_count:
+            return 0
+        target = max(1, math.ceil(self.total_count * percentile / 100.0))
+        seen = 0
+        for key in sorted(self._counts, key=self._lowest_equivalent):
+            seen += self._counts[key]
+            if seen >= target:
+                return min(self._highest_equivalent(key), self.max_value)
+        return self.max_value
+
+    def percentiles(self, percentiles: Iterable[float] = (50, 90, 99, 99.9)) -> List[Tuple[float, int]]:
+        return [(p, self.value_at_percentile(p)) for p in percentiles]
+
+    def summary_ms(self, percentiles: Iterable[float] = (50, 90, 99, 99.9)) -> Dict[str, float]:
+        """Percentiles, mean and max in milliseconds, ready for reporting"""
+        summary = {f"p{p:g}": value / 1000.0 for p, value in self.percentiles(percentiles)}
+        summary["mean"] = self.mean() / 1000.0
+        summary["max"] = self.max_value / 1000.0
+        summary["count"] = self.total_count
+        return summary
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Build the preset deflate dictionary for the compressed WebSocket protocols.
+
+Runs every agent intent many times with the zero latency model, encodes
+the agent frames with msgpack, and keeps the template lines that recur
+across responses. zlib prefers matches near the end of a dictionary, so
+the most common material goes last:
+
+    python benchmarks/train_ws_dictionary.py --samples 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import msgpack
+
+from agents.agent_manager import AgentManager
+from services.latency import ZeroLatency
+from services.ws_protocol import DICTIONARY_PATH
+
+MAX_DICTIONARY_BYTES = 32 * 1024
+
+
+async def collect_frames(samples: int):
+    manager = AgentManager(latency_model=ZeroLatency())
+    frames = []
+    for agent_id, agent in manager.agents.items():
+        keywords = [keywords[0] for _, keywords in agent.intent_rules] + ["hello"]
+        for _ in range(samples):
+            for keyword in keywords:
+                response = await manager._generate_agent_response(agent_id, f"Tell me about {keyword}")
+                if response:
+                    frames.append({"type": "agent_response", **response.model_dump()})
+    return frames
+
+
+def build_dictionary(frames) -> bytes:
+    line_counts = Counter()
+    for frame in frames:
+        line_counts.update(set(frame["content"].split("\n")))
+    lines = [line for line, count in line_counts.items() if count > 1 and len(line) > 3]
+    lines.sort(key=lambda line: (line_counts[line], line))
+
+    # Frame envelope (keys, agent names, avatars) is the most common material of all
+    envelopes = []
+    for frame in frames:
+        envelope = msgpack.packb(dict(frame, content="", id="", timestamp="", confidence=0.0), use_bin_type=True)
+        if envelope not in envelopes:
+            envelopes.append(envelope)
+
+    tail = b"".join(envelopes)
+    body = b""
+    for line in reversed(lines):
+        encoded = line.encode("utf-8") + b"\n"
+        if len(body) + len(encoded) + len(tail) > MAX_DICTIONARY_BYTES:
+            break
+        body = encoded + body
+    return body + tail
+
+
+async def main(args):
+    frames = await collect_frames(args.samples)
+    dictionary = build_dictionary(frames)
+    with open(args.output, "wb") as f:
+        f.write(dictionary)
+    print(f"Wrote {len(dictionary)} byte dictionary from {len(frames)} frames to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the WebSocket deflate dictionary")
+    parser.add_argument("--samples", type=int, default=20, help="Runs per agent intent")
+    parser.add_argument("--output", default=DICTIONARY_PATH, help="Dictionary file to write")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+WebSocket load generator for the /ws chat endpoint.
+
+Opens N concurrent clients, each sending scripted ``user_message`` frames,
+and records per-turn latency into HDR-style histograms:
+
+- ack:   time until the ``message_received`` frame
+- first: time until the first agent response
+- last:  time until the turn completes
+
+Run against a local server, optionally spawned by the tool itself with the
+zero latency model so only server overhead is measured:
+
+    python benchmarks/ws_loadgen.py --spawn --concurrency 1,10,50,100 --turns 20
+
+Pass ``--protocol msgpack.deflate`` (or any other /ws subprotocol) to
+compare bytes per turn across encodings.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import websockets
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from hdr_histogram import HdrHistogram
+from services.ws_protocol import CODECS
+
+DEFAULT_SCRIPT = [
+    "I have an idea for an AI finance tool",
+    "What tech stack and architecture should we use?",
+    "Who are our competitors and how should we price it?",
+    "Help me write the pitch deck",
+    "Plan the first sprint and timeline",
+]
+
+# Frame types that carry an agent response (the payload's own "type" is "agent")
+AGENT_FRAME_TYPES = {"agent", "agent_response"}
+
+
+class TurnStats:
+    """Histograms shared by every client in one concurrency level"""
+
+    def __init__(self):
+        self.ack = HdrHistogram()
+        self.first = HdrHistogram()
+        self.last = HdrHistogram()
+        self.turns = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.shed = 0
+        self.bytes_received = 0
+
+
+async def run_client(url: str, script: List[str], agents: List[str], turns: int,
+                     stats: TurnStats, turn_timeout: float, protocol: str = "json"):
+    """Run one simulated chat user for a fixed number of turns"""
+    codec = CODECS[protocol]()
+    subprotocols = [protocol] if protocol != "json" else None
+    async with websockets.connect(url, max_size=None, subprotocols=subprotocols) as ws:
+        for turn in range(turns):
+            payload = json.dumps({
+                "type": "user_message",
+                "message": script[turn % len(script)],
+                "agents": agents
+            })
+            started = time.perf_counter()
+            await ws.send(payload)
+
+            first_seen = False
+            try:
+                while True:
+                    remaining = turn_timeout - (time.perf_counter() - started)
+                    data = await asyncio.wait_for(ws.recv(), timeout=max(remaining, 0.001))
+                    stats.bytes_received += len(data)
+                    frame = codec.decode(data)
+                    elapsed = time.perf_counter() - started
+                    frame_type = frame.get("type")
+
+                    if frame_type == "message_received":
+                        stats.ack.record_seconds(elapsed)
+                    elif frame_type in AGENT_FRAME_TYPES:
+                        if not first_seen:
+                            stats.first.record_seconds(elapsed)
+                            first_seen = True
+                    elif frame_type == "turn_complete":
+                        stats.last.record_seconds(elapsed)
+                        stats.turns += 1
+                        break
+                    elif frame_type == "error":
+                        stats.errors += 1
+                        break
+                    elif frame_type in ("overloaded", "rate_limited"):
+                        stats.shed += 1
+                        break
+            except asyncio.TimeoutError:
+                stats.timeouts += 1
+                return
+
+
+async def run_level(url: str, concurrency: int, script: List[str], agents: List[str],
+                    turns: int, turn_timeout: float, protocol: str = "json") -> Dict[str, object]:
+    """Run one concurrency level and summarize it"""
+    stats = TurnStats()
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *[run_client(url, script, agents, turns, stats, turn_timeout, protocol) for _ in range(concurrency)],
+        return_exceptions=True
+    )
+    wall = time.perf_counter() - started
+    connect_errors = sum(1 for r in results if isinstance(r, Exception))
+
+    return {
+        "concurrency": concurrency,
+        "turns": stats.turns,
+        "errors": stats.errors + connect_errors,
+        "timeouts": stats.timeouts,
+        "shed": stats.shed,
+        "wall_seconds": wall,
+        "turns_per_second": stats.turns / wall if wall else 0.0,
+        "bytes_per_turn": stats.bytes_received / stats.turns if stats.turns else 0.0,
+        "ack_ms": stats.ack.summary_ms(),
+        "first_response_ms": stats.first.summary_ms(),
+        "last_response_ms": stats.last.summary_ms(),
+    }
+
+
+def print_report(result: Dict[str, object]):
+    print(f"\nconcurrency={result['concurrency']}  turns={result['turns']}  "
+          f"errors={result['errors']}  timeouts={result['timeouts']}  shed={result['shed']}  "
+          f"throughput={result['turns_per_second']:.1f} turns/s  bytes/turn={result['bytes_per_turn']:.0f}")
+    print(f"  {'metric':<16}{'p50':>10}{'p90':>10}{'p99':>10}{'p99.9':>10}{'max':>10}  (ms)")
+    for label, key in (("ack", "ack_ms"), ("first response", "first_response_ms"), ("last response", "last_response_ms")):
+        summary = result[key]
+        print(f"  {label:<16}" + "".join(f"{summary[p]:>10.2f}" for p in ("p50", "p90", "p99", "p99.9", "max")))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_server(port: int, latency_mode: str) -> subprocess.Popen:
+    """Start a local uvicorn server for the run"""
+    # Every simulated client shares 127.0.0.1, so the per-client rate limit is off
+    env = dict(os.environ, AGENT_LATENCY_MODE=latency_mode, RATE_LIMIT_PER_SECOND="0")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return process
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Timed out waiting for server to start")
+
+
+def load_script(path: Optional[str]) -> List[str]:
+    if not path:
+        return DEFAULT_SCRIPT
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+async def main(args):
+    script = load_script(args.script)
+    agents = [a for a in args.agents.split(",") if a]
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    process = None
+    url = args.url
+    if args.spawn:
+        port = _free_port()
+        process = spawn_server(port, args.latency_mode)
+        url = f"ws://127.0.0.1:{port}/ws"
+
+    results = []
+    try:
+        for concurrency in levels:
+            result = await run_level(url, concurrency, script, agents, args.turns, args.turn_timeout, args.protocol)
+            results.append(result)
+            print_report(result)
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote results to {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the /ws chat endpoint")
+    parser.add_argument("--url", default="ws://127.0.0.1:8000/ws", help="WebSocket URL of a running server")
+    parser.add_argument("--spawn", action="store_true", help="Start a local server for the run")
+    parser.add_argument("--latency-mode", default="zero", help="AGENT_LATENCY_MODE for a spawned server")
+    parser.add_argument("--concurrency", default="1,10,50", help="Comma-separated client counts to step through")
+    parser.add_argument("--turns", type=int, default=10, help="Turns per client")
+    parser.add_argument("--agents", default="pm,tech,market,pitch,sprint", help="Comma-separated agent ids")
+    parser.add_argument("--script", help="File with one user message per line")
+    parser.add_argument("--turn-timeout", type=float, default=60.0, help="Seconds before a turn counts as timed out")
+    parser.add_argument("--protocol", default="json", choices=sorted(CODECS), help="WebSocket subprotocol to negotiate")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    asyncio.run(main(parser.parse_args()))
@@ -1,28 +1,57 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, Query, Request, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import json
 import asyncio
 import logging
+import os
+import uuid
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Optional
+from pydantic import PositiveFloat, TypeAdapter, ValidationError
 import uvicorn
 
 from agents.agent_manager import AgentManager
-from models.schemas import UserMessage, AgentResponse, Task, Agent
+from models.schemas import (
+    UserMessage, BatchChatRequest, AgentResponse, Task, TaskUpdate, Agent, JobRequest, SprintPlanJob, PitchDeckJob,
+    TechRecommendationsJob, MarketResearchJob, ProjectAnalysisJob
+)
+from models.serialization import FastJSONResponse, dumps, response_frame
 from database.db import init_db
+from services.latency import create_latency_model
+from services.metrics import (
+    REGISTRY, WS_ACTIVE_CONNECTIONS, WS_OUTBOUND_PENDING, monitor_event_loop_lag
+)
+from services.tracing import configure_tracing, tracer
+from services.logging_setup import configure_logging, log_fields, shutdown_logging
+from services.admission import OverloadedError
+from services.sse import TurnStream, TurnStreamRegistry, parse_last_event_id
+from services.ws_protocol import FrameCodec, Frame, negotiate, record_sent
+from services.catalog import JSON_MEDIA_TYPE, KeyedResourceCache, VersionedResource, conditional_response
+from services.jobs import Job, JobManager
+from services.rate_limit import RateLimitedError, RateLimitMiddleware, RateLimiter, client_key
+from services.idempotency import IDEMPOTENCY_KEY_HEADER, IdempotencyKeyReusedError, IdempotencyStore
+from services.ids import new_id
+from services.task_index import MAX_RESULT_WINDOW, TaskStore
+from agents.hot_reload import AgentFileWatcher
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (queued to a background thread; see services/logging_setup.py)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Team Strategy Agent API",
     description="AI-powered team strategy and planning platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
+# Per-client token buckets on /api/* (RATE_LIMIT_PER_SECOND=0 disables); added before CORS so 429s carry CORS headers
+rate_limiter = RateLimiter.from_env()
+if rate_limiter is not None:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -32,26 +61,90 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Delay between streamed agent responses on the WebSocket, for a realistic effect
+RESPONSE_PACING_SECONDS = 1.5
+# WebSocket frames bypass the request models; their deadline follows UserMessage.deadline ("2.5" is coerced)
+ws_deadline = TypeAdapter(Optional[PositiveFloat])
+
+# Initialize latency model (AGENT_LATENCY_MODE=zero|uniform|virtual|recorded:<path>)
+latency_model = create_latency_model()
+
+# Initialize tracing (TRACE_SAMPLE_RATE=0..1, TRACE_EXPORT_PATH=traces.jsonl)
+configure_tracing()
+
 # Initialize agent manager
-agent_manager = AgentManager()
+agent_manager = AgentManager(latency_model=latency_model)
+
+# SSE chat turns, kept briefly after they finish so clients can resume with Last-Event-ID
+SSE_HEARTBEAT_SECONDS = 15.0
+SSE_RETRY_MILLISECONDS = 3000
+SSE_FOLLOW_UP_TIMEOUT = 60.0
+turn_streams = TurnStreamRegistry()
+
+# Stored responses for retried POSTs carrying an Idempotency-Key (IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_KEYS)
+idempotency_store = IdempotencyStore.from_env()
 
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self.codecs: Dict[WebSocket, FrameCodec] = {}
+        # Deflate codecs are stateful, so frames must hit the wire in encoding order
+        self.send_locks: Dict[WebSocket, asyncio.Lock] = {}
+        # Conversation memory session per connection, unless the client names its own
+        self.session_ids: Dict[WebSocket, str] = {}
 
     async def connect(self, websocket: WebSocket):
-        await websocket.accept()
+        # Clients opt into msgpack / deflate framing via subprotocols; plain JSON otherwise
+        codec = negotiate(websocket.scope.get("subprotocols", []))
+        await websocket.accept(subprotocol=codec.name if codec else None)
+        self.codecs[websocket] = codec or FrameCodec()
+        self.send_locks[websocket] = asyncio.Lock()
+        self.session_ids[websocket] = uuid.uuid4().hex
         self.active_connections.append(websocket)
+        WS_ACTIVE_CONNECTIONS.set(len(self.active_connections))
         logger.info(f"Client connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        self.codecs.pop(websocket, None)
+        self.send_locks.pop(websocket, None)
+        self.session_ids.pop(websocket, None)
+        WS_ACTIVE_CONNECTIONS.set(len(self.active_connections))
         logger.info(f"Client disconnected. Total connections: {len(self.active_connections)}")
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
+        WS_OUTBOUND_PENDING.inc()
+        try:
+            with tracer.span("ws.send", bytes=len(message)):
+                await websocket.send_text(message)
+        finally:
+            WS_OUTBOUND_PENDING.dec()
+
+    async def send_frame(self, frame: Frame, websocket: WebSocket):
+        """Encode a frame with the connection's negotiated codec and send it"""
+        codec = self.codecs.get(websocket) or FrameCodec()
+        lock = self.send_locks.get(websocket) or asyncio.Lock()
+        WS_OUTBOUND_PENDING.inc()
+        try:
+            async with lock:
+                payload = codec.encode(frame)
+                record_sent(codec, payload)
+                with tracer.span("ws.send", bytes=len(payload), protocol=codec.name):
+                    if codec.binary:
+                        await websocket.send_bytes(payload)
+                    else:
+                        await websocket.send_text(payload)
+        finally:
+            WS_OUTBOUND_PENDING.dec()
+
+    def decode_frame(self, message: Dict[str, Any], websocket: WebSocket) -> Frame:
+        """Decode a received text or binary frame"""
+        codec = self.codecs.get(websocket) or FrameCodec()
+        if message.get("bytes") is not None:
+            return codec.decode(message["bytes"])
+        return json.loads(message["text"])
 
     async def broadcast(self, message: str):
         for connection in self.active_connections:
@@ -62,23 +155,120 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 
+# Sample data until tasks are persisted
+SAMPLE_TASKS = [
+    {
+        "id": "1",
+        "title": "Market Research for AI Finance Tool",
+        "description": "Research competitors and market opportunities in AI finance space",
+        "status": "todo",
+        "priority": "high",
+        "assignedTo": "market",
+        "assignedAgent": "Market Analyst",
+        "createdBy": "PM Agent",
+        "dueDate": "2024-01-20",
+        "sprint": "current",
+        "tags": ["research", "finance", "ai"]
+    }
+]
+# Tasks with their search index, kept in step on create, update and delete
+task_store = TaskStore(SAMPLE_TASKS)
+
+async def _build_market_research(query: str) -> Dict[str, Any]:
+    return {"research": await agent_manager.get_market_research(query)}
+
+# Pre-serialized bodies for polled GETs, served with strong ETags and rebuilt only on change
+agent_catalog = VersionedResource(
+    "agent_catalog", lambda: {"agents": agent_manager.list_agents()}, lambda: agent_manager.catalog_version
+)
+task_catalog = VersionedResource("task_catalog", lambda: {"tasks": task_store.list()}, lambda: task_store.version)
+market_research_cache = KeyedResourceCache(
+    "market_research", _build_market_research, ttl=float(os.getenv("MARKET_RESEARCH_CACHE_SECONDS", "300"))
+)
+# Keyed by a digest of the description; each entry is built with its own description
+project_analysis_cache = KeyedResourceCache(
+    "project_analysis", ttl=float(os.getenv("PROJECT_ANALYSIS_CACHE_SECONDS", "300"))
+)
+project_plan_cache = KeyedResourceCache(
+    "project_plan", ttl=float(os.getenv("PROJECT_ANALYSIS_CACHE_SECONDS", "300"))
+)
+
+def _invalidate_agent_caches(agent_id: str):
+    """Drop cached responses produced by an agent that was just reloaded"""
+    if agent_id == "market":
+        market_research_cache.invalidate()
+    # Every agent contributes to a project analysis or plan
+    project_analysis_cache.invalidate()
+    project_plan_cache.invalidate()
+
+agent_manager.agents.add_reload_listener(_invalidate_agent_caches)
+
+# Long agent operations run as background jobs instead of holding the request open
+job_manager = JobManager.from_env()
+job_manager.register("sprint_plan", agent_manager.create_sprint_plan, SprintPlanJob)
+job_manager.register("pitch_deck", agent_manager.generate_pitch_deck, PitchDeckJob)
+job_manager.register("tech_recommendations", agent_manager.get_tech_recommendations, TechRecommendationsJob)
+job_manager.register("market_research", agent_manager.get_market_research, MarketResearchJob)
+job_manager.register("project_analysis", agent_manager.analyze_project, ProjectAnalysisJob)
+job_manager.register("project_plan", agent_manager.plan_project, ProjectAnalysisJob)
+
+async def _push_finished_job(job: Job):
+    """Send a finished job to the WebSocket connections of every session that submitted it"""
+    if not job.session_ids:
+        return
+    frame = {"type": "job_complete", "job": job.to_dict()}
+    for websocket, session_id in list(manager.session_ids.items()):
+        if session_id in job.session_ids:
+            try:
+                await manager.send_frame(frame, websocket)
+            except Exception as e:
+                logger.error(f"Error pushing job {job.id}: {e}")
+
+job_manager.add_listener(_push_finished_job)
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database and services on startup"""
     await init_db()
+    # Prebuild the agent catalog from configs alone; AGENT_PRELOAD=1 also imports every agent now
+    agent_catalog.get()
+    if os.getenv("AGENT_PRELOAD", "0") == "1":
+        agent_manager.agents.preload()
+    # AGENT_HOT_RELOAD=1 watches agent configs and modules and reloads them in place
+    if os.getenv("AGENT_HOT_RELOAD", "0") == "1":
+        app.state.agent_watcher = asyncio.create_task(AgentFileWatcher(agent_manager.agents).run())
+    app.state.loop_lag_monitor = asyncio.create_task(monitor_event_loop_lag())
+    # Summarize older conversation turns and drop idle sessions off the request path
+    app.state.memory_maintenance = asyncio.create_task(agent_manager.memory.run())
+    job_manager.start()
     logger.info("Application started successfully")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop job workers (unfinished jobs resume on next start) and flush queued log records"""
+    await job_manager.stop()
+    shutdown_logging()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
     return {"message": "Team Strategy Agent API is running", "status": "healthy"}
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return Response(content=REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/scheduler")
+async def get_scheduler_stats():
+    """Scheduler slots, queue depth and queue wait per priority class"""
+    return {"scheduler": agent_manager.scheduler.stats()}
+
 @app.get("/api/agents")
-async def get_agents():
-    """Get all available agents"""
+async def get_agents(request: Request):
+    """Get all available agents (conditional on If-None-Match)"""
     try:
-        agents = await agent_manager.get_all_agents()
-        return {"agents": agents}
+        return conditional_response(request, agent_catalog.get())
     except Exception as e:
         logger.error(f"Error getting agents: {e}")
         raise HTTPException(status_code=500, detail="Failed to get agents")
@@ -93,105 +283,185 @@ async def toggle_agent(agent_id: str):
         logger.error(f"Error toggling agent {agent_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to toggle agent")
 
+@app.post("/api/agents/{agent_id}/reload")
+async def reload_agent(agent_id: str):
+    """Hot-reload an agent's config and module without dropping connections"""
+    if agent_id not in agent_manager.agent_configs:
+        raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
+    try:
+        reloaded = agent_manager.reload_agent(agent_id)
+        return {"success": True, "reloaded": reloaded}
+    except Exception as e:
+        logger.error(f"Error reloading agent {agent_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to reload agent; the previous version is still running")
+
 @app.get("/api/tasks")
-async def get_tasks():
-    """Get all tasks"""
+async def get_tasks(request: Request):
+    """Get all tasks (conditional on If-None-Match)"""
     try:
         # This would typically come from a database
-        # For now, return sample data
-        sample_tasks = [
-            {
-                "id": "1",
-                "title": "Market Research for AI Finance Tool",
-                "description": "Research competitors and market opportunities in AI finance space",
-                "status": "todo",
-                "priority": "high",
-                "assignedTo": "market",
-                "assignedAgent": "Market Analyst",
-                "createdBy": "PM Agent",
-                "dueDate": "2024-01-20",
-                "sprint": "current",
-                "tags": ["research", "finance", "ai"]
-            }
-        ]
-        return {"tasks": sample_tasks}
+        return conditional_response(request, task_catalog.get())
     except Exception as e:
         logger.error(f"Error getting tasks: {e}")
         raise HTTPException(status_code=500, detail="Failed to get tasks")
 
-@app.post("/api/tasks")
-async def create_task(task: Task):
-    """Create a new task"""
+@app.get("/api/tasks/search")
+async def search_tasks(q: str = "", tags: List[str] = Query(default=[]), status: Optional[str] = None,
+                       assignedTo: Optional[str] = None, limit: int = Query(default=20, ge=1, le=100),
+                       offset: int = Query(default=0, ge=0, le=MAX_RESULT_WINDOW)):
+    """Tasks matching every word of ``q`` (the last as a prefix) and every filter, best match first"""
+    tasks, total = task_store.search(q, tags, status, assignedTo, limit, offset)
+    return {"tasks": tasks, "total": total}
+
+async def _idempotent(request: Request, payload: Any, build) -> Response:
+    """Run ``build`` once per Idempotency-Key and replay its stored JSON body for repeats"""
+    key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if key is None:
+        return Response(content=dumps(await build()), media_type=JSON_MEDIA_TYPE)
     try:
+        stored, replayed = await idempotency_store.run(
+            client_key(request), request.url.path, key, payload, build)
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return Response(content=stored.body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+@app.post("/api/tasks")
+async def create_task(task: Task, request: Request):
+    """Create a new task; retries with the same Idempotency-Key get the same task back"""
+    async def create() -> Dict[str, Any]:
         # In a real implementation, this would save to database
         task_dict = task.dict()
-        task_dict["id"] = str(datetime.now().timestamp())
+        task_dict["id"] = new_id()
+        task_dict["status"] = "todo"
         task_dict["createdAt"] = datetime.now().isoformat()
+        task_store.add(task_dict)
         
         logger.info(f"Created new task: {task_dict['title']}")
         return {"success": True, "task": task_dict}
+
+    try:
+        return await _idempotent(request, task.model_dump(mode="json"), create)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating task: {e}")
         raise HTTPException(status_code=500, detail="Failed to create task")
 
+@app.put("/api/tasks/{task_id}")
+async def update_task(task_id: str, changes: TaskUpdate):
+    """Change some fields of a task"""
+    updates = changes.model_dump(exclude_unset=True, exclude_none=True)
+    updates["updatedAt"] = datetime.now().isoformat()
+    task = task_store.update(task_id, updates)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+    return {"success": True, "task": task}
+
+@app.delete("/api/tasks/{task_id}")
+async def delete_task(task_id: str):
+    """Delete a task"""
+    if not task_store.delete(task_id):
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+    return {"success": True}
+
+async def handle_user_message(websocket: WebSocket, message_data: Dict[str, Any]):
+    """Run a chat turn for a user_message frame and stream the agent responses back"""
+    # Process user message and generate agent responses
+    user_message = message_data.get("message", "")
+    active_agents = message_data.get("agents", [])
+    session_id = message_data.get("sessionId") or manager.session_ids.get(websocket)
+    try:
+        deadline = ws_deadline.validate_python(message_data.get("deadline"))
+    except ValidationError:
+        await manager.send_frame({
+            "type": "error",
+            "message": "deadline must be a positive number of seconds"
+        }, websocket)
+        return
+
+    # Send user message confirmation (with the session id, so a reconnecting client can keep its memory)
+    await manager.send_frame({
+        "type": "message_received",
+        "message": "Message received, agents are processing...",
+        "sessionId": session_id
+    }, websocket)
+
+    # Generate agent responses
+    logger.debug("Calling agent_manager.process_user_message", extra=log_fields(message=user_message, agents=active_agents))
+    async def send_follow_up(response: AgentResponse, placeholder: AgentResponse):
+        # Late agents answer after the turn with a reference to their placeholder
+        await manager.send_frame(response_frame("agent_response", response, followUpTo=placeholder.id), websocket)
+
+    try:
+        agent_responses = await agent_manager.process_user_message(
+            user_message, 
+            active_agents,
+            deadline=deadline,
+            on_late_response=send_follow_up,
+            session_id=session_id
+        )
+        logger.debug("Agent manager returned %d responses", len(agent_responses))
+
+        # Send each agent response with delay for realistic effect
+        for i, response in enumerate(agent_responses):
+            logger.debug("Sending response %d/%d from agent %s", i + 1, len(agent_responses), response.agentId)
+            await latency_model.wait(RESPONSE_PACING_SECONDS, key="ws_pacing")  # Simulate thinking time
+            await manager.send_frame(response_frame("agent_response", response), websocket)
+
+        # Let clients know the turn is finished (used by load tests to time the last response)
+        await manager.send_frame({
+            "type": "turn_complete",
+            "responses": len(agent_responses)
+        }, websocket)
+    except OverloadedError as e:
+        # Shed load with a cheap frame instead of queueing the turn
+        await manager.send_frame({
+            "type": "overloaded",
+            "message": str(e),
+            "retryAfter": e.retry_after
+        }, websocket)
+    except Exception as e:
+        logger.error(f"Error in agent_manager.process_user_message: {e}")
+        import traceback
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        # Send error message to client
+        await manager.send_frame({
+            "type": "error",
+            "message": f"Error processing message: {str(e)}"
+        }, websocket)
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time communication"""
     await manager.connect(websocket)
+    rate_key = client_key(websocket)
     try:
         while True:
-            # Receive message from client
-            data = await websocket.receive_text()
-            message_data = json.loads(data)
+            # Receive message from client (JSON text, or binary in the negotiated codec)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            message_data = manager.decode_frame(message, websocket)
             
-            logger.info(f"Received message: {message_data}")
+            logger.debug("Received %s frame", message_data.get("type"), extra=log_fields(payload=message_data))
             
-            if message_data.get("type") == "user_message":
-                # Process user message and generate agent responses
-                user_message = message_data.get("message", "")
-                active_agents = message_data.get("agents", [])
-                
-                # Send user message confirmation
-                await manager.send_personal_message(
-                    json.dumps({
-                        "type": "message_received",
-                        "message": "Message received, agents are processing..."
-                    }),
-                    websocket
-                )
-                
-                # Generate agent responses
-                logger.info(f"Calling agent_manager.process_user_message with message: '{user_message}' and agents: {active_agents}")
-                try:
-                    agent_responses = await agent_manager.process_user_message(
-                        user_message, 
-                        active_agents
-                    )
-                    logger.info(f"Agent manager returned {len(agent_responses)} responses")
-                    
-                    # Send each agent response with delay for realistic effect
-                    for i, response in enumerate(agent_responses):
-                        logger.info(f"Sending response {i+1}/{len(agent_responses)} from agent {response.agentId}")
-                        await asyncio.sleep(1.5)  # Simulate thinking time
-                        await manager.send_personal_message(
-                            json.dumps({
-                                "type": "agent_response",
-                                **response.model_dump()
-                            }),
-                            websocket
-                        )
-                except Exception as e:
-                    logger.error(f"Error in agent_manager.process_user_message: {e}")
-                    import traceback
-                    logger.error(f"Traceback: {traceback.format_exc()}")
-                    # Send error message to client
-                    await manager.send_personal_message(
-                        json.dumps({
-                            "type": "error",
-                            "message": f"Error processing message: {str(e)}"
-                        }),
-                        websocket
-                    )
+            with tracer.span("ws.message", type=message_data.get("type")):
+                if message_data.get("type") == "user_message":
+                    if rate_limiter is not None:
+                        try:
+                            await rate_limiter.check(rate_key, "ws")
+                        except RateLimitedError as e:
+                            # Dropped before any agent work; the client is told when to retry
+                            await manager.send_frame({
+                                "type": "rate_limited",
+                                "message": str(e),
+                                "retryAfter": round(e.retry_after, 3)
+                            }, websocket)
+                            continue
+                    await handle_user_message(websocket, message_data)
             
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -200,39 +470,222 @@ async def websocket_endpoint(websocket: WebSocket):
         manager.disconnect(websocket)
 
 @app.post("/api/chat/message")
-async def send_message(message: UserMessage):
+async def send_message(message: UserMessage, request: Request):
     """Send a message to agents (HTTP endpoint alternative to WebSocket)"""
-    try:
+    async def process() -> Dict[str, Any]:
         responses = await agent_manager.process_user_message(
             message.content, 
-            message.agents
+            message.agents,
+            deadline=message.deadline,
+            session_id=message.sessionId
         )
         return {"responses": responses}
+
+    try:
+        return await _idempotent(request, message.model_dump(mode="json"), process)
+    except HTTPException:
+        raise
+    except OverloadedError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(int(e.retry_after))})
     except Exception as e:
         logger.error(f"Error processing message: {e}")
         raise HTTPException(status_code=500, detail="Failed to process message")
 
+def _batch_lines(indices: List[int], responses: List[AgentResponse], error: Exception) -> bytes:
+    if isinstance(error, OverloadedError):
+        line = {"error": "Server is overloaded", "retryAfter": int(error.retry_after)}
+        return b"".join(dumps({"index": index, **line}) + b"\n" for index in indices)
+    if error is not None:
+        logger.error(f"Error processing batch message: {error}")
+        return b"".join(dumps({"index": index, "error": "Failed to process message"}) + b"\n" for index in indices)
+    # Duplicates share one serialized payload
+    payload = dumps(responses)
+    return b"".join(b'{"index":%d,"responses":%s}\n' % (index, payload) for index in indices)
+
+@app.post("/api/chat/batch")
+async def send_batch(batch: BatchChatRequest):
+    """Send many messages as bulk work, streaming NDJSON results in completion order.
+
+    Each line is {"index", "responses"} or {"index", "error"}, where index is
+    the message's position in the request; turns shed by admission control
+    also carry "retryAfter". Per-message deadlines are not
+    applied; every turn gets the server's request deadline.
+    """
+    results = agent_manager.process_batch(
+        [(message.content, message.agents) for message in batch.messages],
+        max_parallel=batch.max_parallel
+    )
+    # Pull the first result before responding so a batch shed from the start still gets a 429
+    first = await results.__anext__()
+    if isinstance(first[2], OverloadedError):
+        await results.aclose()
+        error = first[2]
+        raise HTTPException(status_code=429, detail=str(error), headers={"Retry-After": str(int(error.retry_after))})
+
+    async def stream() -> AsyncIterator[bytes]:
+        try:
+            yield _batch_lines(*first)
+            async for result in results:
+                yield _batch_lines(*result)
+        finally:
+            await results.aclose()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+async def run_stream_turn(stream: TurnStream, message: UserMessage):
+    """Run a chat turn in the background, publishing each agent response to ``stream`` as it lands"""
+    delivered = asyncio.Event()
+    outstanding = 0
+
+    async def publish_response(response: AgentResponse):
+        stream.publish("agent", response_frame("agent", response))
+
+    async def publish_follow_up(response: AgentResponse, placeholder: AgentResponse):
+        nonlocal outstanding
+        stream.publish("agent", response_frame("agent", response, followUpTo=placeholder.id))
+        outstanding -= 1
+        if outstanding <= 0:
+            delivered.set()
+
+    stream.publish("message_received", {"turnId": stream.turn_id, "message": "Message received, agents are processing..."})
+    try:
+        responses = await agent_manager.process_user_message(
+            message.content,
+            message.agents,
+            deadline=message.deadline,
+            on_late_response=publish_follow_up,
+            on_response=publish_response,
+            session_id=message.sessionId
+        )
+        placeholders = [response for response in responses if response.pending]
+        for placeholder in placeholders:
+            stream.publish("agent", response_frame("agent", placeholder))
+        stream.publish("turn_complete", {"responses": len(responses)})
+
+        # Keep the stream open for late agents' follow-ups
+        outstanding += len(placeholders)
+        if outstanding > 0:
+            await asyncio.wait_for(delivered.wait(), timeout=SSE_FOLLOW_UP_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Stream %s closed with %d follow-ups outstanding", stream.turn_id, outstanding)
+    except OverloadedError as e:
+        stream.publish("overloaded", {"message": str(e), "retryAfter": e.retry_after})
+    except Exception as e:
+        logger.error(f"Error processing streamed message: {e}")
+        stream.publish("error", {"message": "Sorry, there was an error processing your message. Please try again."})
+    finally:
+        stream.close()
+
+def open_turn_stream(request: Request, message: Optional[UserMessage]) -> StreamingResponse:
+    """Start a streamed turn, or resume one from the Last-Event-ID header"""
+    resume = parse_last_event_id(request.headers.get("last-event-id"))
+    if resume is not None:
+        turn_id, after = resume
+        stream = turn_streams.get(turn_id)
+        if stream is None:
+            # A non-200 response stops EventSource from reconnecting
+            raise HTTPException(status_code=404, detail="Stream expired")
+    elif message is not None and message.content:
+        try:
+            stream, after = turn_streams.create(), 0
+        except OverloadedError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(int(e.retry_after))})
+        stream.task = asyncio.create_task(run_stream_turn(stream, message))
+    else:
+        raise HTTPException(status_code=400, detail="A message is required")
+
+    async def events() -> AsyncIterator[str]:
+        yield f"retry: {SSE_RETRY_MILLISECONDS}\n\n"
+        async for event in stream.read(after, heartbeat=SSE_HEARTBEAT_SECONDS):
+            yield event
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/chat/stream")
+async def stream_message_get(request: Request, message: Optional[str] = None, agents: str = "",
+                             deadline: Optional[float] = Query(None, gt=0), session: Optional[str] = None):
+    """Stream a chat turn as Server-Sent Events (EventSource-friendly query parameters)"""
+    user_message = None
+    if message is not None:
+        user_message = UserMessage(
+            content=message,
+            agents=[agent for agent in agents.split(",") if agent],
+            deadline=deadline,
+            sessionId=session
+        )
+    return open_turn_stream(request, user_message)
+
+@app.post("/api/chat/stream")
+async def stream_message_post(request: Request, message: UserMessage):
+    """Stream a chat turn as Server-Sent Events: one ``agent`` event per response as it is ready"""
+    return open_turn_stream(request, message)
+
 @app.get("/api/market/research")
-async def get_market_research(query: str):
-    """Get market research data"""
+async def get_market_research(request: Request, query: str):
+    """Get market research data, cached per query (conditional on If-None-Match)"""
     try:
         # This would integrate with market analysis tools
-        research_data = await agent_manager.get_market_research(query)
-        return {"research": research_data}
+        research = await market_research_cache.get(query)
+        return conditional_response(request, research, max_age=60)
     except Exception as e:
         logger.error(f"Error getting market research: {e}")
         raise HTTPException(status_code=500, detail="Failed to get market research")
 
 @app.post("/api/projects/analyze")
 async def analyze_project(project_description: str):
-    """Analyze a project and generate recommendations"""
+    """Analyze a project with the PM, tech and market agents, cached per description.
+
+    The sprint plan and pitch are started in the background; fetch them
+    from POST /api/projects/plan.
+    """
     try:
-        analysis = await agent_manager.analyze_project(project_description)
-        return {"analysis": analysis}
+        async def build() -> Dict[str, Any]:
+            return {"analysis": await agent_manager.analyze_project(project_description)}
+
+        cached = await project_analysis_cache.get(agent_manager.analysis_key(project_description), build)
+        return Response(content=cached.body, media_type=JSON_MEDIA_TYPE)
     except Exception as e:
         logger.error(f"Error analyzing project: {e}")
         raise HTTPException(status_code=500, detail="Failed to analyze project")
 
+@app.post("/api/projects/plan")
+async def plan_project(project_description: str):
+    """Sprint plan and pitch deck for a project, built on its tech stack and market research, cached per description"""
+    try:
+        async def build() -> Dict[str, Any]:
+            return await agent_manager.plan_project(project_description)
+
+        cached = await project_plan_cache.get(agent_manager.analysis_key(project_description), build)
+        return Response(content=cached.body, media_type=JSON_MEDIA_TYPE)
+    except Exception as e:
+        logger.error(f"Error planning project: {e}")
+        raise HTTPException(status_code=500, detail="Failed to plan project")
+
+@app.post("/api/jobs/{kind}", status_code=202)
+async def submit_job(kind: str, request: JobRequest):
+    """Queue a long-running agent operation; poll GET /api/jobs/{id} or wait for its job_complete frame"""
+    if kind not in job_manager.kinds:
+        raise HTTPException(status_code=404, detail=f"Unknown job kind {kind}; expected one of {job_manager.kinds}")
+    try:
+        job, deduplicated = job_manager.submit(kind, request.params, request.sessionId)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except OverloadedError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(int(e.retry_after))})
+    return FastJSONResponse({"job": job.to_dict(), "deduplicated": deduplicated}, status_code=202)
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status of a job, with its result once finished (until the result expires)"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return FastJSONResponse({"job": job.to_dict()})
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
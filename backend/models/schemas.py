@@ -43,6 +43,20 @@ class Task(BaseModel):
     class Config:
         use_enum_values = True
 
+class TaskUpdate(BaseModel):
+    """Fields to change on an existing task; omitted fields keep their value"""
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    assignedTo: Optional[str] = None
+    dueDate: Optional[str] = None
+    sprint: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+    class Config:
+        use_enum_values = True
+
 class TaskResponse(Task):
     id: str
     status: TaskStatus = TaskStatus.TODO
@@ -55,6 +69,35 @@ class UserMessage(BaseModel):
     content: str
     agents: List[str] = Field(default_factory=list)
     timestamp: Optional[datetime] = None
+    deadline: Optional[float] = Field(None, gt=0)  # seconds; capped by the server's request deadline
+    sessionId: Optional[str] = Field(default=None, max_length=128)  # enables conversation memory
+
+class BatchChatRequest(BaseModel):
+    messages: List[UserMessage] = Field(..., min_length=1, max_length=10000)
+    max_parallel: int = Field(default=8, ge=1, le=64)  # chat turns run at once
+
+class JobRequest(BaseModel):
+    params: Dict[str, Any] = Field(default_factory=dict)
+    sessionId: Optional[str] = Field(default=None, max_length=128)  # WebSocket session told when the job finishes
+
+# Parameters of each background job kind
+class SprintPlanJob(BaseModel):
+    project_description: str = Field(..., min_length=1)
+    team_capacity: Optional[Dict[str, int]] = None  # hours per week by role; the default team when omitted
+
+class PitchDeckJob(BaseModel):
+    project_description: str = Field(..., min_length=1)
+    target_audience: str = "Investors"
+
+class TechRecommendationsJob(BaseModel):
+    requirements: str = Field(..., min_length=1)
+
+class MarketResearchJob(BaseModel):
+    query: str = Field(..., min_length=1)
+
+class ProjectAnalysisJob(BaseModel):
+    description: str = Field(..., min_length=1)
+    team_capacity: Optional[Dict[str, int]] = None
 
 class AgentResponse(BaseModel):
     id: str
@@ -66,6 +109,8 @@ class AgentResponse(BaseModel):
     avatar: str
     confidence: Optional[float] = None
     suggestions: List[str] = Field(default_factory=list)
+    # True for a deadline placeholder; the agent's real answer follows with followUpTo set to this id
+    pending: bool = False
 
 class ProjectAnalysis(BaseModel):
     summary: str
@@ -74,6 +119,10 @@ class ProjectAnalysis(BaseModel):
     timeline: Dict[str, Any]
     risks: List[str]
     opportunities: List[str]
+    # Filled in by the multi-agent project workflow; sprint plans and pitches come from AgentManager.plan_project
+    market_research: Optional[Dict[str, Any]] = None
+    sprint_plan: Optional[Dict[str, Any]] = None
+    pitch_deck: Optional[Dict[str, Any]] = None
 
 class MarketResearch(BaseModel):
     query: str
@@ -0,0 +1,55 @@
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List
+
+from starlette.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from models.schemas import Agent
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the standard library encoder
+    orjson = None
+
+# Validates a whole list of configs in one core call instead of one model per entry
+AGENT_LIST = TypeAdapter(List[Agent])
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def dumps(value: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes; pydantic models are encoded by their fields"""
+        return orjson.dumps(value, default=_default)
+else:
+    def dumps(value: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes; pydantic models are encoded by their fields"""
+        return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_str(value: Any) -> str:
+    """Like ``dumps`` but returns text, for WebSocket text frames and SSE data"""
+    return dumps(value).decode("utf-8")
+
+
+def response_frame(frame_type: str, model: BaseModel, **extra: Any) -> Dict[str, Any]:
+    """Merge a flat model's fields into a frame dict without a model_dump round trip.
+
+    The model's own fields win over ``frame_type``, matching the previous
+    ``{"type": ..., **model.model_dump()}`` frames (agent frames carry type "agent").
+    """
+    return {"type": frame_type, **model.__dict__, **extra}
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the fast encoder; return it directly to skip jsonable_encoder"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
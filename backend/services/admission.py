@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from typing import Dict, Tuple
+
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_REJECTED_TOTAL = REGISTRY.counter(
+    "admission_rejected_total", "Requests shed by admission control or bulkheads", ["scope", "reason"])
+ADMISSION_IN_FLIGHT = REGISTRY.gauge(
+    "admission_in_flight", "Chat turns currently admitted")
+BULKHEAD_ACTIVE = REGISTRY.gauge(
+    "bulkhead_active", "Agent executions holding a bulkhead slot", ["agent"])
+BULKHEAD_WAITING = REGISTRY.gauge(
+    "bulkhead_waiting", "Agent executions queued for a bulkhead slot", ["agent"])
+
+_bulkheads: Dict[str, "Bulkhead"] = {}
+
+
+class OverloadedError(Exception):
+    """Raised when work is shed instead of queued"""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Bulkhead:
+    """Caps concurrent executions of one agent, with a bounded wait queue"""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        _bulkheads[name] = self
+
+    async def __aenter__(self):
+        if self.active >= self.max_concurrency and self.waiting >= self.max_queue:
+            ADMISSION_REJECTED_TOTAL.labels(self.name, "bulkhead_full").inc()
+            raise OverloadedError(f"Agent {self.name} is at capacity")
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.active -= 1
+        self._semaphore.release()
+        return False
+
+
+class AdmissionController:
+    """Global gate on chat turns based on in-flight count and recent latency.
+
+    Admission is a synchronous check so rejected requests cost almost
+    nothing. A turn is shed when ``max_in_flight`` turns are running, or
+    when the smoothed turn latency exceeds ``latency_threshold`` while more
+    than ``min_in_flight`` turns are running.
+    """
+
+    def __init__(self, max_in_flight: int = 200, latency_threshold: float = 10.0,
+                 min_in_flight: int = 8, smoothing: float = 0.2):
+        self.max_in_flight = max_in_flight
+        self.latency_threshold = latency_threshold
+        self.min_in_flight = min_in_flight
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.latency_ewma = 0.0
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        return cls(
+            max_in_flight=int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "200")),
+            latency_threshold=float(os.getenv("ADMISSION_LATENCY_THRESHOLD_SECONDS", "10"))
+        )
+
+    def acquire(self) -> float:
+        """Admit a turn or raise OverloadedError; returns the admission timestamp"""
+        if self.in_flight >= self.max_in_flight:
+            ADMISSION_REJECTED_TOTAL.labels("turn", "max_in_flight").inc()
+            raise OverloadedError("Too many requests in flight", retry_after=self._retry_after())
+        if self.in_flight > self.min_in_flight and self.latency_ewma > self.latency_threshold:
+            ADMISSION_REJECTED_TOTAL.labels("turn", "latency").inc()
+            raise OverloadedError("Server is overloaded", retry_after=self._retry_after())
+        self.in_flight += 1
+        ADMISSION_IN_FLIGHT.set(self.in_flight)
+        return time.monotonic()
+
+    def release(self, admitted_at: float, record_latency: bool = True):
+        """End an admitted turn; ``record_latency=False`` keeps bulk work out of the latency average"""
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.set(self.in_flight)
+        if record_latency:
+            elapsed = time.monotonic() - admitted_at
+            self.latency_ewma += self.smoothing * (elapsed - self.latency_ewma)
+
+    def _retry_after(self) -> float:
+        return max(1.0, math.ceil(self.latency_ewma))
+
+
+def _bulkhead_values(attribute: str) -> Dict[Tuple[str, ...], float]:
+    return {(name,): getattr(bulkhead, attribute) for name, bulkhead in list(_bulkheads.items())}
+
+
+BULKHEAD_ACTIVE.set_function(lambda: _bulkhead_values("active"))
+BULKHEAD_WAITING.set_function(lambda: _bulkhead_values("waiting"))
@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from models.serialization import dumps
+from services.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag derived from the serialized body"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers ``etag`` (weak comparison, as GET allows)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+class CachedBody:
+    """Serialized response body with its ETag"""
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = compute_etag(body)
+
+
+def conditional_response(request: Request, cached: CachedBody, max_age: int = 0) -> Response:
+    """200 with the cached body, or an empty 304 when the client already has this version"""
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"private, max-age={max_age}, must-revalidate" if max_age else "no-cache"
+    }
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+class VersionedResource:
+    """A response body rebuilt only when its source version changes.
+
+    ``version`` returns a value that changes whenever the underlying data
+    does (e.g. a counter bumped on toggle); ``build`` returns the JSON-able
+    payload. Between changes every request is served the same bytes.
+    """
+
+    def __init__(self, name: str, build: Callable[[], Any], version: Callable[[], Any]):
+        self.name = name
+        self._build = build
+        self._version = version
+        self._built_version: Any = None
+        self._cached: Optional[CachedBody] = None
+
+    def get(self) -> CachedBody:
+        version = self._version()
+        hit = self._cached is not None and self._built_version == version
+        record_cache_lookup(self.name, hit)
+        if not hit:
+            self._cached = CachedBody(dumps(self._build()))
+            self._built_version = version
+            logger.debug("Rebuilt %s at version %s", self.name, version)
+        return self._cached
+
+
+class KeyedCache:
+    """Per-key cached values with a TTL and LRU bound.
+
+    Concurrent misses for the same key share one build, so a burst of
+    identical requests runs the expensive work once. Failed builds are
+    not cached. ``get`` may be given its own ``build`` for callers whose
+    inputs are not all in the key.
+
+    ``invalidate`` bumps a generation counter, and a build that started
+    before the bump returns its result to its callers without caching it.
+    """
+
+    def __init__(self, name: str, build: Optional[Callable[[Any], Awaitable[Any]]] = None,
+                 ttl: float = 300.0, max_entries: int = 256):
+        self.name = name
+        self._build = build
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+        self._key_generations: Dict[Hashable, int] = {}
+
+    def _wrap(self, value: Any) -> Any:
+        """Turn a freshly built value into what is cached and returned"""
+        return value
+
+    async def get(self, key: Hashable, build: Optional[Callable[[], Awaitable[Any]]] = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            self._entries.move_to_end(key)
+            record_cache_lookup(self.name, True)
+            return entry[1]
+        record_cache_lookup(self.name, False)
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        generation = self._generation_of(key)
+        try:
+            cached = self._wrap(await (build() if build is not None else self._build(key)))
+            if self._generation_of(key) == generation:
+                self._entries[key] = (time.monotonic(), cached)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            future.set_result(cached)
+            return cached
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved so an unwaited future doesn't warn
+            future.exception()
+            raise
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def _generation_of(self, key: Hashable) -> tuple:
+        return self._generation, self._key_generations.get(key, 0)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        # Later gets start a fresh build instead of joining one that is now stale
+        if key is None:
+            self._entries.clear()
+            self._in_flight.clear()
+            self._generation += 1
+            self._key_generations.clear()
+        else:
+            self._entries.pop(key, None)
+            if self._in_flight.pop(key, None) is not None:
+                self._key_generations[key] = self._key_generations.get(key, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class KeyedResourceCache(KeyedCache):
+    """Per-key cached bodies for parameterized requests, serialized once per build"""
+
+    def __init__(self, name: str, build: Optional[Callable[[Any], Awaitable[Any]]] = None,
+                 ttl: float = 300.0, max_entries: int = 256):
+        super().__init__(name, build, ttl, max_entries)
+
+    def _wrap(self, value: Any) -> CachedBody:
+        return CachedBody(dumps(value))
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+from typing import Any, Awaitable, Callable, Tuple
+
+from models.serialization import dumps
+from services.catalog import KeyedCache
+from services.metrics import REGISTRY
+
+IDEMPOTENT_REPLAYS_TOTAL = REGISTRY.counter(
+    "idempotent_replays_total", "Requests answered with the stored response for their Idempotency-Key", ["route"])
+
+IDEMPOTENCY_KEY_HEADER = "idempotency-key"
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyReusedError(Exception):
+    """Raised when an Idempotency-Key comes back with a different request"""
+
+
+class StoredResponse:
+    """Serialized response body kept for replays, with the request it answered"""
+
+    __slots__ = ("body", "fingerprint")
+
+    def __init__(self, body: bytes, fingerprint: str):
+        self.body = body
+        self.fingerprint = fingerprint
+
+
+def request_fingerprint(payload: Any) -> str:
+    """Digest of a request's parsed payload, insensitive to key order and whitespace"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class IdempotencyStore:
+    """Responses of non-idempotent requests by (client, route, Idempotency-Key).
+
+    A repeated key gets the stored body back without running the request
+    again. Entries live ``ttl`` seconds, the oldest are dropped beyond
+    ``max_entries``, and a retry arriving while the first attempt is still
+    running waits for that attempt instead of starting its own. Failed
+    attempts are not stored, so a retry after an error runs again. Keys
+    are scoped per client, so one client cannot read another's responses.
+    """
+
+    def __init__(self, ttl: float = 86400.0, max_entries: int = 10_000):
+        self._cache = KeyedCache("idempotency", ttl=ttl, max_entries=max_entries)
+
+    @classmethod
+    def from_env(cls) -> "IdempotencyStore":
+        return cls(
+            ttl=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+            max_entries=int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000")),
+        )
+
+    async def run(self, client: str, route: str, key: str, payload: Any,
+                  build: Callable[[], Awaitable[Any]]) -> Tuple[StoredResponse, bool]:
+        """The response for ``key``, building it only the first time; returns (response, replayed).
+
+        Raises ValueError for an empty or overlong key and
+        IdempotencyKeyReusedError when ``key`` was used for a different payload.
+        """
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise ValueError(f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters")
+        fingerprint = request_fingerprint(payload)
+        built = False
+
+        async def execute() -> StoredResponse:
+            nonlocal built
+            built = True
+            return StoredResponse(dumps(await build()), fingerprint)
+
+        stored = await self._cache.get((client, route, key), execute)
+        if stored.fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError("Idempotency-Key was already used for a different request")
+        if not built:
+            IDEMPOTENT_REPLAYS_TOTAL.labels(route).inc()
+        return stored, not built
+
+    def __len__(self) -> int:
+        return len(self._cache)
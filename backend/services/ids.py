@@ -0,0 +1,56 @@
+import os
+import threading
+import time
+from typing import Optional
+
+# Crockford's base32: no I, L, O or U, so ids survive being read aloud or retyped
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+
+
+def _encode(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        chars.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+class ULIDGenerator:
+    """ULIDs: a 48-bit millisecond timestamp followed by 80 random bits, 26 characters.
+
+    Ids sort by creation time as plain strings. Within one millisecond
+    (or if the clock steps back) the random part is incremented instead
+    of redrawn, so ids from one generator are strictly increasing and
+    never collide; ids from different processes differ in 80 random bits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def new(self, now: Optional[float] = None) -> str:
+        ms = int((time.time() if now is None else now) * 1000)
+        with self._lock:
+            if ms <= self._last_ms:
+                ms = self._last_ms
+                random_part = self._last_random + 1
+                if random_part > _RANDOM_MAX:
+                    # 2^80 ids in one millisecond; borrow the next one
+                    ms += 1
+                    random_part = int.from_bytes(os.urandom(10), "big")
+            else:
+                random_part = int.from_bytes(os.urandom(10), "big")
+            self._last_ms = ms
+            self._last_random = random_part
+        return _encode(ms, 10) + _encode(random_part, 16)
+
+
+_generator = ULIDGenerator()
+
+
+def new_id() -> str:
+    """A fresh ULID from the process-wide generator"""
+    return _generator.new()
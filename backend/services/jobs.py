@@ -0,0 +1,291 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel
+
+from models.serialization import dumps
+from services.admission import OverloadedError
+from services.logging_setup import log_fields
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+JOBS_TOTAL = REGISTRY.counter(
+    "jobs_total", "Finished background jobs by kind and outcome", ["kind", "status"])
+JOBS_DEDUPLICATED_TOTAL = REGISTRY.counter(
+    "jobs_deduplicated_total", "Job submissions answered with an identical pending job", ["kind"])
+JOB_SECONDS = REGISTRY.histogram(
+    "job_seconds", "Run time of background jobs", ["kind"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+JOBS_PENDING = REGISTRY.gauge(
+    "jobs_pending", "Background jobs queued or running")
+
+JobHandler = Callable[..., Awaitable[Any]]
+# Called with each job as it finishes, e.g. to push it to the submitter's WebSocket
+JobListener = Callable[["Job"], Awaitable[None]]
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+PENDING = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+class Job:
+    """One submitted operation and, once finished, its JSON result or error"""
+
+    __slots__ = ("id", "kind", "params", "key", "session_ids", "status", "result", "error",
+                 "created_at", "updated_at", "expires_at")
+
+    def __init__(self, kind: str, params: Dict[str, Any], key: str, session_ids: Iterable[str] = (),
+                 job_id: Optional[str] = None):
+        now = time.time()
+        self.id = job_id or uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        # Digest of (kind, params): identical pending submissions share one job
+        self.key = key
+        # Sessions told when the job finishes: the submitter's and those of deduplicated submissions
+        self.session_ids: Set[str] = set(session_ids)
+        self.status = JobStatus.QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = now
+        self.updated_at = now
+        self.expires_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status.value,
+            "params": self.params,
+            "result": self.result,
+            "error": self.error,
+            "createdAt": self.created_at,
+            "updatedAt": self.updated_at,
+            "expiresAt": self.expires_at,
+        }
+
+
+def job_key(kind: str, params: Dict[str, Any]) -> str:
+    canonical = json.dumps([kind, params], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class JobStore:
+    """Job state in SQLite, so queued work and finished results survive a restart.
+
+    Writes are single-row upserts in WAL mode and run on the event loop
+    thread; they take microseconds next to the seconds a job runs.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        # Created wherever the app is built but only used from the event loop thread
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, kind TEXT, params TEXT, key TEXT, "
+            "session_ids TEXT, status TEXT, result TEXT, error TEXT, created_at REAL, updated_at REAL, "
+            "expires_at REAL)")
+        self._db.commit()
+
+    def save(self, job: Job):
+        self._db.execute(
+            "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job.id, job.kind, json.dumps(job.params), job.key, json.dumps(sorted(job.session_ids)), job.status.value,
+             json.dumps(job.result), job.error, job.created_at, job.updated_at, job.expires_at))
+        self._db.commit()
+
+    def load_all(self) -> List[Job]:
+        jobs = []
+        for row in self._db.execute("SELECT * FROM jobs ORDER BY created_at"):
+            job_id, kind, params, key, session_ids, status, result, error, created, updated, expires = row
+            job = Job(kind, json.loads(params), key, json.loads(session_ids), job_id)
+            job.status = JobStatus(status)
+            job.result = json.loads(result) if result is not None else None
+            job.error = error
+            job.created_at, job.updated_at, job.expires_at = created, updated, expires
+            jobs.append(job)
+        return jobs
+
+    def delete(self, job_ids: List[str]):
+        self._db.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in job_ids])
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+class JobManager:
+    """Runs long agent operations on an in-process worker pool instead of in request handlers.
+
+    Each job kind is registered with a handler and a pydantic model for
+    its parameters. Submitting returns at once with a job id to poll;
+    an identical submission (same kind and parameters) while one is still
+    queued or running gets that job instead of a new one, and its
+    session is told when that job finishes too. Finished jobs
+    keep their result for ``result_ttl`` seconds. All state goes through
+    the store, and jobs that were pending when the process stopped are
+    queued again on start.
+    """
+
+    def __init__(self, store: Optional[JobStore] = None, workers: int = 4, max_pending: int = 1000,
+                 result_ttl: float = 3600.0):
+        self.store = store or JobStore()
+        self.workers = workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Job] = {}
+        self._kinds: Dict[str, Tuple[JobHandler, Optional[Type[BaseModel]]]] = {}
+        self._pending: Dict[str, Job] = {}
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._listeners: List[JobListener] = []
+        JOBS_PENDING.set_function(lambda: {(): len(self._pending)})
+
+    @classmethod
+    def from_env(cls) -> "JobManager":
+        return cls(
+            # In memory unless a path is set, so importing the app leaves no files or old jobs behind
+            store=JobStore(os.getenv("JOB_STORE_PATH", ":memory:")),
+            workers=int(os.getenv("JOB_WORKERS", "4")),
+            max_pending=int(os.getenv("JOB_MAX_PENDING", "1000")),
+            result_ttl=float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600")),
+        )
+
+    def register(self, kind: str, handler: JobHandler, params: Optional[Type[BaseModel]] = None):
+        """Make ``kind`` submittable; ``handler`` is called with the validated parameters as keywords"""
+        self._kinds[kind] = (handler, params)
+
+    @property
+    def kinds(self) -> List[str]:
+        return list(self._kinds)
+
+    def add_listener(self, listener: JobListener):
+        self._listeners.append(listener)
+
+    def submit(self, kind: str, params: Dict[str, Any], session_id: Optional[str] = None) -> Tuple[Job, bool]:
+        """Queue a job and return it with whether it was an existing pending duplicate.
+
+        Raises KeyError for an unknown kind, ValueError for invalid
+        parameters and OverloadedError when too many jobs are pending.
+        """
+        _, model = self._kinds[kind]
+        if model is not None:
+            params = model(**params).model_dump()
+        key = job_key(kind, params)
+        existing = self._pending.get(key)
+        if existing is not None:
+            JOBS_DEDUPLICATED_TOTAL.labels(kind).inc()
+            if session_id is not None and session_id not in existing.session_ids:
+                existing.session_ids.add(session_id)
+                self.store.save(existing)
+            return existing, True
+        if len(self._pending) >= self.max_pending:
+            raise OverloadedError(f"{len(self._pending)} jobs already pending", retry_after=5.0)
+
+        job = Job(kind, params, key, [session_id] if session_id is not None else [])
+        self.store.save(job)
+        self._enqueue(job)
+        logger.info("Queued job %s (%s)", job.id, kind)
+        return job, False
+
+    def _enqueue(self, job: Job):
+        self.jobs[job.id] = job
+        self._pending[job.key] = job
+        self._queue.put_nowait(job.id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self.jobs.get(job_id)
+        if job is not None and job.expires_at is not None and job.expires_at <= time.time():
+            return None
+        return job
+
+    async def _run(self, job: Job):
+        handler, _ = self._kinds[job.kind]
+        job.status = JobStatus.RUNNING
+        job.updated_at = time.time()
+        self.store.save(job)
+        started = time.perf_counter()
+        try:
+            # Round-trip through JSON so results are stored and served exactly alike
+            job.result = json.loads(dumps(await handler(**job.params)))
+            job.status = JobStatus.SUCCEEDED
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind}) failed: {e}")
+            job.error = str(e)
+            job.status = JobStatus.FAILED
+        JOB_SECONDS.labels(job.kind).observe(time.perf_counter() - started)
+        JOBS_TOTAL.labels(job.kind, job.status.value).inc()
+        job.updated_at = time.time()
+        job.expires_at = job.updated_at + self.result_ttl
+        self._pending.pop(job.key, None)
+        self.store.save(job)
+        for listener in self._listeners:
+            try:
+                await listener(job)
+            except Exception as e:
+                logger.error(f"Job listener failed for {job.id}: {e}")
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            if job is not None and job.status in PENDING:
+                await self._run(job)
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        expired = [job_id for job_id, job in self.jobs.items() if job.expires_at is not None and job.expires_at <= now]
+        for job_id in expired:
+            del self.jobs[job_id]
+        if expired:
+            self.store.delete(expired)
+        return len(expired)
+
+    async def _maintain(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.purge_expired()
+            except Exception as e:
+                logger.error(f"Job maintenance failed: {e}")
+
+    def start(self, purge_interval: float = 60.0):
+        """Restore stored jobs, re-queue the unfinished ones and start the workers"""
+        requeued = 0
+        for job in self.store.load_all():
+            if job.id in self.jobs:
+                # Submitted before the workers started; already queued
+                continue
+            if job.status in PENDING and job.kind in self._kinds:
+                job.status = JobStatus.QUEUED
+                self._enqueue(job)
+                requeued += 1
+            else:
+                self.jobs[job.id] = job
+        self.purge_expired()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._maintain(purge_interval)))
+        logger.info("Job workers started", extra=log_fields(workers=self.workers, requeued=requeued))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
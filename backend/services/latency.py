@@ -0,0 +1,192 @@
+import asyncio
+import bisect
+import json
+import logging
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Histogram buckets are (upper_bound_seconds, count) pairs
+Histogram = Sequence[Tuple[float, int]]
+
+
+class SystemClock:
+    """Wall clock backed by the running event loop"""
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock:
+    """Deterministic clock for tests - sleeping advances time instantly"""
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self.total_slept = 0.0
+
+    def now(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float):
+        """Move the clock forward without yielding to the event loop"""
+        self._now += seconds
+
+    async def sleep(self, seconds: float):
+        self.advance(seconds)
+        self.total_slept += seconds
+        # Still yield once so concurrent tasks interleave like they would for real
+        await asyncio.sleep(0)
+
+
+class LatencyModel(ABC):
+    """Decides how long simulated work should take and waits on a clock"""
+
+    mode = "base"
+
+    def __init__(self, clock=None):
+        self.clock = clock or SystemClock()
+
+    @abstractmethod
+    def sample(self, min_seconds: float, max_seconds: float, key: str = "default") -> float:
+        """Delay in seconds for work that should take between ``min_seconds`` and ``max_seconds``"""
+        pass
+
+    async def wait(self, min_seconds: float, max_seconds: Optional[float] = None, key: str = "default") -> float:
+        """Sleep for a sampled delay and return it"""
+        if max_seconds is None:
+            max_seconds = min_seconds
+        delay = self.sample(min_seconds, max_seconds, key)
+        if delay > 0:
+            await self.clock.sleep(delay)
+        return delay
+
+
+class ZeroLatency(LatencyModel):
+    """No artificial delay - used once agents are backed by real services"""
+
+    mode = "zero"
+
+    def sample(self, min_seconds: float, max_seconds: float, key: str = "default") -> float:
+        return 0.0
+
+
+class UniformLatency(LatencyModel):
+    """Uniform delay between the caller's bounds (the original simulation)"""
+
+    mode = "uniform"
+
+    def __init__(self, clock=None, seed: Optional[int] = None):
+        super().__init__(clock)
+        self._rng = random.Random(seed)
+
+    def sample(self, min_seconds: float, max_seconds: float, key: str = "default") -> float:
+        return self._rng.uniform(min_seconds, max_seconds)
+
+
+class RecordedLatency(LatencyModel):
+    """Replays latency from recorded histograms, keyed by agent or operation.
+
+    Keys without a histogram use the ``default`` one if recorded, otherwise
+    the caller's simulated range.
+    """
+
+    mode = "recorded"
+
+    def __init__(self, histograms: Dict[str, Histogram], clock=None, seed: Optional[int] = None):
+        super().__init__(clock)
+        self._rng = random.Random(seed)
+        self._tables: Dict[str, Tuple[List[float], List[int], int]] = {}
+        for key, buckets in histograms.items():
+            self._tables[key] = self._build_table(key, buckets)
+
+    @staticmethod
+    def _build_table(key: str, buckets: Histogram) -> Tuple[List[float], List[int], int]:
+        bounds: List[float] = []
+        cumulative: List[int] = []
+        total = 0
+        for upper_bound, count in sorted(buckets):
+            if count <= 0:
+                continue
+            total += count
+            bounds.append(float(upper_bound))
+            cumulative.append(total)
+        if not total:
+            raise ValueError(f"Histogram '{key}' has no samples")
+        return bounds, cumulative, total
+
+    def sample(self, min_seconds: float, max_seconds: float, key: str = "default") -> float:
+        table = self._tables.get(key) or self._tables.get("default")
+        if table is None:
+            # Nothing recorded for this operation - keep the caller's simulated range
+            return self._rng.uniform(min_seconds, max_seconds)
+        bounds, cumulative, total = table
+        index = bisect.bisect_left(cumulative, self._rng.randint(1, total))
+        lower = bounds[index - 1] if index else 0.0
+        # Spread samples across the bucket instead of always returning its upper bound
+        return self._rng.uniform(lower, bounds[index])
+
+    @classmethod
+    def from_file(cls, path: str, clock=None, seed: Optional[int] = None) -> "RecordedLatency":
+        """Load histograms saved as {"key": [[upper_bound, count], ...]}"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        histograms = {key: [tuple(bucket) for bucket in buckets] for key, buckets in data.items()}
+        return cls(histograms, clock=clock, seed=seed)
+
+
+def create_latency_model(mode: Optional[str] = None, clock=None, seed: Optional[int] = None) -> LatencyModel:
+    """Build a latency model from a mode string.
+
+    Modes: ``uniform`` (default), ``zero``, ``virtual`` (uniform delays on a
+    VirtualClock) and ``recorded:<path>``. Falls back to the
+    ``AGENT_LATENCY_MODE`` environment variable when no mode is given.
+    """
+    mode = mode or os.getenv("AGENT_LATENCY_MODE", "uniform")
+    if seed is None and os.getenv("AGENT_LATENCY_SEED"):
+        seed = int(os.environ["AGENT_LATENCY_SEED"])
+
+    if mode == "zero":
+        model = ZeroLatency(clock)
+    elif mode == "uniform":
+        model = UniformLatency(clock, seed=seed)
+    elif mode == "virtual":
+        model = UniformLatency(clock or VirtualClock(), seed=0 if seed is None else seed)
+    elif mode.startswith("recorded:"):
+        model = RecordedLatency.from_file(mode.split(":", 1)[1], clock=clock, seed=seed)
+    else:
+        raise ValueError(f"Unknown latency mode: {mode}")
+
+    logger.info(f"Using latency model: {model.mode} ({type(model.clock).__name__})")
+    return model
+
+
+class RollingPercentile:
+    """Percentile over the most recent observed latencies for one agent"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._cached: Dict[float, float] = {}
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+        self._cached.clear()
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Latency at ``percentile`` (0-100), or None until enough samples exist"""
+        if len(self._samples) < self.min_samples:
+            return None
+        value = self._cached.get(percentile)
+        if value is None:
+            ordered = sorted(self._samples)
+            index = min(len(ordered) - 1, int(len(ordered) * percentile / 100.0))
+            value = self._cached[percentile] = ordered[index]
+        return value
@@ -0,0 +1,192 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import time
+from typing import Any, Dict, Optional
+
+REDACTED = "[redacted]"
+SENSITIVE_KEYS = re.compile(r"pass(word)?|secret|token|api[_-]?key|authorization|cookie", re.IGNORECASE)
+DEFAULT_MAX_FIELD_LENGTH = 200
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def log_fields(**fields: Any) -> Dict[str, Any]:
+    """Structured fields for ``extra=``; rendered lazily on the logging thread.
+
+    Values may be zero-argument callables, which are only called if the
+    record is actually written.
+    """
+    return {"fields": fields}
+
+
+def _parse_overrides(spec: Optional[str]) -> Dict[str, float]:
+    """Parse ``"agents=0.1,main=1"`` into {logger_prefix: value}"""
+    overrides: Dict[str, float] = {}
+    for item in (spec or "").split(","):
+        if "=" in item:
+            name, value = item.split("=", 1)
+            overrides[name.strip()] = float(value)
+    return overrides
+
+
+class _PrefixLookup:
+    """Resolves a logger name to the most specific configured prefix, memoized"""
+
+    def __init__(self, values: Dict[str, float]):
+        self._values = values
+        self._cache: Dict[str, Optional[float]] = {}
+
+    def get(self, name: str) -> Optional[float]:
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+        value = None
+        probe = name
+        while probe:
+            if probe in self._values:
+                value = self._values[probe]
+                break
+            probe = probe.rpartition(".")[0]
+        self._cache[name] = value
+        return value
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of DEBUG/INFO records per logger; warnings always pass"""
+
+    def __init__(self, sample_rates: Dict[str, float]):
+        super().__init__()
+        self._rates = _PrefixLookup(sample_rates)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rates.get(record.name)
+        return rate is None or random.random() < rate
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per logger capping DEBUG/INFO records per second"""
+
+    def __init__(self, rate_limits: Dict[str, float], burst_seconds: float = 1.0):
+        super().__init__()
+        self._limits = _PrefixLookup(rate_limits)
+        self._burst_seconds = burst_seconds
+        self._buckets: Dict[str, list] = {}
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._limits.get(record.name)
+        if rate is None:
+            return True
+        now = time.monotonic()
+        capacity = max(1.0, rate * self._burst_seconds)
+        bucket = self._buckets.get(record.name)
+        if bucket is None:
+            bucket = self._buckets[record.name] = [capacity, now]
+        tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens < 1.0:
+            bucket[0] = tokens
+            self.dropped += 1
+            return False
+        bucket[0] = tokens - 1.0
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves all formatting to the listener thread.
+
+    The stdlib handler formats the message before enqueueing; here the
+    record is passed through untouched so the event loop only pays for the
+    enqueue. Callers must not mutate objects passed as log arguments.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formats records as ``message key=value ...`` with redaction and truncation"""
+
+    def __init__(self, fmt: Optional[str] = None, max_field_length: int = DEFAULT_MAX_FIELD_LENGTH):
+        super().__init__(fmt or "%(asctime)s %(levelname)s %(name)s: %(message)s")
+        self.max_field_length = max_field_length
+
+    def _render_value(self, key: str, value: Any) -> str:
+        if SENSITIVE_KEYS.search(key):
+            return REDACTED
+        if callable(value):
+            value = value()
+        if isinstance(value, dict):
+            value = {k: (REDACTED if SENSITIVE_KEYS.search(str(k)) else v) for k, v in value.items()}
+        text = value if isinstance(value, str) else repr(value)
+        if len(text) > self.max_field_length:
+            text = f"{text[:self.max_field_length]}...(+{len(text) - self.max_field_length} chars)"
+        return text
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            rendered = " ".join(f"{key}={self._render_value(key, value)}" for key, value in fields.items())
+            line = f"{line} {rendered}"
+        return line
+
+
+def configure_logging(level: Optional[str] = None, sample_rates: Optional[Dict[str, float]] = None,
+                      rate_limits: Optional[Dict[str, float]] = None,
+                      max_field_length: Optional[int] = None) -> logging.handlers.QueueListener:
+    """Route all logging through a queue drained by a background thread.
+
+    Defaults come from LOG_LEVEL, LOG_SAMPLE_RATES and LOG_RATE_LIMITS
+    (``logger=value`` lists) and LOG_MAX_FIELD_LENGTH.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    if sample_rates is None:
+        sample_rates = _parse_overrides(os.getenv("LOG_SAMPLE_RATES"))
+    if rate_limits is None:
+        rate_limits = _parse_overrides(os.getenv("LOG_RATE_LIMITS"))
+    if max_field_length is None:
+        max_field_length = int(os.getenv("LOG_MAX_FIELD_LENGTH", DEFAULT_MAX_FIELD_LENGTH))
+
+    output = logging.StreamHandler()
+    output.setFormatter(StructuredFormatter(max_field_length=max_field_length))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+    if rate_limits:
+        queue_handler.addFilter(RateLimitFilter(rate_limits))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the background thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from starlette.requests import HTTPConnection
+
+from services.admission import OverloadedError
+from services.metrics import REGISTRY
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # optional; only needed for the shared Redis backend
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMITED_TOTAL = REGISTRY.counter(
+    "rate_limited_total", "Requests rejected by the per-client rate limiter", ["scope"])
+RATE_LIMIT_BACKEND_ERRORS_TOTAL = REGISTRY.counter(
+    "rate_limit_backend_errors_total", "Rate limit checks let through because the backend failed")
+
+API_KEY_HEADER = "x-api-key"
+
+
+class RateLimitedError(OverloadedError):
+    """Raised when one client has used up its request budget"""
+
+
+class MemoryBucketStore:
+    """Token buckets in a process-local LRU; each take is a dict lookup and a little arithmetic.
+
+    The event loop runs one take at a time, so no lock is needed. Idle
+    buckets fall off the LRU end once there are ``max_keys``; a bucket
+    idle that long has refilled anyway.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: float, cost: float = 1.0,
+                   now: Optional[float] = None) -> Tuple[bool, float]:
+        """Spend ``cost`` tokens if available; returns (allowed, seconds until it would be)"""
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [burst, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            return True, 0.0
+        return False, (cost - bucket[0]) / rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Refill and spend in one atomic step on the Redis server, timed by the server's clock
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+else
+  retry = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(retry)}
+"""
+
+
+class RedisBucketStore:
+    """Token buckets shared by every worker through Redis, one script call per take"""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        if redis_asyncio is None:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but the redis package is not installed")
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: float, cost: float = 1.0,
+                   now: Optional[float] = None) -> Tuple[bool, float]:
+        allowed, retry_after = await self._script(keys=[self.prefix + key], args=[rate, burst, cost])
+        return bool(allowed), float(retry_after)
+
+
+BucketStore = Union[MemoryBucketStore, RedisBucketStore]
+
+
+def client_key(connection: HTTPConnection) -> str:
+    """Who a request or WebSocket counts against: its API key if it sends one, else its IP"""
+    api_key = connection.headers.get(API_KEY_HEADER)
+    if api_key:
+        # Only a digest of the key is kept in the bucket store
+        return "key:" + hashlib.blake2b(api_key.encode("utf-8"), digest_size=12).hexdigest()
+    return "ip:" + (connection.client.host if connection.client else "unknown")
+
+
+class RateLimiter:
+    """Per-client token buckets: ``burst`` requests at once, refilled at ``rate`` per second.
+
+    When the backend fails the request is let through (and counted), so
+    an outage of the shared store does not take the API down with it.
+    """
+
+    def __init__(self, rate: float = 5.0, burst: float = 20.0, store: Optional[BucketStore] = None):
+        self.rate = rate
+        self.burst = burst
+        self.store = store or MemoryBucketStore()
+
+    @classmethod
+    def from_env(cls) -> Optional["RateLimiter"]:
+        """Limiter from RATE_LIMIT_* settings, or None when RATE_LIMIT_PER_SECOND is 0"""
+        rate = float(os.getenv("RATE_LIMIT_PER_SECOND", "5"))
+        if rate <= 0:
+            return None
+        redis_url = os.getenv("RATE_LIMIT_REDIS_URL")
+        return cls(rate=rate, burst=float(os.getenv("RATE_LIMIT_BURST", "20")),
+                   store=RedisBucketStore(redis_url) if redis_url else MemoryBucketStore())
+
+    async def check(self, key: str, scope: str, cost: float = 1.0):
+        """Spend ``cost`` from ``key``'s bucket or raise RateLimitedError"""
+        try:
+            allowed, retry_after = await self.store.take(key, self.rate, self.burst, cost)
+        except Exception as e:
+            RATE_LIMIT_BACKEND_ERRORS_TOTAL.inc()
+            logger.error(f"Rate limit backend failed, allowing request: {e}")
+            return
+        if not allowed:
+            RATE_LIMITED_TOTAL.labels(scope).inc()
+            raise RateLimitedError("Rate limit exceeded", retry_after=retry_after)
+
+
+class RateLimitMiddleware:
+    """ASGI middleware limiting HTTP requests under ``prefix`` per client.
+
+    Rejections are answered here with a small 429 and a Retry-After
+    header, before routing, body parsing or any agent work.
+    """
+
+    def __init__(self, app: Any, limiter: RateLimiter, prefix: str = "/api/"):
+        self.app = app
+        self.limiter = limiter
+        self.prefix = prefix
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any):
+        if scope["type"] == "http" and scope["path"].startswith(self.prefix):
+            try:
+                await self.limiter.check(client_key(HTTPConnection(scope)), "http")
+            except RateLimitedError as e:
+                body = json.dumps({"detail": str(e), "retryAfter": round(e.retry_after, 3)}).encode("utf-8")
+                await send({"type": "http.response.start", "status": 429, "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                    (b"retry-after", str(math.ceil(e.retry_after)).encode("ascii")),
+                ]})
+                await send({"type": "http.response.body", "body": body})
+                return
+        await self.app(scope, receive, send)
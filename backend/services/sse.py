@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from models.serialization import dumps_str
+from services.admission import OverloadedError
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT = ": keepalive\n\n"
+
+
+def format_event(data: str, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """Encode one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[Tuple[str, int]]:
+    """Split a ``<turn id>:<sequence>`` Last-Event-ID; None if absent or malformed"""
+    if not value:
+        return None
+    turn_id, _, seq = value.rpartition(":")
+    if not turn_id or not seq.isdigit():
+        return None
+    return turn_id, int(seq)
+
+
+class TurnStream:
+    """Buffered events of one chat turn, readable by any number of connections.
+
+    The turn runs independently of the HTTP connection and publishes into
+    this buffer, so a client that reconnects with Last-Event-ID replays what
+    it missed and then follows the live tail.
+    """
+
+    def __init__(self, turn_id: str):
+        self.turn_id = turn_id
+        self.events: List[Tuple[str, str]] = []
+        self.done = False
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def publish(self, event: str, data: Dict[str, Any]):
+        self.events.append((event, dumps_str(data)))
+        self._notify()
+
+    def close(self):
+        self.done = True
+        self.finished_at = time.monotonic()
+        self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def read(self, after: int = 0, heartbeat: float = 15.0) -> AsyncIterator[str]:
+        """Yield encoded events after sequence ``after``, with heartbeat comments while idle"""
+        position = after
+        while True:
+            while position < len(self.events):
+                event, data = self.events[position]
+                position += 1
+                yield format_event(data, event=event, event_id=f"{self.turn_id}:{position}")
+            if self.done:
+                return
+            changed = self._changed
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield HEARTBEAT
+
+
+class TurnStreamRegistry:
+    """Recent turn streams kept for Last-Event-ID resume, bounded by count and age.
+
+    Only finished streams are evicted to make room; a live stream still has
+    a turn publishing into it and readers following it. When every slot is
+    live, ``create`` raises OverloadedError instead.
+    """
+
+    def __init__(self, max_streams: int = 1000, ttl: float = 300.0):
+        self.max_streams = max_streams
+        self.ttl = ttl
+        self._streams: "OrderedDict[str, TurnStream]" = OrderedDict()
+
+    def create(self) -> TurnStream:
+        self._prune()
+        if len(self._streams) >= self.max_streams:
+            raise OverloadedError(f"All {self.max_streams} turn streams are live")
+        stream = TurnStream(uuid.uuid4().hex)
+        self._streams[stream.turn_id] = stream
+        return stream
+
+    def get(self, turn_id: str) -> Optional[TurnStream]:
+        return self._streams.get(turn_id)
+
+    def _prune(self):
+        now = time.monotonic()
+        expired = [
+            turn_id for turn_id, stream in self._streams.items()
+            if stream.done and now - stream.finished_at > self.ttl
+        ]
+        for turn_id in expired:
+            del self._streams[turn_id]
+        if len(self._streams) < self.max_streams:
+            return
+        finished = [turn_id for turn_id, stream in self._streams.items() if stream.done]
+        for turn_id in finished[:len(self._streams) - self.max_streams + 1]:
+            del self._streams[turn_id]
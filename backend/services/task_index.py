@@ -0,0 +1,344 @@
+import heapq
+import logging
+import sys
+import time
+from array import array
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from services.metrics import REGISTRY
+from services.tokenizer import STOP_WORDS, iter_words
+
+logger = logging.getLogger(__name__)
+
+TASK_SEARCH_SECONDS = REGISTRY.histogram(
+    "task_search_seconds", "Time to answer a task search from the index",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1))
+
+# A posting list switches to a bitmap once it holds at least 1 in DENSE_RATIO of all
+# tasks ever indexed, where a bit per task costs less than 4 bytes per entry
+DENSE_RATIO = 32
+DENSE_MIN_ENTRIES = 1024
+# A query's last word also matches longer words starting with it: the most common
+# MAX_PREFIX_TERMS of the first MAX_PREFIX_SCAN in alphabetical order
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_TERMS = 64
+MAX_PREFIX_SCAN = 1024
+# Below this many entries sparse postings are turned into a bitmap by a plain loop
+SCATTER_MIN_ENTRIES = 2048
+# Deepest result a page may reach (offset + limit)
+MAX_RESULT_WINDOW = 10_000
+
+# Posting keys: every task, words anywhere, words in the title, exact tags, status and assignee
+_ALL = "*"
+_WORD = "w:"
+_TITLE = "t:"
+_TAG = "tag:"
+_STATUS = "status:"
+_ASSIGNEE = "assignee:"
+
+
+class Postings:
+    """Ordinals of the tasks holding one term: a sorted array while sparse, a bitmap once dense"""
+
+    __slots__ = ("ordinals", "bits", "count")
+
+    def __init__(self):
+        self.ordinals: Optional[array] = array("I")
+        self.bits: Optional[bytearray] = None
+        self.count = 0
+
+    def add(self, ordinal: int, capacity: int):
+        if self.bits is not None:
+            byte = ordinal >> 3
+            if byte >= len(self.bits):
+                self.bits.extend(bytes(max(byte + 1, 2 * len(self.bits)) - len(self.bits)))
+            self.bits[byte] |= 1 << (ordinal & 7)
+        elif not self.ordinals or self.ordinals[-1] < ordinal:
+            # New tasks get the highest ordinal yet, so this is the usual case
+            self.ordinals.append(ordinal)
+        else:
+            insort(self.ordinals, ordinal)
+        self.count += 1
+        if self.bits is None and self.count >= DENSE_MIN_ENTRIES and self.count * DENSE_RATIO >= capacity:
+            self.bits = bytearray(self._to_bytes((capacity >> 3) + 1))
+            self.ordinals = None
+
+    def discard(self, ordinal: int):
+        if self.bits is not None:
+            self.bits[ordinal >> 3] &= ~(1 << (ordinal & 7)) & 0xFF
+        else:
+            position = bisect_left(self.ordinals, ordinal)
+            del self.ordinals[position]
+        self.count -= 1
+
+    def _to_bytes(self, size: int) -> bytearray:
+        bits = bytearray(size)
+        for ordinal in self.ordinals:
+            bits[ordinal >> 3] |= 1 << (ordinal & 7)
+        return bits
+
+
+def _scatter(arrays: List[array]) -> int:
+    """Integer bitmap with a bit set for every ordinal in the given sorted arrays"""
+    size = max(ordinals[-1] for ordinals in arrays) + 1
+    if sum(len(ordinals) for ordinals in arrays) < SCATTER_MIN_ENTRIES:
+        buffer = bytearray((size >> 3) + 1)
+        for ordinals in arrays:
+            for ordinal in ordinals:
+                buffer[ordinal >> 3] |= 1 << (ordinal & 7)
+        return int.from_bytes(buffer, "little")
+    import numpy as np
+
+    # Setting tens of thousands of bits is a vectorized scatter, not a Python loop
+    mask = np.zeros(size, dtype=bool)
+    for ordinals in arrays:
+        mask[np.frombuffer(ordinals, dtype=np.uint32)] = True
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+
+def _union(postings: List[Postings]) -> int:
+    """The tasks in any of the postings as one integer bitmap, so clauses combine with C-speed ``&``"""
+    bits = 0
+    for entry in postings:
+        if entry.bits is not None:
+            bits |= int.from_bytes(entry.bits, "little")
+    sparse = [entry.ordinals for entry in postings if entry.bits is None and entry.count]
+    if sparse:
+        bits |= _scatter(sparse)
+    return bits
+
+
+def _newest_first(bits: int, skip: int, take: int) -> Iterator[int]:
+    """Set bits of ``bits`` from the highest down, after skipping ``skip`` of them"""
+    if take <= 0 or not bits:
+        return
+    words = memoryview(bits.to_bytes((bits.bit_length() + 63) // 64 * 8, sys.byteorder)).cast("Q")
+    for position in range(len(words) - 1, -1, -1):
+        word = words[position]
+        if not word:
+            continue
+        if skip:
+            ones = word.bit_count()
+            if ones <= skip:
+                skip -= ones
+                continue
+        while word:
+            high = word.bit_length() - 1
+            word ^= 1 << high
+            if skip:
+                skip -= 1
+                continue
+            yield position * 64 + high
+            take -= 1
+            if not take:
+                return
+
+
+def _words(text: Optional[str]) -> Iterator[str]:
+    return (word for word in iter_words(text or "") if word not in STOP_WORDS)
+
+
+class TaskIndex:
+    """Inverted index over task title, description and tags, updated in place on every change.
+
+    Each task gets an ordinal in creation order. Every term (a word, a
+    title word, a tag, a status, an assignee) has postings of ordinals,
+    sparse arrays for rare terms and bitmaps for common ones. A search
+    turns each clause into an integer bitmap and intersects them with
+    ``&``, rarest first, so a query costs a few C-level passes over one
+    bit per task plus the entries of its rare terms. Results are ranked
+    with every query word in the title first, then newest first.
+    """
+
+    def __init__(self):
+        self._ordinals: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        # Posting keys per ordinal, so a task can be removed without being re-tokenized
+        self._keys: List[Optional[Tuple[str, ...]]] = []
+        self._postings: Dict[str, Postings] = {}
+        # Sorted distinct words, for prefix lookups
+        self._vocabulary: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._ordinals
+
+    @staticmethod
+    def _task_keys(task: Dict[str, Any]) -> Tuple[str, ...]:
+        tags = [str(tag).lower() for tag in task.get("tags") or []]
+        title = set(_words(task.get("title")))
+        words = title.union(_words(task.get("description")), *(_words(tag) for tag in tags))
+        keys = [_ALL]
+        keys.extend(_WORD + word for word in words)
+        keys.extend(_TITLE + word for word in title)
+        keys.extend(_TAG + tag for tag in set(tags))
+        if task.get("status"):
+            keys.append(_STATUS + str(task["status"]).lower())
+        if task.get("assignedTo"):
+            keys.append(_ASSIGNEE + str(task["assignedTo"]).lower())
+        return tuple(keys)
+
+    def add(self, task_id: str, task: Dict[str, Any]):
+        """Index a task, or re-index it in place (keeping its ordinal) if it is already indexed"""
+        ordinal = self._ordinals.get(task_id)
+        if ordinal is None:
+            ordinal = len(self._ids)
+            self._ordinals[task_id] = ordinal
+            self._ids.append(task_id)
+            self._keys.append(())
+        old = set(self._keys[ordinal])
+        keys = self._task_keys(task)
+        capacity = len(self._ids)
+        for key in keys:
+            if key in old:
+                old.discard(key)
+                continue
+            postings = self._postings.get(key)
+            if postings is None:
+                postings = self._postings[key] = Postings()
+                if key.startswith(_WORD):
+                    insort(self._vocabulary, key[len(_WORD):])
+            postings.add(ordinal, capacity)
+        for key in old:
+            self._discard(key, ordinal)
+        self._keys[ordinal] = keys
+
+    def remove(self, task_id: str) -> bool:
+        ordinal = self._ordinals.pop(task_id, None)
+        if ordinal is None:
+            return False
+        for key in self._keys[ordinal]:
+            self._discard(key, ordinal)
+        # Ordinals are not reused, so newest-first stays creation order
+        self._ids[ordinal] = None
+        self._keys[ordinal] = None
+        return True
+
+    def _discard(self, key: str, ordinal: int):
+        postings = self._postings[key]
+        postings.discard(ordinal)
+        if not postings.count:
+            del self._postings[key]
+            if key.startswith(_WORD):
+                word = key[len(_WORD):]
+                del self._vocabulary[bisect_left(self._vocabulary, word)]
+
+    def _expand(self, word: str) -> List[str]:
+        """The word itself and, for a long enough prefix, the indexed words it starts"""
+        if len(word) < MIN_PREFIX_LENGTH:
+            return [word]
+        start = bisect_left(self._vocabulary, word)
+        matches = []
+        for candidate in self._vocabulary[start:start + MAX_PREFIX_SCAN]:
+            if not candidate.startswith(word):
+                break
+            matches.append(candidate)
+        if len(matches) > MAX_PREFIX_TERMS:
+            matches = heapq.nlargest(MAX_PREFIX_TERMS, matches, key=lambda match: self._postings[_WORD + match].count)
+        return matches or [word]
+
+    def _clause(self, keys: Sequence[str]) -> List[Postings]:
+        return [self._postings[key] for key in keys if key in self._postings]
+
+    def search(self, text: str = "", tags: Iterable[str] = (), status: Optional[str] = None,
+               assignee: Optional[str] = None, limit: int = 20, offset: int = 0,
+               prefix: bool = True) -> Tuple[List[str], int]:
+        """Ids of the tasks matching every query word and filter, best first, and how many match.
+
+        Query words match title, description and tag words; with ``prefix``
+        the last one also matches words it starts, for search as you type.
+        """
+        started = time.perf_counter()
+        words = list(dict.fromkeys(_words(text)))
+        word_keys = [self._expand(word) if prefix and index == len(words) - 1 else [word]
+                     for index, word in enumerate(words)]
+        clauses = [self._clause([_WORD + word for word in keys]) for keys in word_keys]
+        clauses.extend(self._clause([_TAG + str(tag).lower()]) for tag in dict.fromkeys(tags))
+        if status:
+            clauses.append(self._clause([_STATUS + status.lower()]))
+        if assignee:
+            clauses.append(self._clause([_ASSIGNEE + assignee.lower()]))
+        if not clauses:
+            clauses.append(self._clause([_ALL]))
+
+        # Rarest clause first; an empty one ends the search before any other bitmap is built
+        clauses.sort(key=lambda clause: sum(entry.count for entry in clause))
+        matches = _union(clauses[0])
+        for clause in clauses[1:]:
+            if not matches:
+                break
+            matches &= _union(clause)
+        total = matches.bit_count()
+
+        in_title = matches
+        for keys in word_keys:
+            if not in_title:
+                break
+            in_title &= _union(self._clause([_TITLE + word for word in keys]))
+        offset = min(offset, MAX_RESULT_WINDOW)
+        limit = max(0, min(limit, MAX_RESULT_WINDOW - offset))
+        ordinals: List[int] = []
+        for tier in (in_title, matches & ~in_title):
+            count = tier.bit_count()
+            if offset >= count:
+                offset -= count
+                continue
+            ordinals.extend(_newest_first(tier, offset, limit - len(ordinals)))
+            offset = 0
+            if len(ordinals) >= limit:
+                break
+        TASK_SEARCH_SECONDS.observe(time.perf_counter() - started)
+        return [self._ids[ordinal] for ordinal in ordinals], total
+
+
+class TaskStore:
+    """Tasks by id in creation order, with the search index kept in step on every change"""
+
+    def __init__(self, tasks: Iterable[Dict[str, Any]] = ()):
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.index = TaskIndex()
+        # Bumped on every change, so cached task listings know when to rebuild
+        self.version = 0
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self.tasks.get(task_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        return list(self.tasks.values())
+
+    def add(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        self.tasks[task["id"]] = task
+        self.index.add(task["id"], task)
+        self.version += 1
+        return task
+
+    def update(self, task_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply ``changes`` to a task and re-index it; None if there is no such task"""
+        task = self.tasks.get(task_id)
+        if task is None:
+            return None
+        task = {**task, **changes, "id": task_id}
+        self.tasks[task_id] = task
+        self.index.add(task_id, task)
+        self.version += 1
+        return task
+
+    def delete(self, task_id: str) -> bool:
+        if self.tasks.pop(task_id, None) is None:
+            return False
+        self.index.remove(task_id)
+        self.version += 1
+        return True
+
+    def search(self, text: str = "", tags: Iterable[str] = (), status: Optional[str] = None,
+               assignee: Optional[str] = None, limit: int = 20, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        task_ids, total = self.index.search(text, tags, status, assignee, limit, offset)
+        return [self.tasks[task_id] for task_id in task_ids], total
@@ -0,0 +1,129 @@
+import re
+from collections import Counter, OrderedDict
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from services.metrics import record_cache_lookup
+
+# Words too common to say anything about a message (the summarizer's list, which adds pronouns and
+# demonstratives to what keyword extraction used to drop)
+STOP_WORDS = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an', 'as', 'is',
+    'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'can', 'this', 'that', 'it', 'we', 'you', 'your', 'our', 'i',
+})
+MIN_KEYWORD_LENGTH = 3
+
+WORD_PATTERN = re.compile(r'\w+')
+_TRAILING_WORD = re.compile(r'\w+$')
+
+
+def is_keyword(word: str) -> bool:
+    return len(word) >= MIN_KEYWORD_LENGTH and word not in STOP_WORDS
+
+
+def iter_words(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Lowercased words of a text, or of a stream of text chunks, one at a time.
+
+    Never builds the full word list, so very large inputs cost memory in
+    proportion to their vocabulary rather than their length. Words split
+    across chunk boundaries are joined back together.
+    """
+    if isinstance(source, str):
+        for match in WORD_PATTERN.finditer(source):
+            yield match.group().lower()
+        return
+    carry = ""
+    for chunk in source:
+        chunk = carry + chunk
+        # A word touching the end of the chunk may continue in the next one
+        trailing = _TRAILING_WORD.search(chunk)
+        carry = trailing.group() if trailing else ""
+        for match in WORD_PATTERN.finditer(chunk, 0, trailing.start() if trailing else len(chunk)):
+            yield match.group().lower()
+    if carry:
+        yield carry.lower()
+
+
+def keyword_counts(source: Union[str, Iterable[str]]) -> Counter:
+    """How often each keyword appears, streaming over ``source``"""
+    return Counter(word for word in iter_words(source) if is_keyword(word))
+
+
+class Tokens:
+    """A message tokenized once and shared by everything that reads it in a turn.
+
+    ``lower`` serves substring rules, ``keywords`` holds the distinct
+    keywords in first-seen order and ``counts`` their frequencies. Each is
+    computed on first use, so routing a huge message only pays for
+    lowercasing it; the full word list is only built if ``words`` is read.
+    """
+    __slots__ = ("text", "lower", "_counts", "_keywords", "_words")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = text.lower()
+        self._counts: Optional[Counter] = None
+        self._keywords: Optional[Tuple[str, ...]] = None
+        self._words: Optional[Tuple[str, ...]] = None
+
+    @property
+    def counts(self) -> Counter:
+        if self._counts is None:
+            # Streams over the text without building the word list
+            self._counts = Counter(word for word in map(re.Match.group, WORD_PATTERN.finditer(self.lower))
+                                   if is_keyword(word))
+        return self._counts
+
+    @property
+    def keywords(self) -> Tuple[str, ...]:
+        if self._keywords is None:
+            # Counter keeps insertion order, i.e. the order keywords first appear
+            self._keywords = tuple(self.counts)
+        return self._keywords
+
+    @property
+    def words(self) -> Tuple[str, ...]:
+        if self._words is None:
+            self._words = tuple(WORD_PATTERN.findall(self.lower))
+        return self._words
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+
+class TokenCache:
+    """LRU of tokenized texts bounded by entry count and total characters"""
+
+    def __init__(self, max_entries: int = 256, max_chars: int = 8_000_000):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.chars = 0
+        self._entries: "OrderedDict[str, Tokens]" = OrderedDict()
+
+    def get(self, text: str) -> Tokens:
+        tokens = self._entries.get(text)
+        if tokens is not None:
+            self._entries.move_to_end(text)
+            record_cache_lookup("tokens", True)
+            return tokens
+        record_cache_lookup("tokens", False)
+        tokens = Tokens(text)
+        if len(text) <= self.max_chars:
+            self._entries[text] = tokens
+            self.chars += len(text)
+            while len(self._entries) > self.max_entries or self.chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self.chars -= len(evicted)
+        return tokens
+
+    def clear(self):
+        self._entries.clear()
+        self.chars = 0
+
+
+_cache = TokenCache()
+
+
+def tokenize(text: str) -> Tokens:
+    """Tokens for ``text``, computed once and shared while it stays in the cache"""
+    return _cache.get(text)
@@ -0,0 +1,182 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class _NoopSpan:
+    """Span stand-in used when a trace is not sampled"""
+
+    sampled = False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _UnsampledRoot(_NoopSpan):
+    """Marks the context as unsampled so child spans stay no-ops"""
+
+    __slots__ = ("_token",)
+
+    def __enter__(self):
+        self._token = _current_span.set(NOOP_SPAN)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        return False
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    sampled = True
+
+    __slots__ = ("tracer", "trace_id", "span_id", "parent_id", "name", "attributes",
+                 "start_time", "duration", "status", "_trace", "_started", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.attributes = attributes
+        self.status = "ok"
+        self.duration = 0.0
+        if parent is None:
+            self.trace_id = uuid.uuid4().hex
+            self.parent_id = None
+            self._trace: List["Span"] = []
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+            self._trace = parent._trace
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._started
+        if exc_type is not None:
+            self.status = "error"
+            self.attributes["error"] = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self._trace.append(self)
+        if self.parent_id is None:
+            self.tracer._finish_trace(self)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_time,
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes
+        }
+
+
+class JsonlTraceExporter:
+    """Writes finished traces to a JSONL file from a background thread"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._queue: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Dict[str, Any]):
+        self._queue.put(trace)
+
+    def _run(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                trace = self._queue.get()
+                if trace is None:
+                    break
+                f.write(json.dumps(trace, default=str) + "\n")
+                # Batch writes while the queue has more work, flush when idle
+                if self._queue.empty():
+                    f.flush()
+
+    def close(self, timeout: float = 2.0):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+class Tracer:
+    """Creates spans and exports sampled traces.
+
+    With a sample rate of 0 every ``span()`` call returns a shared no-op
+    object, so instrumentation costs one attribute check.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, exporter: Optional[JsonlTraceExporter] = None):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    def span(self, name: str, **attributes: Any):
+        if self.sample_rate <= 0:
+            return NOOP_SPAN
+        parent = _current_span.get()
+        if parent is None:
+            if random.random() >= self.sample_rate:
+                return _UnsampledRoot()
+        elif not parent.sampled:
+            return NOOP_SPAN
+        return Span(self, name, parent, attributes)
+
+    def current_span(self):
+        return _current_span.get() or NOOP_SPAN
+
+    def _finish_trace(self, root: Span):
+        if self.exporter is None:
+            return
+        self.exporter.export({
+            "trace_id": root.trace_id,
+            "root": root.name,
+            "duration_ms": round(root.duration * 1000, 3),
+            "spans": [span.to_dict() for span in root._trace]
+        })
+
+
+tracer = Tracer()
+
+
+def configure_tracing(sample_rate: Optional[float] = None, export_path: Optional[str] = None) -> Tracer:
+    """Configure the global tracer from arguments or TRACE_SAMPLE_RATE / TRACE_EXPORT_PATH"""
+    if sample_rate is None:
+        sample_rate = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+    tracer.sample_rate = sample_rate
+    if sample_rate > 0 and tracer.exporter is None:
+        tracer.exporter = JsonlTraceExporter(export_path or os.getenv("TRACE_EXPORT_PATH", "traces.jsonl"))
+        atexit.register(tracer.exporter.close)
+        logger.info(f"Tracing enabled: sample_rate={sample_rate}, exporting to {tracer.exporter.path}")
+    return tracer
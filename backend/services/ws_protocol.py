@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from models.serialization import dumps_str
+from services.metrics import REGISTRY
+
+try:
+    import msgpack
+except ImportError:  # optional; msgpack subprotocols are simply not offered
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+WS_BYTES_SENT_TOTAL = REGISTRY.counter(
+    "ws_bytes_sent_total", "Encoded WebSocket payload bytes sent", ["protocol"])
+WS_FRAMES_SENT_TOTAL = REGISTRY.counter(
+    "ws_frames_sent_total", "WebSocket frames sent", ["protocol"])
+
+DICTIONARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ws_dictionary.bin")
+# Trailer emitted by a sync flush; stripped on the wire as in permessage-deflate
+_SYNC_TRAILER = b"\x00\x00\xff\xff"
+
+Frame = Dict[str, Any]
+Payload = Union[str, bytes]
+
+
+def _load_dictionary() -> bytes:
+    try:
+        with open(DICTIONARY_PATH, "rb") as f:
+            return f.read()
+    except OSError:
+        logger.warning("WebSocket compression dictionary not found at %s", DICTIONARY_PATH)
+        return b""
+
+
+PRESET_DICTIONARY = _load_dictionary()
+
+
+class FrameCodec:
+    """Encodes outgoing frames and decodes incoming ones for one connection"""
+
+    name = "json"
+    binary = False
+
+    def encode(self, frame: Frame) -> Payload:
+        return dumps_str(frame)
+
+    def decode(self, data: Payload) -> Frame:
+        return json.loads(data)
+
+
+class MsgpackCodec(FrameCodec):
+    name = "msgpack"
+    binary = True
+
+    def encode(self, frame: Frame) -> bytes:
+        return msgpack.packb(frame, use_bin_type=True)
+
+    def decode(self, data: Payload) -> Frame:
+        if isinstance(data, str):
+            return json.loads(data)
+        return msgpack.unpackb(data, raw=False)
+
+
+class DeflateCodec(FrameCodec):
+    """Wraps another codec in a per-connection deflate stream primed with a preset dictionary.
+
+    Like permessage-deflate with context takeover, each frame is a sync
+    flush of one long-lived stream, so repeated keys and template text are
+    back-references; the dictionary makes that true from the first frame.
+    """
+
+    binary = True
+
+    def __init__(self, inner: FrameCodec, dictionary: bytes = PRESET_DICTIONARY, level: int = 6):
+        self.inner = inner
+        self.name = f"{inner.name}.deflate"
+        options = {"zdict": dictionary} if dictionary else {}
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, **options)
+        self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS, **options)
+
+    def encode(self, frame: Frame) -> bytes:
+        data = self.inner.encode(frame)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        compressed = self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return compressed[:-len(_SYNC_TRAILER)]
+
+    def decode(self, data: Payload) -> Frame:
+        if isinstance(data, str):
+            return json.loads(data)
+        return self.inner.decode(self._decompressor.decompress(data + _SYNC_TRAILER))
+
+
+def _available_codecs() -> Dict[str, Callable[[], FrameCodec]]:
+    codecs: Dict[str, Callable[[], FrameCodec]] = {"json": FrameCodec}
+    if msgpack is not None:
+        codecs["msgpack"] = MsgpackCodec
+        codecs["msgpack.deflate"] = lambda: DeflateCodec(MsgpackCodec())
+    codecs["json.deflate"] = lambda: DeflateCodec(FrameCodec())
+    return codecs
+
+
+CODECS = _available_codecs()
+
+
+def negotiate(offered: List[str]) -> Optional[FrameCodec]:
+    """Codec for the first subprotocol the client offered that we support; None means plain JSON"""
+    for name in offered:
+        factory = CODECS.get(name)
+        if factory is not None:
+            return factory()
+    return None
+
+
+def record_sent(codec: FrameCodec, payload: Payload):
+    WS_FRAMES_SENT_TOTAL.labels(codec.name).inc()
+    WS_BYTES_SENT_TOTAL.labels(codec.name).inc(len(payload))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test admission control, bulkheads and how shed turns reach clients
+"""
+import asyncio
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.admission import AdmissionController, Bulkhead, OverloadedError
+
+def test_bulkhead_rejects_when_queue_full():
+    """Callers queue up to max_queue; the next one is rejected at once"""
+    print("Testing bulkheads...")
+    bulkhead = Bulkhead("test_bulkhead", max_concurrency=1, max_queue=1)
+    release = None
+    outcomes = []
+
+    async def call(name):
+        try:
+            async with bulkhead:
+                outcomes.append(name)
+                await release.wait()
+        except OverloadedError as e:
+            outcomes.append(f"{name} rejected: {e}")
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        first = asyncio.create_task(call("first"))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(call("queued"))
+        await asyncio.sleep(0)
+        assert (bulkhead.active, bulkhead.waiting) == (1, 1)
+        await call("third")
+        release.set()
+        await asyncio.gather(first, queued)
+
+    asyncio.run(run())
+    assert outcomes == ["first", "third rejected: Agent test_bulkhead is at capacity", "queued"]
+    assert (bulkhead.active, bulkhead.waiting) == (0, 0)
+    print("✓ One running, one queued, the third rejected")
+
+def test_sheds_at_max_in_flight():
+    """No more than max_in_flight turns are admitted"""
+    print("\nTesting the in-flight limit...")
+    controller = AdmissionController(max_in_flight=2)
+    admitted = [controller.acquire(), controller.acquire()]
+    try:
+        controller.acquire()
+        assert False, "expected OverloadedError"
+    except OverloadedError as e:
+        assert str(e) == "Too many requests in flight"
+        assert e.retry_after == 1.0
+    controller.release(admitted.pop())
+    admitted.append(controller.acquire())
+    for admitted_at in admitted:
+        controller.release(admitted_at)
+    assert controller.in_flight == 0
+    print("✓ Third concurrent turn shed; admitted again after a release")
+
+def test_sheds_on_latency_above_min_in_flight():
+    """Slow recent turns shed new ones only once more than min_in_flight are running"""
+    print("\nTesting latency shedding...")
+    controller = AdmissionController(latency_threshold=2.0, min_in_flight=2, smoothing=1.0)
+    # A turn that took 4.2s pushes the average over the threshold
+    controller.release(controller.acquire() - 4.2)
+    assert controller.latency_ewma > 2.0
+
+    admitted = [controller.acquire(), controller.acquire(), controller.acquire()]
+    try:
+        controller.acquire()
+        assert False, "expected OverloadedError"
+    except OverloadedError as e:
+        assert str(e) == "Server is overloaded"
+        # Retry-After is the smoothed latency rounded up
+        assert e.retry_after == 5
+    for admitted_at in admitted:
+        controller.release(admitted_at)
+    assert controller.latency_ewma < 2.0
+    controller.acquire()
+    print("✓ Shed above min_in_flight while slow, with Retry-After 5s")
+
+def test_endpoints_report_shed_turns():
+    """HTTP answers 429 with Retry-After; the WebSocket sends an overloaded frame"""
+    print("\nTesting shed turns at the endpoints...")
+    os.environ.setdefault("RATE_LIMIT_PER_SECOND", "0")
+    from fastapi.testclient import TestClient
+    import main
+
+    previous = main.agent_manager.admission
+    main.agent_manager.admission = AdmissionController(max_in_flight=0)
+    main.agent_manager.admission.latency_ewma = 2.5
+    try:
+        client = TestClient(main.app)
+        response = client.post("/api/chat/message", json={"content": "I have an idea", "agents": ["pm"]})
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "3"
+        assert response.json()["detail"] == "Too many requests in flight"
+
+        batch = client.post("/api/chat/batch", json={"messages": [{"content": "I have an idea", "agents": ["pm"]}]})
+        assert batch.status_code == 429 and batch.headers["retry-after"] == "3"
+
+        with client.websocket_connect("/ws") as websocket:
+            websocket.send_json({"type": "user_message", "message": "I have an idea", "agents": ["pm"]})
+            frames = [websocket.receive_json()]
+            while frames[-1]["type"] != "overloaded":
+                frames.append(websocket.receive_json())
+        assert frames[-1]["retryAfter"] == 3
+    finally:
+        main.agent_manager.admission = previous
+    print("✓ 429 with Retry-After: 3 over HTTP, overloaded frame over WebSocket")
+
+if __name__ == "__main__":
+    print("Testing admission control...")
+
+    test_bulkhead_rejects_when_queue_full()
+    test_sheds_at_max_in_flight()
+    test_sheds_on_latency_above_min_in_flight()
+    test_endpoints_report_shed_turns()
+
+    print("\n✓ All admission tests passed!")
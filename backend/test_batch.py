@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test shared intent routing and the batch chat path
+"""
+import asyncio
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.latency import ZeroLatency
+from agents.agent_manager import AgentManager
+from agents.routing import IntentRouter
+
+MESSAGES = [
+    "I have an idea for a fintech product",
+    "What tech stack and architecture should we use?",
+    "Who are our competitors and how should we price it?",
+    "Help me write the pitch deck",
+    "Plan the first sprint and timeline",
+    "Tell me something",
+]
+
+def test_router_matches_agent_routing():
+    """The shared keyword router picks the same intent as each agent on its own"""
+    print("Testing shared intent routing...")
+    manager = AgentManager(latency_model=ZeroLatency())
+    router = IntentRouter(manager.agents)
+    for message in MESSAGES:
+        routed = router.route(message)
+        for agent_id, agent in manager.agents.items():
+            assert routed[agent_id] == agent.route_intent(message), (message, agent_id)
+    assert router.route("what tech stack?", ['tech']) == {'tech': 'recommend_tech_stack'}
+    assert manager.router.route("what tech stack?", ['tech']) == {'tech': 'recommend_tech_stack'}
+    print(f"✓ Router agrees with every agent on {len(MESSAGES)} messages")
+
+def test_batch_dedupes_and_streams():
+    """Duplicates run once and every index gets a result"""
+    print("\nTesting batch processing...")
+    manager = AgentManager(latency_model=ZeroLatency())
+    calls = []
+    agent = manager.agents['pm']
+    original = agent.process_message
+
+    async def process_message(message, intent=None):
+        calls.append((message, intent))
+        return await original(message, intent=intent)
+
+    agent.process_message = process_message
+    items = [(MESSAGES[i % 3], ['pm', 'market']) for i in range(9)]
+
+    async def run():
+        return [result async for result in manager.process_batch(items, max_parallel=2)]
+
+    results = asyncio.run(run())
+    assert len(results) == 3
+    assert sorted(index for indices, _, _ in results for index in indices) == list(range(9))
+    assert all(error is None and len(responses) == 2 for _, responses, error in results)
+    assert len(calls) == 3
+    assert calls[0][1] == 'analyze_product_idea'
+    assert manager.admission.in_flight == 0
+    print(f"✓ {len(items)} messages answered with {len(calls)} agent calls")
+
+def test_long_batch_does_not_shed_chat_turns():
+    """Slow bulk turns hold in-flight slots but leave the latency average to interactive turns"""
+    print("\nTesting batch admission...")
+    manager = AgentManager(latency_model=ZeroLatency())
+    manager.admission.latency_threshold = 0.05
+    manager.admission.min_in_flight = 1
+    agent = manager.agents['pm']
+    original = agent.process_message
+    peak = []
+
+    async def slow_process_message(message, intent=None):
+        if message.startswith("bulk"):
+            peak.append(manager.admission.in_flight)
+            await asyncio.sleep(0.2)
+        return await original(message, intent=intent)
+
+    agent.process_message = slow_process_message
+    items = [(f"bulk idea {i}", ['pm']) for i in range(4)]
+
+    async def run():
+        batch = asyncio.create_task(_drain(manager.process_batch(items, max_parallel=2)))
+        await asyncio.sleep(0.05)
+        # Two bulk turns are in flight (over min_in_flight), yet chat turns are still admitted
+        during = await manager.process_user_message("I have an idea", ['pm'])
+        results = await batch
+        after = await manager.process_user_message("I have an idea", ['pm'])
+        return during, results, after
+
+    during, results, after = asyncio.run(run())
+    assert len(during) == 1 and len(after) == 1
+    assert all(error is None for _, _, error in results)
+    assert max(peak) >= 2
+    assert manager.admission.latency_ewma < manager.admission.latency_threshold
+    assert manager.admission.in_flight == 0
+    print("✓ 0.8s of bulk work left chat turns admitted")
+
+async def _drain(results):
+    return [result async for result in results]
+
+if __name__ == "__main__":
+    print("Testing batch chat...")
+
+    test_router_matches_agent_routing()
+    test_batch_dedupes_and_streams()
+    test_long_batch_does_not_shed_chat_turns()
+
+    print("\n✓ All batch tests passed!")
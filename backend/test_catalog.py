@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test versioned catalogs, ETags and conditional responses
+"""
+import asyncio
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.catalog import KeyedCache, KeyedResourceCache, VersionedResource, etag_matches
+from services.latency import ZeroLatency
+from agents.agent_manager import AgentManager
+
+def test_etag_matching():
+    """If-None-Match handles lists, weak tags and *"""
+    print("Testing If-None-Match parsing...")
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('"x", W/"a"', '"a"')
+    assert etag_matches('*', '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
+    print("✓ ETag matching works")
+
+def test_catalog_rebuilds_only_on_toggle():
+    """The agent catalog keeps its bytes until a toggle bumps the version"""
+    print("\nTesting the versioned agent catalog...")
+    manager = AgentManager(latency_model=ZeroLatency())
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"agents": manager.list_agents()}
+
+    catalog = VersionedResource("test_agent_catalog", build, lambda: manager.catalog_version)
+    first = catalog.get()
+    assert catalog.get() is first
+    asyncio.run(manager.toggle_agent('pm'))
+    second = catalog.get()
+    assert second.etag != first.etag
+    assert len(builds) == 2
+    print(f"✓ Catalog rebuilt {len(builds)} times over 3 reads")
+
+def test_keyed_cache_shares_builds():
+    """Concurrent misses for one key run a single build"""
+    print("\nTesting the keyed cache...")
+    calls = []
+
+    async def build(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return {"query": key}
+
+    async def run():
+        cache = KeyedResourceCache("test_research", build, ttl=60)
+        bodies = await asyncio.gather(*[cache.get("ai") for _ in range(5)])
+        again = await cache.get("ai")
+        return bodies, again
+
+    bodies, again = asyncio.run(run())
+    assert calls == ["ai"]
+    assert len({body.etag for body in bodies}) == 1
+    assert again.etag == bodies[0].etag
+    print("✓ Five concurrent requests shared one build")
+
+def test_invalidate_discards_in_flight_build():
+    """A build that started before invalidate is not cached or shared afterwards"""
+    print("\nTesting invalidation during a build...")
+    version = {"value": 1}
+
+    async def build(key):
+        seen = version["value"]
+        # The stale build outlives the fresh one, so it would overwrite it if stored
+        await asyncio.sleep(0.1 if seen == 1 else 0.01)
+        return seen
+
+    async def run():
+        cache = KeyedCache("test_generation", build, ttl=60)
+        stale = asyncio.create_task(cache.get("catalog"))
+        await asyncio.sleep(0.01)
+        version["value"] = 2
+        cache.invalidate("catalog")
+        fresh = await cache.get("catalog")
+        stale = await stale
+        return stale, fresh, await cache.get("catalog")
+
+    stale, fresh, cached = asyncio.run(run())
+    assert stale == 1
+    assert fresh == 2 and cached == 2
+    print("✓ The stale build was not stored")
+
+if __name__ == "__main__":
+    print("Testing catalogs...")
+
+    test_etag_matching()
+    test_catalog_rebuilds_only_on_toggle()
+    test_keyed_cache_shares_builds()
+    test_invalidate_discards_in_flight_build()
+
+    print("\n✓ All catalog tests passed!")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test per-agent deadlines, late follow-ups and hedged retries
+"""
+import asyncio
+import sys
+import os
+import time
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.latency import ZeroLatency
+from agents.agent_manager import AgentManager
+from agents.scheduler import Priority
+
+def _slow_agent(manager, agent_id, seconds):
+    """Make an agent take ``seconds`` to answer"""
+    agent = manager.agents[agent_id]
+
+    async def process_message(message, **kwargs):
+        await asyncio.sleep(seconds)
+        return f"{agent.name} finally answered"
+
+    agent.process_message = process_message
+
+def test_deadline_returns_partial_results():
+    """A hung agent yields a placeholder instead of holding the turn"""
+    print("Testing deadline with a slow agent...")
+    manager = AgentManager(latency_model=ZeroLatency())
+    _slow_agent(manager, 'tech', 1.0)
+
+    async def run():
+        follow_ups = []
+
+        async def on_late(response, placeholder):
+            follow_ups.append((response, placeholder))
+
+        started = time.perf_counter()
+        responses = await manager.process_user_message(
+            "Build a product", ['pm', 'tech'], deadline=0.1, on_late_response=on_late
+        )
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(1.2)
+        return responses, elapsed, follow_ups
+
+    responses, elapsed, follow_ups = asyncio.run(run())
+    assert elapsed < 0.5
+    assert [r.agentId for r in responses] == ['pm', 'tech']
+    assert responses[1].pending and not responses[0].pending
+    assert len(follow_ups) == 1
+    assert follow_ups[0][0].content.startswith("Tech Architect finally answered")
+    assert follow_ups[0][1].id == responses[1].id
+    print(f"✓ Turn returned in {elapsed:.2f}s with a placeholder and one follow-up")
+
+def test_hedged_retry_wins():
+    """When the first attempt stalls past p95, the hedge answers"""
+    print("\nTesting hedged retries...")
+    manager = AgentManager(latency_model=ZeroLatency(), hedging=True)
+    for _ in range(50):
+        manager.latency_trackers['market'].observe(0.01)
+
+    agent = manager.agents['market']
+    calls = []
+
+    async def process_message(message, **kwargs):
+        calls.append(message)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return "hedged answer"
+
+    agent.process_message = process_message
+
+    started = time.perf_counter()
+    responses = asyncio.run(manager.process_user_message("market size?", ['market'], deadline=2.0))
+    elapsed = time.perf_counter() - started
+    assert len(calls) == 2
+    assert responses[0].content.startswith("hedged answer")
+    assert elapsed < 1.0
+    print(f"✓ Hedge answered in {elapsed:.2f}s after {len(calls)} attempts")
+
+def test_cancelled_caller_cancels_attempts():
+    """A caller cancelled before the hedge fires takes the first attempt down with it"""
+    print("\nTesting cancellation of hedged turns...")
+    manager = AgentManager(latency_model=ZeroLatency(), hedging=True)
+    for _ in range(50):
+        manager.latency_trackers['market'].observe(1.0)
+
+    cancelled = []
+
+    async def process_message(message, **kwargs):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(message)
+            raise
+        return "too late"
+
+    manager.agents['market'].process_message = process_message
+
+    async def run():
+        turn = asyncio.create_task(manager._run_hedged('market', "market size?", Priority.INTERACTIVE))
+        await asyncio.sleep(0.1)
+        turn.cancel()
+        try:
+            await turn
+        except asyncio.CancelledError:
+            pass
+        await asyncio.sleep(0.05)
+        # Checked before asyncio.run cancels whatever is left on the loop
+        assert cancelled == ["market size?"]
+
+    asyncio.run(run())
+    print("✓ First attempt cancelled with its caller")
+
+def test_invalid_deadlines_rejected():
+    """Deadlines must be positive numbers over HTTP and on the WebSocket"""
+    print("\nTesting deadline validation...")
+    os.environ.setdefault("RATE_LIMIT_PER_SECOND", "0")
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    for deadline in [0, -1, "soon"]:
+        response = client.post("/api/chat/message", json={"content": "hi", "agents": ["pm"], "deadline": deadline})
+        assert response.status_code == 422, deadline
+    assert client.get("/api/chat/stream", params={"message": "hi", "deadline": "-2"}).status_code == 422
+
+    with client.websocket_connect("/ws") as websocket:
+        websocket.send_json({"type": "user_message", "message": "hi", "agents": ["pm"], "deadline": "soon"})
+        frame = websocket.receive_json()
+        assert frame == {"type": "error", "message": "deadline must be a positive number of seconds"}
+        assert main.ws_deadline.validate_python("2.5") == 2.5
+    print("✓ Zero, negative and non-numeric deadlines rejected")
+
+if __name__ == "__main__":
+    print("Testing deadlines and hedging...")
+
+    test_deadline_returns_partial_results()
+    test_hedged_retry_wins()
+    test_cancelled_caller_cancels_attempts()
+    test_invalid_deadlines_rejected()
+
+    print("\n✓ All deadline tests passed!")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test hot reload of agent modules and rule files
+"""
+import asyncio
+import json
+import sys
+import os
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Source edits in this test land within the same second, so skip cached bytecode
+sys.dont_write_bytecode = True
+
+from agents.registry import AgentRegistry
+from agents.hot_reload import AgentFileWatcher
+from agents.agent_manager import AgentManager
+from services.latency import ZeroLatency
+
+MODULE_TEMPLATE = '''
+import asyncio
+from agents.base_agent import BaseAgent, intent_handler
+
+class GreeterAgent(BaseAgent):
+    intent_rules = [('greet', ['hello'])]
+    default_intent = 'greet'
+    greeting = {greeting!r}
+
+    def __init__(self):
+        super().__init__(agent_id="greeter", name="Greeter", role="Greeter")
+
+    async def process_message(self, message, intent=None):
+        return await self.handle_intent(intent or self.route_intent(message), message)
+
+    @intent_handler
+    async def _greet(self, message):
+        await asyncio.sleep({delay})
+        return self.greeting
+
+    @intent_handler
+    async def _wave(self, message):
+        return "wave"
+'''
+
+def _write_agent(path, greeting, delay=0.0, rules=None):
+    with open(os.path.join(path, "greeter_agent_plugin.py"), "w") as f:
+        f.write(MODULE_TEMPLATE.format(greeting=greeting, delay=delay))
+    config = {"id": "greeter", "name": "Greeter", "role": "Greeter", "avatar": "👋",
+              "entry_point": "greeter_agent_plugin:GreeterAgent"}
+    if rules is not None:
+        config["intent_rules"] = rules
+    with open(os.path.join(path, "greeter.json"), "w") as f:
+        json.dump(config, f)
+
+def _setup():
+    path = tempfile.mkdtemp()
+    _write_agent(path, "hello v1", delay=0.2)
+    sys.path.insert(0, path)
+    sys.modules.pop("greeter_agent_plugin", None)
+    registry = AgentRegistry.discover([path])
+    return path, registry, AgentManager(latency_model=ZeroLatency(), registry=registry)
+
+def test_reload_swaps_instance_after_in_flight_request():
+    """An in-flight request finishes on the old agent while new ones use the reloaded code"""
+    print("Testing module reload...")
+    path, registry, manager = _setup()
+
+    async def run():
+        in_flight = asyncio.create_task(manager.process_user_message("hello", ['greeter']))
+        await asyncio.sleep(0.05)
+        old = registry['greeter']
+        _write_agent(path, "hello again v2")
+        assert manager.reload_agent('greeter') == ['greeter']
+        after = await manager.process_user_message("hello", ['greeter'])
+        return old, await in_flight, after
+
+    old, before, after = asyncio.run(run())
+    assert registry['greeter'] is not old
+    assert before[0].content.startswith("hello v1")
+    assert after[0].content.startswith("hello again v2")
+    print("✓ Old request answered v1, new request answered v2")
+
+def test_rule_file_change_is_picked_up_by_watcher():
+    """Editing a rules file reloads the agent and re-routes without a restart"""
+    print("\nTesting rule file reload...")
+    path, registry, manager = _setup()
+    asyncio.run(manager.process_user_message("hello", ['greeter']))
+    version = manager.catalog_version
+    watcher = AgentFileWatcher(registry)
+    assert watcher.check() == []
+
+    _write_agent(path, "hello v1", rules=[["wave", ["hello"]]])
+    config_path = os.path.join(path, "greeter.json")
+    stat = os.stat(config_path)
+    os.utime(config_path, (stat.st_atime, stat.st_mtime + 5))
+
+    assert watcher.check() == ['greeter']
+    assert manager.router.route("hello", ['greeter']) == {'greeter': 'wave'}
+    assert manager.catalog_version == version + 1
+    print("✓ Watcher reloaded the agent and its new rules")
+
+def test_taxonomy_change_reloads_pm():
+    """Editing the domain taxonomy reloads the PM agent with the new domains"""
+    print("\nTesting taxonomy reload...")
+    from agents.taxonomy import DEFAULT_TAXONOMY_PATH
+    with open(DEFAULT_TAXONOMY_PATH, "r", encoding="utf-8") as f:
+        taxonomy = json.load(f)
+    taxonomy_path = os.path.join(tempfile.mkdtemp(), "domains.json")
+    with open(taxonomy_path, "w", encoding="utf-8") as f:
+        json.dump(taxonomy, f)
+
+    previous = os.environ.get("DOMAIN_TAXONOMY_PATH")
+    os.environ["DOMAIN_TAXONOMY_PATH"] = taxonomy_path
+    try:
+        registry = AgentRegistry.discover()
+        old = registry['pm']
+        assert registry.watched_files()[taxonomy_path] == ['pm']
+        watcher = AgentFileWatcher(registry)
+        assert watcher.check() == []
+
+        taxonomy["domains"].append({"id": "gardening", "synonyms": ["garden"], "features": ["Planting calendar"]})
+        with open(taxonomy_path, "w", encoding="utf-8") as f:
+            json.dump(taxonomy, f)
+        stat = os.stat(taxonomy_path)
+        os.utime(taxonomy_path, (stat.st_atime, stat.st_mtime + 5))
+
+        assert watcher.check() == ['pm']
+        assert registry['pm'] is not old
+        assert registry['pm'].taxonomy.components("An app for my garden")['features'] == ["Planting calendar"]
+    finally:
+        if previous is None:
+            os.environ.pop("DOMAIN_TAXONOMY_PATH", None)
+        else:
+            os.environ["DOMAIN_TAXONOMY_PATH"] = previous
+    print("✓ Watcher reloaded the PM with the new domain")
+
+def test_broken_reload_keeps_old_agent():
+    """A module that fails to import leaves the running agent in place"""
+    print("\nTesting a failed reload...")
+    path, registry, manager = _setup()
+    old = registry['greeter']
+    with open(os.path.join(path, "greeter_agent_plugin.py"), "w") as f:
+        f.write("def broken(:\n")
+    try:
+        manager.reload_agent('greeter')
+        assert False, "expected a SyntaxError"
+    except SyntaxError:
+        pass
+    assert registry['greeter'] is old
+    print("✓ Old agent kept serving")
+
+if __name__ == "__main__":
+    print("Testing hot reload...")
+
+    test_reload_swaps_instance_after_in_flight_request()
+    test_rule_file_change_is_picked_up_by_watcher()
+    test_taxonomy_change_reloads_pm()
+    test_broken_reload_keeps_old_agent()
+
+    print("\n✓ All hot reload tests passed!")
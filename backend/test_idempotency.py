@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test Idempotency-Key response storage and ULID task ids
+"""
+import asyncio
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.idempotency import IdempotencyKeyReusedError, IdempotencyStore
+from services.ids import ULIDGenerator, new_id
+
+def test_ulids_are_unique_and_ordered():
+    """Ids from one generator strictly increase, even within one millisecond"""
+    print("Testing ULIDs...")
+    generator = ULIDGenerator()
+    same_ms = [generator.new(now=1700000000.0) for _ in range(1000)]
+    assert len(set(same_ms)) == 1000
+    assert same_ms == sorted(same_ms)
+    assert all(len(ulid) == 26 for ulid in same_ms)
+    # A clock stepping back does not break the order
+    assert generator.new(now=1690000000.0) > same_ms[-1]
+    assert generator.new(now=1800000000.0) > same_ms[-1]
+    ids = [new_id() for _ in range(10000)]
+    assert len(set(ids)) == 10000 and ids == sorted(ids)
+    print("✓ 1000 ids in one millisecond, all distinct and sorted")
+
+def test_repeated_key_replays_response():
+    """The second request with a key gets the stored body without running again"""
+    print("\nTesting replays...")
+    store = IdempotencyStore()
+    calls = []
+
+    async def build():
+        calls.append(1)
+        return {"task": {"id": new_id()}}
+
+    async def run():
+        first = await store.run("ip:1", "/api/tasks", "k1", {"title": "a"}, build)
+        second = await store.run("ip:1", "/api/tasks", "k1", {"title": "a"}, build)
+        other_client = await store.run("ip:2", "/api/tasks", "k1", {"title": "a"}, build)
+        return first, second, other_client
+
+    first, second, other_client = asyncio.run(run())
+    assert first[1] is False and second[1] is True
+    assert first[0].body == second[0].body
+    assert other_client[1] is False and other_client[0].body != first[0].body
+    assert len(calls) == 2
+    print("✓ Replayed per client, built once per key")
+
+def test_concurrent_retries_share_one_run():
+    """A retry arriving mid-flight waits for the first attempt"""
+    print("\nTesting concurrent retries...")
+    store = IdempotencyStore()
+    calls = []
+
+    async def build():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"responses": []}
+
+    async def run():
+        return await asyncio.gather(*[
+            store.run("ip:1", "/api/chat/message", "k", {"content": "hi"}, build) for _ in range(5)
+        ])
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert sorted(replayed for _, replayed in results) == [False, True, True, True, True]
+    print("✓ 5 concurrent requests, 1 agent run")
+
+def test_key_reuse_and_failures():
+    """A key reused for another payload is rejected; failures are not stored"""
+    print("\nTesting key reuse and failures...")
+    store = IdempotencyStore()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("agent timeout")
+        return {"ok": True}
+
+    async def run():
+        try:
+            await store.run("ip:1", "/api/tasks", "k", {"title": "a"}, flaky)
+            assert False, "expected the first attempt to fail"
+        except RuntimeError:
+            pass
+        stored, replayed = await store.run("ip:1", "/api/tasks", "k", {"title": "a"}, flaky)
+        assert not replayed and stored.body == b'{"ok":true}'
+        try:
+            await store.run("ip:1", "/api/tasks", "k", {"title": "b"}, flaky)
+            assert False, "expected IdempotencyKeyReusedError"
+        except IdempotencyKeyReusedError:
+            pass
+        try:
+            await store.run("ip:1", "/api/tasks", "", {"title": "a"}, flaky)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+    asyncio.run(run())
+    assert len(attempts) == 2
+    print("✓ Retry after a failure runs again; reused key rejected")
+
+def test_store_is_bounded_and_expires():
+    """Old keys fall off the LRU end and expire after the TTL"""
+    print("\nTesting bounds...")
+
+    async def build():
+        return {}
+
+    async def run():
+        bounded = IdempotencyStore(max_entries=50)
+        for index in range(500):
+            await bounded.run("ip:1", "/api/tasks", f"k{index}", {}, build)
+        expiring = IdempotencyStore(ttl=0.0)
+        await expiring.run("ip:1", "/api/tasks", "k", {}, build)
+        _, replayed = await expiring.run("ip:1", "/api/tasks", "k", {}, build)
+        return len(bounded), replayed
+
+    size, replayed = asyncio.run(run())
+    assert size == 50
+    assert replayed is False
+    print("✓ 500 keys held in 50 entries; expired keys run again")
+
+if __name__ == "__main__":
+    print("Testing idempotency keys...")
+
+    test_ulids_are_unique_and_ordered()
+    test_repeated_key_replays_response()
+    test_concurrent_retries_share_one_run()
+    test_key_reuse_and_failures()
+    test_store_is_bounded_and_expires()
+
+    print("\n✓ All idempotency tests passed!")
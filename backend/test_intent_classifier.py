@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test the BM25 intent classifier and the confidences it gives agent responses
+"""
+import asyncio
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.agent_manager import AgentManager
+from agents.intent_classifier import IntentClassifier
+from agents.registry import AgentRegistry
+from agents.routing import IntentMatch, IntentRouter
+from services.latency import ZeroLatency
+
+def _classifier():
+    return IntentClassifier.from_configs(AgentRegistry.discover().configs)
+
+def test_classifies_each_agent():
+    """Each agent gets its own best intent with a confidence in (0, 1]"""
+    print("Testing classification...")
+    classifier = _classifier()
+    matches = classifier.classify("Who are our competitors and how should we price it?")
+    assert matches['market'].intent == 'analyze_competitors'
+    assert classifier.classify("Plan the first sprint and timeline", ['sprint'])['sprint'].intent == 'create_sprint_plan'
+    assert classifier.classify("Help me write the pitch deck", ['pitch'])['pitch'].intent == 'create_pitch_outline'
+    assert all(0 < match.confidence <= 1 for match in matches.values())
+    assert 0 < classifier.temperature
+    print(f"✓ Routed to {matches['market'].intent} with confidence {matches['market'].confidence}")
+
+def test_unknown_words_and_batches():
+    """Messages sharing no term with the examples get no match; batches agree with single messages"""
+    print("\nTesting unmatched messages and batches...")
+    classifier = _classifier()
+    assert classifier.classify("Tell me something") == {}
+    assert classifier.classify("") == {}
+    assert 'greeter' not in classifier
+
+    messages = ["What tech stack should we use?", "Tell me something", "", "how should we price it"]
+    assert classifier.classify_batch(messages) == [classifier.classify(message) for message in messages]
+    print(f"✓ Batch of {len(messages)} matches one-by-one classification")
+
+def test_responses_carry_router_confidence():
+    """Confidence comes from the classifier, and is None where keyword rules decided"""
+    print("\nTesting response confidences...")
+    manager = AgentManager(latency_model=ZeroLatency())
+
+    async def run():
+        classified = await manager.process_user_message("What tech stack should we use?", ['tech'])
+        unmatched = await manager.process_user_message("Tell me something", ['tech'])
+        return classified[0], unmatched[0]
+
+    classified, unmatched = asyncio.run(run())
+    assert 0.5 < classified.confidence <= 1
+    assert unmatched.confidence is None
+    print(f"✓ Tech stack answer confidence {classified.confidence}")
+
+def test_weak_matches_fall_back():
+    """Classifier picks below min_confidence give way to keyword rules and the previous intent"""
+    print("\nTesting the confidence threshold...")
+    agents = AgentRegistry.discover()
+    router = IntentRouter(agents, _classifier, min_confidence=0.3)
+    message = "What tech stack should we use?"
+    assert router.classifier.classify(message, ['sprint'])['sprint'].confidence < 0.3
+
+    matches = router.classify(message, ['tech', 'sprint'], fallbacks={'sprint': 'create_sprint_plan'})
+    assert matches['tech'].intent == 'recommend_tech_stack' and matches['tech'].confidence > 0.9
+    assert matches['sprint'] == IntentMatch('create_sprint_plan')
+    assert router.classify(message, ['sprint'])['sprint'] == IntentMatch(agents['sprint'].default_intent)
+
+    permissive = IntentRouter(agents, _classifier, min_confidence=0)
+    assert permissive.classify(message, ['sprint'], {'sprint': 'create_sprint_plan'})['sprint'].confidence < 0.3
+    print(f"✓ Sprint match kept only without a threshold; fell back to {matches['sprint'].intent}")
+
+def test_keyword_rules_without_numpy():
+    """Without numpy the classifier is skipped and the keyword rules route every message"""
+    print("\nTesting routing without numpy...")
+    saved = {name: sys.modules.pop(name) for name in ["agents.intent_classifier", "numpy"] if name in sys.modules}
+    sys.modules["numpy"] = None  # makes "import numpy" raise ImportError
+    try:
+        manager = AgentManager(latency_model=ZeroLatency())
+        responses = asyncio.run(manager.process_user_message("What tech stack should we use?", ['tech']))
+        assert manager.router.classifier is None and manager.router.classifier_factory is None
+        assert responses[0].confidence is None
+        assert manager.router.route("Plan the first sprint", ['sprint']) == {'sprint': 'create_sprint_plan'}
+    finally:
+        del sys.modules["numpy"]
+        sys.modules.pop("agents.intent_classifier", None)
+        sys.modules.update(saved)
+    print("✓ Routed by keyword rules")
+
+if __name__ == "__main__":
+    print("Testing intent classification...")
+
+    test_classifies_each_agent()
+    test_unknown_words_and_batches()
+    test_responses_carry_router_confidence()
+    test_weak_matches_fall_back()
+    test_keyword_rules_without_numpy()
+
+    print("\n✓ All intent classifier tests passed!")
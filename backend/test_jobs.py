@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test background jobs: dedup, results, TTLs and persistence across restarts
+"""
+import asyncio
+import sys
+import os
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pydantic import BaseModel
+from services.admission import OverloadedError
+from services.jobs import JobManager, JobStatus, JobStore
+
+class EchoParams(BaseModel):
+    text: str
+
+def _manager(calls, store=None, **kwargs):
+    jobs = JobManager(store=store, **kwargs)
+
+    async def echo(text):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        if text == "fail":
+            raise RuntimeError("boom")
+        return {"echo": text}
+
+    jobs.register("echo", echo, EchoParams)
+    return jobs
+
+async def _wait(jobs, job_id):
+    while jobs.get(job_id).status not in (JobStatus.SUCCEEDED, JobStatus.FAILED):
+        await asyncio.sleep(0.005)
+    return jobs.get(job_id)
+
+def test_jobs_run_and_dedupe():
+    """Identical pending jobs share one run; finished jobs carry results or errors"""
+    print("Testing job runs...")
+    calls, finished = [], []
+
+    async def run():
+        jobs = _manager(calls, workers=2)
+        async def listener(job):
+            finished.append(job.id)
+        jobs.add_listener(listener)
+        jobs.start()
+        first, duplicate = jobs.submit("echo", {"text": "hi"}), jobs.submit("echo", {"text": "hi"})
+        failing, _ = jobs.submit("echo", {"text": "fail"})
+        done = await _wait(jobs, first[0].id)
+        failed = await _wait(jobs, failing.id)
+        again, deduplicated = jobs.submit("echo", {"text": "hi"})
+        await _wait(jobs, again.id)
+        await jobs.stop()
+        return first, duplicate, done, failed, again, deduplicated
+
+    first, duplicate, done, failed, again, deduplicated = asyncio.run(run())
+    assert duplicate == (first[0], True) and first[1] is False
+    assert done.result == {"echo": "hi"} and done.expires_at is not None
+    assert failed.status == JobStatus.FAILED and failed.error == "boom"
+    assert again.id != first[0].id and deduplicated is False
+    assert calls.count("hi") == 2 and len(finished) == 3
+    print("✓ Duplicate submission shared a job; failures recorded")
+
+def test_every_submitting_session_is_notified():
+    """A deduplicated submission from another session is told when the shared job finishes"""
+    print("\nTesting job subscribers...")
+    path = os.path.join(tempfile.mkdtemp(), "jobs.sqlite3")
+    calls, notified = [], []
+
+    async def run():
+        jobs = _manager(calls, store=JobStore(path))
+        async def listener(job):
+            notified.append(set(job.session_ids))
+        jobs.add_listener(listener)
+        job, _ = jobs.submit("echo", {"text": "hi"}, session_id="s1")
+        for session_id in ["s2", "s1", None]:
+            assert jobs.submit("echo", {"text": "hi"}, session_id=session_id) == (job, True)
+        stored = {stored.id: stored for stored in JobStore(path).load_all()}
+        jobs.start()
+        await _wait(jobs, job.id)
+        await jobs.stop()
+        return stored[job.id]
+
+    stored = asyncio.run(run())
+    assert calls == ["hi"]
+    assert notified == [{"s1", "s2"}]
+    assert stored.session_ids == {"s1", "s2"}
+    print("✓ Both sessions notified of one run")
+
+def test_store_defaults_to_memory():
+    """Without JOB_STORE_PATH nothing is written to disk"""
+    print("\nTesting the default store...")
+    previous = os.environ.pop("JOB_STORE_PATH", None)
+    try:
+        assert JobManager.from_env().store.path == ":memory:"
+    finally:
+        if previous is not None:
+            os.environ["JOB_STORE_PATH"] = previous
+    print("✓ In-memory store by default")
+
+def test_validation_limits_and_ttl():
+    """Bad parameters are rejected, pending work is bounded and results expire"""
+    print("\nTesting validation, limits and TTLs...")
+    calls = []
+
+    async def run():
+        jobs = _manager(calls, max_pending=1, result_ttl=0.05)
+        for params in ({}, {"text": None}):
+            try:
+                jobs.submit("echo", params)
+                assert False, "expected ValueError"
+            except ValueError:
+                pass
+        job, _ = jobs.submit("echo", {"text": "a"})
+        try:
+            jobs.submit("echo", {"text": "b"})
+            assert False, "expected OverloadedError"
+        except OverloadedError:
+            pass
+        jobs.start()
+        await _wait(jobs, job.id)
+        await asyncio.sleep(0.06)
+        expired = jobs.get(job.id)
+        purged = jobs.purge_expired()
+        await jobs.stop()
+        return expired, purged, jobs
+
+    expired, purged, jobs = asyncio.run(run())
+    assert expired is None and purged == 1
+    assert jobs.store.load_all() == []
+    print("✓ Invalid and excess jobs rejected; results expired")
+
+def test_pending_jobs_survive_restart():
+    """Jobs queued when the process stops run when it starts again"""
+    print("\nTesting restart...")
+    path = os.path.join(tempfile.mkdtemp(), "jobs.sqlite3")
+    calls = []
+
+    async def submit():
+        jobs = _manager(calls, store=JobStore(path))
+        job, _ = jobs.submit("echo", {"text": "later"})
+        return job.id
+
+    async def restart(job_id):
+        jobs = _manager(calls, store=JobStore(path))
+        jobs.start()
+        job = await _wait(jobs, job_id)
+        await jobs.stop()
+        return job
+
+    job_id = asyncio.run(submit())
+    assert calls == []
+    job = asyncio.run(restart(job_id))
+    assert job.status == JobStatus.SUCCEEDED and job.result == {"echo": "later"}
+    stored = {job.id: job for job in JobStore(path).load_all()}
+    assert stored[job_id].status == JobStatus.SUCCEEDED
+    print("✓ Queued job resumed after restart")
+
+if __name__ == "__main__":
+    print("Testing background jobs...")
+
+    test_jobs_run_and_dedupe()
+    test_every_submitting_session_is_notified()
+    test_store_defaults_to_memory()
+    test_validation_limits_and_ttl()
+    test_pending_jobs_survive_restart()
+
+    print("\n✓ All job tests passed!")
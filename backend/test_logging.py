@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test log sampling, rate limiting, structured fields and the queued handler
+"""
+import logging
+import random
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services import logging_setup
+from services.logging_setup import (
+    RateLimitFilter, SamplingFilter, StructuredFormatter, configure_logging, log_fields, shutdown_logging
+)
+
+def _record(name: str, level: int = logging.INFO, msg: str = "event", args=(), **extra) -> logging.LogRecord:
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_sampling_filter_rates():
+    """DEBUG/INFO records are kept at the configured rate; warnings always pass"""
+    print("Testing log sampling...")
+    random.seed(1)
+    sampling = SamplingFilter({"agents": 0.1, "agents.pm": 0.5})
+    kept = sum(sampling.filter(_record("agents.tech")) for _ in range(10000))
+    assert 850 < kept < 1150, kept
+    kept = sum(sampling.filter(_record("agents.pm.routing")) for _ in range(10000))
+    assert 4700 < kept < 5300, kept
+    assert all(sampling.filter(_record("agents.tech", logging.WARNING)) for _ in range(100))
+    assert all(sampling.filter(_record("main")) for _ in range(100))
+    print("✓ 10% for agents, 50% for the more specific agents.pm, warnings and other loggers kept")
+
+def test_rate_limit_filter_per_logger():
+    """Each logger gets its own bucket; excess INFO records are dropped and counted"""
+    print("\nTesting log rate limits...")
+    limiter = RateLimitFilter({"chatty": 5})
+    first = [limiter.filter(_record("chatty.a")) for _ in range(100)]
+    second = [limiter.filter(_record("chatty.b")) for _ in range(100)]
+    assert sum(first) == 5 and first[:5] == [True] * 5
+    assert sum(second) == 5
+    assert limiter.dropped == 190
+    assert limiter.filter(_record("chatty.a", logging.ERROR))
+    assert all(limiter.filter(_record("quiet")) for _ in range(100))
+    print("✓ 5 records per logger per second, errors and unlimited loggers pass")
+
+def test_structured_formatter_redacts_and_truncates():
+    """Sensitive keys are redacted, long values cut, callables rendered when formatted"""
+    print("\nTesting structured fields...")
+    formatter = StructuredFormatter(fmt="%(message)s", max_field_length=60)
+    calls = []
+
+    def expensive():
+        calls.append(1)
+        return "computed"
+
+    record = _record("main", msg="Turn %s", args=("done",), **log_fields(
+        api_key="sk-live-123", headers={"Authorization": "Bearer x", "accept": "json"},
+        content="x" * 100, lazy=expensive, agents=["pm"]))
+    assert calls == []
+    line = formatter.format(record)
+    assert line.startswith("Turn done api_key=[redacted] ")
+    assert "'Authorization': '[redacted]'" in line and "'accept': 'json'" in line
+    assert "Bearer" not in line and "sk-live" not in line
+    assert "content=" + "x" * 60 + "...(+40 chars)" in line
+    assert "lazy=computed" in line and calls == [1]
+    assert line.endswith("agents=['pm']")
+    print("✓ Keys redacted, 100-char value truncated to 60, callable evaluated once")
+
+def test_queued_records_flushed_on_shutdown():
+    """Records are formatted on the listener thread and all written by shutdown_logging"""
+    print("\nTesting the queued handler...")
+    was_configured = logging_setup._listener is not None
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    shutdown_logging()
+
+    lines = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            lines.append(self.format(record))
+
+    collector = Collect()
+    collector.setFormatter(StructuredFormatter(fmt="%(name)s %(message)s"))
+    try:
+        listener = configure_logging(level="DEBUG", sample_rates={}, rate_limits={})
+        listener.handlers = (collector,)
+        state = {"turn": 1}
+        logger = logging.getLogger("test.queue")
+        for index in range(500):
+            logger.info("record %d", index, extra=log_fields(state=state))
+        shutdown_logging()
+        assert len(lines) == 500
+        assert lines[0].startswith("test.queue record 0 state=")
+        assert lines[-1].startswith("test.queue record 499")
+    finally:
+        shutdown_logging()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+        if was_configured:
+            for handler in saved_handlers:
+                root.removeHandler(handler)
+            configure_logging()
+    print("✓ 500 queued records written by shutdown_logging")
+
+if __name__ == "__main__":
+    print("Testing logging setup...")
+
+    test_sampling_filter_rates()
+    test_rate_limit_filter_per_logger()
+    test_structured_formatter_redacts_and_truncates()
+    test_queued_records_flushed_on_shutdown()
+
+    print("\n✓ All logging tests passed!")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test per-session conversation memory
+"""
+import asyncio
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.memory import ConversationMemory, summarize
+from agents.agent_manager import AgentManager
+from services.latency import ZeroLatency
+
+def test_follow_up_stays_on_topic():
+    """A follow-up naming no topic is answered in the context of the previous turn"""
+    print("Testing follow-ups within a session...")
+    manager = AgentManager(latency_model=ZeroLatency())
+
+    async def run():
+        first = await manager.process_user_message("What tech stack should we use?", ['tech'], session_id="s1")
+        follow_up = await manager.process_user_message("Tell me more", ['tech'], session_id="s1")
+        fresh = await manager.process_user_message("Tell me more", ['tech'])
+        return first, follow_up, fresh
+
+    first, follow_up, fresh = asyncio.run(run())
+    assert follow_up[0].content == first[0].content
+    assert fresh[0].content != first[0].content
+    context = manager.memory.context("s1", 'tech')
+    assert [turn.message for turn in context.turns] == ["What tech stack should we use?", "Tell me more"]
+    print("✓ Follow-up routed to the previous intent")
+
+def test_follow_up_reads_earlier_turns():
+    """The PM reads the product from earlier turns when a follow-up doesn't name it"""
+    print("\nTesting replies that depend on earlier turns...")
+    manager = AgentManager(latency_model=ZeroLatency())
+
+    async def run():
+        await manager.process_user_message("I want to build a fitness app for runners", ['pm'], session_id="s1")
+        follow_up = await manager.process_user_message("Add offline mode", ['pm'], session_id="s1")
+        fresh = await manager.process_user_message("Add offline mode", ['pm'], session_id="s2")
+        return follow_up[0].content, fresh[0].content
+
+    follow_up, fresh = asyncio.run(run())
+    assert "break down 'Add offline mode'" in follow_up
+    assert "Health metrics tracking" in follow_up
+    assert "Health metrics tracking" not in fresh
+    context = manager.memory.context("s1", 'pm')
+    assert context.text(include_responses=False) == (
+        "User: I want to build a fitness app for runners\nUser: Add offline mode")
+    assert "Agent: Excellent!" in context.text()
+    print("✓ Follow-up broken down with the fitness features from the first turn")
+
+def test_ring_buffer_and_compaction():
+    """Old turns leave the ring buffer and are folded into a bounded summary"""
+    print("\nTesting compaction...")
+    memory = ConversationMemory(recent_turns=3, summary_chars=200)
+    for turn in range(10):
+        memory.record("s1", 'pm', f"Question {turn} about pricing.", f"Pricing answer {turn}. Use tiers.")
+    context = memory.context("s1", 'pm')
+    assert len(context.turns) == 3 and context.summary == ""
+    assert memory.compact_pending() == 1
+
+    context = memory.context("s1", 'pm')
+    assert 0 < len(context.summary) <= 200
+    assert context.summary.count("Use tiers.") == 1
+    assert memory.total_chars == memory.sessions["s1"].size
+    print(f"✓ Summary kept {len(context.summary)} characters of 7 old turns")
+
+def test_session_cap_and_eviction():
+    """Sessions stay under their cap and the least recently used ones are evicted"""
+    print("\nTesting memory caps...")
+    memory = ConversationMemory(max_sessions=3, max_session_chars=3000, summary_chars=300)
+    for turn in range(20):
+        for agent_id in ['pm', 'tech', 'market']:
+            memory.record("s1", agent_id, "A long pasted context. " * 40, f"Reply {turn}.")
+        assert memory.sessions["s1"].size <= 3000
+    assert memory.context("s1", 'pm').last_intent is None
+
+    for session in ["s2", "s3", "s4"]:
+        memory.record(session, 'pm', "hello", "hi")
+    assert list(memory.sessions) == ["s2", "s3", "s4"]
+    assert memory.total_chars == sum(session.size for session in memory.sessions.values())
+
+    memory.idle_seconds = 0
+    assert memory.evict_idle() == 3
+    assert len(memory) == 0 and memory.total_chars == 0
+    print("✓ Cap held and sessions evicted")
+
+def test_summarize_prefers_recurring_topics():
+    """Extractive summaries keep the sentences about what the conversation keeps returning to"""
+    print("\nTesting summarization...")
+    texts = ["Our pricing should use tiers.", "The weather is nice.", "Tiers make pricing simple."]
+    summary = summarize(texts, 60)
+    assert "pricing" in summary and "weather" not in summary
+    print(f"✓ Summary: {summary}")
+
+if __name__ == "__main__":
+    print("Testing conversation memory...")
+
+    test_follow_up_stays_on_topic()
+    test_follow_up_reads_earlier_turns()
+    test_ring_buffer_and_compaction()
+    test_session_cap_and_eviction()
+    test_summarize_prefers_recurring_topics()
+
+    print("\n✓ All conversation memory tests passed!")
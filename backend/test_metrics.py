@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test the in-process metrics registry and Prometheus exposition
+"""
+import asyncio
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.latency import ZeroLatency
+from services.metrics import Metric, MetricsRegistry, REGISTRY
+from agents.agent_manager import AgentManager
+
+def test_histogram_exposition():
+    """Histogram buckets are cumulative and end with +Inf"""
+    print("Testing histogram exposition...")
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo histogram", ["agent"], buckets=(0.1, 1.0))
+    child = histogram.labels("pm")
+    for value in (0.05, 0.1, 0.5, 2.0):
+        child.observe(value)
+
+    text = registry.render()
+    assert 'demo_seconds_bucket{agent="pm",le="0.1"} 2' in text
+    assert 'demo_seconds_bucket{agent="pm",le="1"} 3' in text
+    assert 'demo_seconds_bucket{agent="pm",le="+Inf"} 4' in text
+    assert 'demo_seconds_count{agent="pm"} 4' in text
+    print("✓ Histogram renders cumulative buckets")
+
+def test_counter_and_gauge():
+    """Counters and gauges render their current values"""
+    print("\nTesting counters and gauges...")
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Demo counter", ["cache", "result"])
+    counter.labels("catalog", "hit").inc()
+    counter.labels("catalog", "hit").inc()
+    gauge = registry.gauge("demo_connections", "Demo gauge")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    text = registry.render()
+    assert 'demo_total{cache="catalog",result="hit"} 2' in text
+    assert "demo_connections 1" in text
+    assert "# TYPE demo_total counter" in text
+    # Metric types must say how they store and render values
+    try:
+        Metric("demo_untyped", "Demo metric")
+        assert False, "expected TypeError"
+    except TypeError:
+        pass
+    print("✓ Counter and gauge values rendered")
+
+def test_agent_metrics_recorded():
+    """A chat turn records per-agent and per-intent latency"""
+    print("\nTesting agent metrics...")
+    manager = AgentManager(latency_model=ZeroLatency())
+    asyncio.run(manager.process_user_message("Tell me about competitors", ['market', 'pm']))
+
+    text = REGISTRY.render()
+    assert 'agent_response_seconds_count{agent="market"}' in text
+    assert 'agent_intent_seconds_count{agent="market",intent="analyze_competitors"}' in text
+    assert "agent_gather_seconds_count" in text
+    print("✓ Agent latency histograms populated")
+
+if __name__ == "__main__":
+    print("Testing metrics...")
+
+    test_histogram_exposition()
+    test_counter_and_gauge()
+    test_agent_metrics_recorded()
+
+    print("\n✓ All metrics tests passed!")
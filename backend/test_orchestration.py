@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test DAG workflows: parallel stages, memoization and the project analysis workflow
+"""
+import asyncio
+import sys
+import os
+import time
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.orchestration import Orchestrator, Stage, Workflow
+from agents.agent_manager import AgentManager
+from services.catalog import KeyedResourceCache
+from services.latency import ZeroLatency
+
+def _diamond(calls):
+    """a feeds b and c in parallel, both feed d; each stage takes 50ms"""
+    def stage(name):
+        async def run(inputs, upstream):
+            calls.append(name)
+            await asyncio.sleep(0.05)
+            return inputs["x"] + sum(upstream.values())
+        return run
+
+    return Workflow("diamond", [
+        Stage("d", stage("d"), depends_on=["b", "c"]),
+        Stage("b", stage("b"), depends_on=["a"]),
+        Stage("c", stage("c"), depends_on=["a"]),
+        Stage("a", stage("a")),
+    ])
+
+def test_independent_stages_run_in_parallel():
+    """The run takes the critical path, not the sum of the stages"""
+    print("Testing parallel stages...")
+    calls = []
+    workflow = _diamond(calls)
+    assert workflow.order == ["a", "b", "c", "d"]
+    result = asyncio.run(Orchestrator().run(workflow, {"x": 1}))
+    assert result.results == {"a": 1, "b": 2, "c": 2, "d": 5}
+    assert result.elapsed < 0.19
+    critical_seconds, path = workflow.critical_path(result.seconds)
+    assert path[0] == "a" and path[-1] == "d" and len(path) == 3
+    print(f"✓ 4 stages of 50ms finished in {result.elapsed * 1000:.0f}ms")
+
+def test_stage_results_are_memoized():
+    """Concurrent runs over the same inputs share each stage's work"""
+    print("\nTesting memoization...")
+    calls = []
+    workflow = _diamond(calls)
+    orchestrator = Orchestrator()
+
+    async def run():
+        first, second = await asyncio.gather(
+            orchestrator.run(workflow, {"x": 1}, key=1),
+            orchestrator.run(workflow, {"x": 1}, key=1))
+        third = await orchestrator.run(workflow, {"x": 1}, key=1)
+        await orchestrator.run(workflow, {"x": 2}, key=2)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first.results == second.results == third.results
+    assert sorted(calls) == ["a", "a", "b", "b", "c", "c", "d", "d"]
+    assert sorted(third.memo_hits) == ["a", "b", "c", "d"]
+    print("✓ Each stage ran once per distinct input")
+
+def test_invalid_workflows_and_failures():
+    """Cycles are rejected up front; a failing stage stops its dependents"""
+    print("\nTesting validation and failures...")
+    async def noop(inputs, upstream):
+        return None
+
+    for stages in ([Stage("a", noop, ["b"]), Stage("b", noop, ["a"])], [Stage("a", noop, ["missing"])]):
+        try:
+            Workflow("bad", stages)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+    ran = []
+    async def fail(inputs, upstream):
+        raise RuntimeError("boom")
+    async def after(inputs, upstream):
+        ran.append("after")
+
+    workflow = Workflow("failing", [Stage("fail", fail), Stage("after", after, ["fail"])])
+    try:
+        asyncio.run(Orchestrator().run(workflow, {}))
+        assert False, "expected RuntimeError"
+    except RuntimeError as e:
+        assert str(e) == "boom"
+    assert ran == []
+    print("✓ Bad workflows rejected and failures propagated")
+
+def test_project_analysis_uses_every_agent():
+    """analyze_project folds the PM, tech and market work together; plan_project adds sprint and pitch"""
+    print("\nTesting the project analysis workflow...")
+    manager = AgentManager(latency_model=ZeroLatency())
+    tech_agent = manager.agents['tech']
+    recommend = tech_agent.get_tech_recommendations
+    tech_calls = []
+
+    async def counted(requirements):
+        tech_calls.append(requirements)
+        return await recommend(requirements)
+
+    tech_agent.get_tech_recommendations = counted
+
+    async def run():
+        analysis = await manager.analyze_project("An AI tutor for finance students")
+        # The analysis does not wait for the plan, which goes on in the background
+        assert analysis.sprint_plan is None and analysis.pitch_deck is None
+        assert len(manager._follow_ups) == 1
+        return analysis, await manager.plan_project("An AI tutor for finance students")
+
+    analysis, plan = asyncio.run(run())
+    assert analysis.market_research["query"].startswith("An AI tutor")
+    assert any(entry.startswith("Backend:") for entry in analysis.tech_stack)
+    # The plan reused the analysis's memoized tech stage
+    assert len(tech_calls) == 1
+    sprint_plan, pitch_deck = plan["sprint_plan"], plan["pitch_deck"]
+    assert sprint_plan["capacity"]
+    assert pitch_deck["target_audience"] == "Students, parents, and educators"
+    # The sprint plan and the pitch both build on the tech stack and the market research
+    competitor = analysis.market_research["competitors"][0]["name"]
+    tasks = {task["id"]: task["description"] for task in sprint_plan["tasks"]}
+    assert "Next.js 14 components" in tasks["S1-T3"] and "PostgreSQL 15+" in tasks["S1-T1"]
+    assert any(competitor in goal for goal in sprint_plan["goals"])
+    slides = {slide["title"]: slide["content"] for slide in pitch_deck["slides"]}
+    assert slides["Market Opportunity"].startswith(analysis.market_research["market_size"])
+    assert competitor in slides["Competition"]
+    assert slides["Product Demo"].endswith("built on Next.js 14 and FastAPI")
+    print(f"✓ Analysis built from {len(manager.project_workflow.order)} stages, "
+          f"plan from {len(manager.plan_workflow.order)}")
+
+def test_project_analysis_cache():
+    """Agents run side by side where their inputs allow; repeats are served from the digest-keyed cache"""
+    print("\nTesting the project analysis cache...")
+    manager = AgentManager(latency_model=ZeroLatency())
+    workflow = manager.project_workflow
+    assert all(workflow.stages[name].depends_on == ("features",) for name in ["pm", "tech", "market"])
+    # No agent waits on another, so an analysis takes the breakdown plus the slowest single agent
+    assert workflow.critical_path({name: 1.0 for name in workflow.order}) == (3.0, ["features", "pm", "analysis"])
+    plan = manager.plan_workflow
+    assert plan.stages["sprint"].depends_on == ("tech", "market")
+    assert plan.stages["pitch"].depends_on == ("features", "tech", "market")
+
+    key = manager.analysis_key("An AI tutor")
+    assert key == manager.analysis_key("An AI tutor") and len(key) == 32
+    assert key != manager.analysis_key("An AI tutor", {"backend": 10})
+    assert key != manager.analysis_key("An AI tutor ")
+
+    cache = KeyedResourceCache("project_analysis_test")
+    builds = []
+
+    async def build():
+        builds.append(1)
+        return {"analysis": await manager.analyze_project("An AI tutor")}
+
+    async def run():
+        return [await cache.get(key, build) for _ in range(3)]
+
+    first, second, third = asyncio.run(run())
+    assert first is second is third and len(builds) == 1
+    assert b'"tech_stack"' in first.body
+    print("✓ Analysis built once and served from cache")
+
+if __name__ == "__main__":
+    print("Testing orchestration...")
+
+    test_independent_stages_run_in_parallel()
+    test_stage_results_are_memoized()
+    test_invalid_workflows_and_failures()
+    test_project_analysis_uses_every_agent()
+    test_project_analysis_cache()
+
+    print("\n✓ All orchestration tests passed!")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test per-client token bucket rate limiting
+"""
+import asyncio
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from services.rate_limit import MemoryBucketStore, RateLimitedError, RateLimitMiddleware, RateLimiter
+
+def test_bucket_refills_at_rate():
+    """A full bucket allows a burst, then one request per 1/rate seconds"""
+    print("Testing token buckets...")
+    store = MemoryBucketStore()
+
+    async def run():
+        burst = [await store.take("a", 2.0, 3.0, now=0.0) for _ in range(4)]
+        later = await store.take("a", 2.0, 3.0, now=0.5)
+        other = await store.take("b", 2.0, 3.0, now=0.5)
+        return burst, later, other
+
+    burst, later, other = asyncio.run(run())
+    assert [allowed for allowed, _ in burst] == [True, True, True, False]
+    assert burst[-1][1] == 0.5
+    assert later == (True, 0.0) and other == (True, 0.0)
+    print("✓ Burst of 3 then refilled at 2/s")
+
+def test_store_is_bounded():
+    """Idle clients are evicted once the store holds max_keys buckets"""
+    print("\nTesting the bucket bound...")
+    store = MemoryBucketStore(max_keys=100)
+
+    async def run():
+        for client in range(1000):
+            await store.take(f"client{client}", 1.0, 1.0, now=0.0)
+
+    asyncio.run(run())
+    assert len(store) == 100
+    print("✓ 1000 clients held in 100 buckets")
+
+def test_limiter_and_middleware():
+    """Over-limit requests get a cheap 429 before reaching the endpoint"""
+    print("\nTesting the limiter and middleware...")
+    limiter = RateLimiter(rate=0.001, burst=2)
+    try:
+        asyncio.run(limiter.check("c", "test", cost=3))
+        assert False, "expected RateLimitedError"
+    except RateLimitedError as e:
+        assert e.retry_after > 1
+
+    calls = []
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+
+    @app.get("/api/ping")
+    async def ping():
+        calls.append(1)
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    client = TestClient(app)
+    statuses = [client.get("/api/ping").status_code for _ in range(3)]
+    keyed = [client.get("/api/ping", headers={"X-API-Key": "secret"}).status_code for _ in range(3)]
+    rejected = client.get("/api/ping")
+    assert statuses == [200, 200, 429] and keyed == [200, 200, 429] and len(calls) == 4
+    assert rejected.json()["detail"] == "Rate limit exceeded" and int(rejected.headers["retry-after"]) > 1
+    assert all(client.get("/health").status_code == 200 for _ in range(5))
+    print("✓ Per-client limits enforced on /api/* only")
+
+def test_disabled_by_env():
+    """RATE_LIMIT_PER_SECOND=0 turns limiting off"""
+    print("\nTesting configuration...")
+    os.environ["RATE_LIMIT_PER_SECOND"] = "0"
+    try:
+        assert RateLimiter.from_env() is None
+    finally:
+        del os.environ["RATE_LIMIT_PER_SECOND"]
+    assert isinstance(RateLimiter.from_env().store, MemoryBucketStore)
+    print("✓ Limiter configurable from the environment")
+
+if __name__ == "__main__":
+    print("Testing rate limiting...")
+
+    test_bucket_refills_at_rate()
+    test_store_is_bounded()
+    test_limiter_and_middleware()
+    test_disabled_by_env()
+
+    print("\n✓ All rate limit tests passed!")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test agent discovery and lazy loading through the registry
+"""
+import asyncio
+import json
+import sys
+import os
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.registry import AgentRegistry, CONFIG_DIR
+from agents.agent_manager import AgentManager
+from services.latency import ZeroLatency
+
+PLUGIN_MODULE = '''
+from agents.base_agent import BaseAgent, intent_handler
+
+class EchoAgent(BaseAgent):
+    intent_rules = [('echo', ['echo'])]
+    default_intent = 'echo'
+
+    def __init__(self):
+        super().__init__(agent_id="echo", name="Echo", role="Echo")
+
+    async def process_message(self, message, intent=None):
+        return await self.handle_intent(intent or self.route_intent(message), message)
+
+    @intent_handler
+    async def _echo(self, message):
+        return message
+'''
+
+def _plugin_dir() -> str:
+    """A config directory plus module for an agent that lives outside agents/"""
+    path = tempfile.mkdtemp()
+    with open(os.path.join(path, "echo_agent_plugin.py"), "w") as f:
+        f.write(PLUGIN_MODULE)
+    with open(os.path.join(path, "echo.json"), "w") as f:
+        json.dump({"id": "echo", "name": "Echo", "role": "Echo", "avatar": "🔁", "order": 5,
+                   "entry_point": "echo_agent_plugin:EchoAgent"}, f)
+    with open(os.path.join(path, "broken.json"), "w") as f:
+        json.dump({"id": "broken"}, f)
+    sys.path.insert(0, path)
+    return path
+
+def test_discovery_is_lazy():
+    """Configs are discovered without importing agent modules"""
+    print("Testing lazy discovery...")
+    registry = AgentRegistry.discover([CONFIG_DIR, _plugin_dir()])
+    assert list(registry) == ['echo', 'pm', 'tech', 'market', 'pitch', 'sprint']
+    assert 'broken' not in registry
+    assert 'echo_agent_plugin' not in sys.modules
+    assert registry.loaded() == {}
+
+    agent = registry['echo']
+    assert 'echo_agent_plugin' in sys.modules
+    assert registry['echo'] is agent
+    assert list(registry.loaded()) == ['echo']
+    assert registry.import_seconds['echo'] >= 0
+    print(f"✓ Discovered {len(registry)} agents and loaded only the one used")
+
+def test_manager_uses_plugin_agent():
+    """A config-directory agent takes part in chat turns like a built-in one"""
+    print("\nTesting a plugin agent in a chat turn...")
+    registry = AgentRegistry.discover([CONFIG_DIR, _plugin_dir()])
+    manager = AgentManager(latency_model=ZeroLatency(), registry=registry)
+    responses = asyncio.run(manager.process_user_message("echo this", ['echo']))
+    assert responses[0].content.startswith("echo this")
+    assert list(registry.loaded()) == ['echo']
+    assert manager.list_agents()[0].id == 'echo'
+    print("✓ Plugin agent answered without loading the built-in agents")
+
+if __name__ == "__main__":
+    print("Testing agent registry...")
+
+    test_discovery_is_lazy()
+    test_manager_uses_plugin_agent()
+
+    print("\n✓ All registry tests passed!")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test weighted fair dispatch in the agent scheduler
+"""
+import asyncio
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.scheduler import AgentScheduler, Priority
+
+async def _saturate(scheduler: AgentScheduler):
+    """Hold every slot until the returned event is set"""
+    release = asyncio.Event()
+    holders = [asyncio.create_task(scheduler.submit(Priority.BULK, release.wait))
+               for _ in range(scheduler.max_workers)]
+    await asyncio.sleep(0)
+    assert scheduler.running == scheduler.max_workers
+    return release, holders
+
+def test_weighted_dispatch_order():
+    """Under contention freed slots go 8:2:1 to interactive, background and bulk"""
+    print("Testing weighted dispatch...")
+    scheduler = AgentScheduler(max_workers=1)
+    order = []
+
+    async def job(priority):
+        order.append(priority)
+
+    async def run():
+        release, holders = await _saturate(scheduler)
+        jobs = [asyncio.create_task(scheduler.submit(priority, job, priority))
+                for priority in Priority for _ in range(22)]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*holders, *jobs)
+
+    asyncio.run(run())
+    for window in (order[:11], order[11:22]):
+        assert [window.count(priority) for priority in Priority] == [8, 2, 1], window
+    assert len(order) == 66
+    print("✓ Each round of 11 dispatches is 8 interactive, 2 background, 1 bulk")
+
+def test_interactive_skips_queued_backlog():
+    """A chat job queued behind a large background and bulk backlog gets the next free slot"""
+    print("\nTesting interactive latency under a backlog...")
+    scheduler = AgentScheduler(max_workers=2)
+    order = []
+
+    async def job(name):
+        order.append(name)
+        await asyncio.sleep(0)
+
+    async def run():
+        release, holders = await _saturate(scheduler)
+        backlog = [asyncio.create_task(scheduler.submit(priority, job, priority.value))
+                   for priority in (Priority.BULK, Priority.BACKGROUND) for _ in range(100)]
+        await asyncio.sleep(0)
+        chat = asyncio.create_task(scheduler.submit(Priority.INTERACTIVE, job, "chat"))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*holders, *backlog, chat)
+
+    asyncio.run(run())
+    assert order[0] == "chat", order[:5]
+    print(f"✓ Chat job ran first, ahead of {len(order) - 1} queued jobs")
+
+def test_cancelled_waiters_leave_the_queue():
+    """Cancelling a queued job removes it, and its turn goes to a live job"""
+    print("\nTesting cancelled queued jobs...")
+    scheduler = AgentScheduler(max_workers=1)
+    ran = []
+
+    async def job(name):
+        ran.append(name)
+
+    async def run():
+        release, holders = await _saturate(scheduler)
+        cancelled = [asyncio.create_task(scheduler.submit(Priority.INTERACTIVE, job, "cancelled"))
+                     for _ in range(5)]
+        live = asyncio.create_task(scheduler.submit(Priority.BULK, job, "live"))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["classes"]["interactive"]["queued"] == 5
+        for task in cancelled:
+            task.cancel()
+        await asyncio.gather(*cancelled, return_exceptions=True)
+        assert scheduler.stats()["classes"]["interactive"]["queued"] == 0
+        release.set()
+        await asyncio.gather(*holders, live)
+
+    asyncio.run(run())
+    assert ran == ["live"]
+    assert scheduler.running == 0
+    assert all(values["queued"] == 0 for values in scheduler.stats()["classes"].values())
+    print("✓ 5 cancelled jobs dropped from the queue; slot went to the live job")
+
+def test_stats_report_queue_wait_per_class():
+    """Jobs that start at once wait 0s; queued ones report how long they waited"""
+    print("\nTesting queue wait stats...")
+    scheduler = AgentScheduler(max_workers=1)
+
+    async def job():
+        pass
+
+    async def run():
+        await scheduler.submit(Priority.INTERACTIVE, job)
+        release, holders = await _saturate(scheduler)
+        queued = asyncio.create_task(scheduler.submit(Priority.BACKGROUND, job))
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(*holders, queued)
+
+    asyncio.run(run())
+    classes = scheduler.stats()["classes"]
+    assert classes["interactive"]["dispatched"] == 1
+    assert classes["interactive"]["avg_wait_seconds"] == 0.0
+    assert classes["background"]["dispatched"] == 1
+    assert 0.04 <= classes["background"]["avg_wait_seconds"] < 1.0
+    # The slot holders started immediately
+    assert classes["bulk"]["dispatched"] == 1 and classes["bulk"]["avg_wait_seconds"] == 0.0
+    print(f"✓ Background job waited {classes['background']['avg_wait_seconds'] * 1000:.0f}ms for its slot")
+
+if __name__ == "__main__":
+    print("Testing the agent scheduler...")
+
+    test_weighted_dispatch_order()
+    test_interactive_skips_queued_backlog()
+    test_cancelled_waiters_leave_the_queue()
+    test_stats_report_queue_wait_per_class()
+
+    print("\n✓ All scheduler tests passed!")
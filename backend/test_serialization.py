@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test the fast serialization layer
+"""
+import json
+import sys
+import os
+from datetime import datetime
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.schemas import AgentResponse, Task
+from models.serialization import AGENT_LIST, FastJSONResponse, dumps, response_frame
+from agents.agent_manager import AgentManager
+from services.latency import ZeroLatency
+
+def test_frames_match_model_dump():
+    """Fast frames decode to the same data as the old model_dump frames"""
+    print("Testing response frames...")
+    response = AgentResponse(
+        id="pm_1", content="Plan — ✓", timestamp=datetime.now().isoformat(),
+        sender="Product Manager", agentId="pm", avatar="👨‍💼", confidence=0.9
+    )
+    old = {"type": "agent_response", **response.model_dump(), "followUpTo": "x"}
+    new = response_frame("agent_response", response, followUpTo="x")
+    assert new == old
+    assert new["type"] == "agent"
+    assert json.loads(dumps(new)) == json.loads(json.dumps(old))
+    print("✓ Frames match")
+
+def test_models_and_catalog():
+    """Nested models, enums and datetimes encode; the catalog validates as one list"""
+    print("\nTesting model encoding...")
+    task = Task(title="Ship", assignedTo="pm")
+    decoded = json.loads(dumps({"tasks": [task], "at": datetime(2024, 1, 1)}))
+    assert decoded["tasks"][0]["priority"] == "medium"
+    assert decoded["at"].startswith("2024-01-01T00:00:00")
+
+    manager = AgentManager(latency_model=ZeroLatency())
+    agents = AGENT_LIST.validate_python(list(manager.agent_configs.values()))
+    assert [agent.id for agent in agents] == list(manager.agent_configs)
+    body = json.loads(FastJSONResponse({"agents": agents}).body)
+    assert body["agents"][0]["name"] == "Product Manager"
+    assert "deadline" not in body["agents"][0]
+    print(f"✓ Encoded {len(agents)} agents")
+
+if __name__ == "__main__":
+    print("Testing serialization...")
+
+    test_frames_match_model_dump()
+    test_models_and_catalog()
+
+    print("\n✓ All serialization tests passed!")
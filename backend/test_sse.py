@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test Server-Sent Events turn streams and per-response callbacks
+"""
+import asyncio
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.admission import OverloadedError
+from services.latency import ZeroLatency
+from services.sse import TurnStreamRegistry, format_event, parse_last_event_id
+from agents.agent_manager import AgentManager
+
+def test_format_and_parse():
+    """Events encode multi-line data and ids round-trip"""
+    print("Testing SSE encoding...")
+    assert format_event("a\nb", event="agent", event_id="t:1") == "id: t:1\nevent: agent\ndata: a\ndata: b\n\n"
+    assert parse_last_event_id("abc:12") == ("abc", 12)
+    assert parse_last_event_id("abc") is None
+    assert parse_last_event_id(None) is None
+    print("✓ Encoding and Last-Event-ID parsing work")
+
+def test_stream_resume_and_heartbeat():
+    """A reader resuming after an id only sees later events"""
+    print("\nTesting stream resume...")
+
+    async def run():
+        registry = TurnStreamRegistry()
+        stream = registry.create()
+        stream.publish("agent", {"n": 1})
+        stream.publish("agent", {"n": 2})
+
+        async def finish():
+            await asyncio.sleep(0.05)
+            stream.publish("turn_complete", {"responses": 2})
+            stream.close()
+
+        asyncio.create_task(finish())
+        resumed = [event async for event in stream.read(after=1, heartbeat=0.01)]
+        return registry, stream, resumed
+
+    registry, stream, resumed = asyncio.run(run())
+    events = [event for event in resumed if not event.startswith(":")]
+    assert events[0].startswith(f"id: {stream.turn_id}:2\n")
+    assert "turn_complete" in events[1]
+    assert any(event.startswith(":") for event in resumed)
+    assert registry.get(stream.turn_id) is stream
+    print(f"✓ Resumed with {len(events)} events and {len(resumed) - len(events)} heartbeats")
+
+def test_full_registry_keeps_live_streams():
+    """Only finished streams make room; a registry of live streams refuses new ones"""
+    print("\nTesting stream eviction...")
+
+    async def run():
+        registry = TurnStreamRegistry(max_streams=2)
+        finished = registry.create()
+        live = registry.create()
+        finished.close()
+        newest = registry.create()
+        assert registry.get(finished.turn_id) is None
+        assert registry.get(live.turn_id) is live
+        try:
+            registry.create()
+            assert False, "expected OverloadedError"
+        except OverloadedError:
+            pass
+        assert registry.get(live.turn_id) is live and registry.get(newest.turn_id) is newest
+
+    asyncio.run(run())
+    print("✓ Live streams survived a full registry")
+
+def test_responses_stream_before_turn_completes():
+    """on_response sees each agent before process_user_message returns"""
+    print("\nTesting per-response callbacks...")
+    manager = AgentManager(latency_model=ZeroLatency())
+
+    async def run():
+        seen = []
+
+        async def on_response(response):
+            seen.append(response.agentId)
+
+        responses = await manager.process_user_message("Build a product", ['pm', 'tech'], on_response=on_response)
+        return seen, responses
+
+    seen, responses = asyncio.run(run())
+    assert sorted(seen) == ['pm', 'tech']
+    assert len(responses) == 2
+    print("✓ Both responses were streamed")
+
+if __name__ == "__main__":
+    print("Testing SSE streaming...")
+
+    test_format_and_parse()
+    test_stream_resume_and_heartbeat()
+    test_full_registry_keeps_live_streams()
+    test_responses_stream_before_turn_completes()
+
+    print("\n✓ All SSE tests passed!")
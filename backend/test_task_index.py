@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test the task search index
+"""
+import random
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.task_index import TaskIndex, TaskStore
+
+TASKS = [
+    {"id": "1", "title": "Market research for AI finance tool", "description": "Competitor pricing",
+     "status": "todo", "assignedTo": "market", "tags": ["research", "finance", "ai"]},
+    {"id": "2", "title": "Design landing page", "description": "Pricing section and market copy",
+     "status": "inprogress", "assignedTo": "pm", "tags": ["design", "web"]},
+    {"id": "3", "title": "Pricing experiments", "description": "A/B test the landing page",
+     "status": "todo", "assignedTo": "market", "tags": ["growth", "web"]},
+]
+
+def test_search_words_prefixes_and_filters():
+    """Every word and filter must match; the last word also matches as a prefix"""
+    print("Testing search...")
+    store = TaskStore(TASKS)
+
+    def ids(**query):
+        tasks, _ = store.search(**query)
+        return [task["id"] for task in tasks]
+
+    # Title matches rank first, then newest first
+    assert ids(text="pricing") == ["3", "2", "1"]
+    assert ids(text="the land") == ["2", "3"]
+    assert ids(text="landing pri") == ["3", "2"]
+    assert ids(text="landing pri", tags=["design"]) == ["2"]
+    assert ids(tags=["web", "growth"]) == ["3"]
+    assert ids(tags=["WEB"], status="todo") == ["3"]
+    assert ids(assignee="market") == ["3", "1"]
+    assert ids(text="finance", tags=["web"]) == []
+    assert ids(text="unknownword") == []
+    assert ids() == ["3", "2", "1"]
+    assert ids(limit=2, offset=1) == ["2", "1"]
+    assert store.search(text="pricing", limit=1) == ([store.get("3")], 3)
+    print("✓ Words, prefixes, tags and filters intersect")
+
+def test_updates_and_deletes_keep_index_current():
+    """Changing or deleting a task changes what it is found by"""
+    print("\nTesting incremental updates...")
+    store = TaskStore(TASKS)
+    version = store.version
+    store.update("2", {"title": "Design onboarding flow", "tags": ["design"]})
+    assert store.version == version + 1
+    assert [task["id"] for task in store.search("landing")[0]] == ["3"]
+    assert [task["id"] for task in store.search("onboard")[0]] == ["2"]
+    assert store.search(tags=["web"])[1] == 1
+
+    assert store.delete("3") and not store.delete("3")
+    assert store.search("landing")[1] == 0
+    assert store.search("experi")[1] == 0
+    assert "experiments" not in store.index._vocabulary
+    assert store.update("3", {"title": "Gone"}) is None
+    assert [task["id"] for task in store.list()] == ["1", "2"]
+    print("✓ Index follows updates and deletes")
+
+def test_matches_brute_force_at_scale():
+    """Sparse, dense and prefix postings agree with a scan over every task"""
+    print("\nTesting against a linear scan...")
+    rng = random.Random(3)
+    # Few enough words that no prefix reaches MAX_PREFIX_TERMS
+    vocabulary = [f"term{index}" for index in range(60)]
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    tasks = {}
+    index = TaskIndex()
+    for number in range(6000):
+        task = {
+            "title": " ".join(rng.choices(vocabulary, weights, k=3)),
+            "description": " ".join(rng.choices(vocabulary, weights, k=6)),
+            "status": rng.choice(["todo", "done"]),
+            "tags": rng.sample(["alpha", "beta", "gamma", "delta"], 2),
+        }
+        tasks[str(number)] = task
+        index.add(str(number), task)
+    for number in rng.sample(range(6000), 500):
+        index.remove(str(number))
+        del tasks[str(number)]
+
+    def scan(text, tags, status):
+        *exact, last = dict.fromkeys(text.split())
+        found = set()
+        for task_id, task in tasks.items():
+            words = set(f"{task['title']} {task['description']} {' '.join(task['tags'])}".split())
+            if (all(word in words for word in exact) and any(word.startswith(last) for word in words)
+                    and set(tags) <= set(task["tags"]) and (status is None or task["status"] == status)):
+                found.add(task_id)
+        return found
+
+    for _ in range(40):
+        text = " ".join(rng.choices(vocabulary[:20], k=rng.randint(0, 1))) + " " + rng.choice(["term1", "term2", "term", rng.choice(vocabulary)])
+        tags = rng.sample(["alpha", "beta", "gamma"], rng.randint(0, 2))
+        status = rng.choice([None, "todo"])
+        expected = scan(text, tags, status)
+        found, total = index.search(text, tags, status, limit=10_000)
+        assert total == len(expected) and set(found) == expected, text
+    print("✓ 40 random queries match a linear scan over 5500 tasks")
+
+if __name__ == "__main__":
+    print("Testing the task search index...")
+
+    test_search_words_prefixes_and_filters()
+    test_updates_and_deletes_keep_index_current()
+    test_matches_brute_force_at_scale()
+
+    print("\n✓ All task search tests passed!")
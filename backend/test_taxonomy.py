@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test the domain taxonomy and its trie matching
+"""
+import json
+import sys
+import os
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.taxonomy import Domain, DomainTaxonomy
+
+def test_builtin_domains():
+    """Synonyms match whole words and the most specific audience wins"""
+    print("Testing the built-in taxonomy...")
+    taxonomy = DomainTaxonomy.load()
+    components = taxonomy.components("An AI tutor for finance students")
+    assert components['domains'] == ['ai', 'finance', 'education']
+    assert components['audience'] == "Students, parents, and educators"
+    assert 'Transaction tracking' in components['features']
+    assert 'Progress tracking' in components['features']
+
+    # "ai" inside "email" is not a match
+    assert taxonomy.components("Send an email digest")['domains'] == []
+    assert taxonomy.components("Send an email digest")['features'][0] == 'User registration and profiles'
+    print(f"✓ Matched {components['domains']}")
+
+def test_leftmost_longest_phrases():
+    """Multi-word synonyms win over the single words inside them"""
+    print("\nTesting phrase matching...")
+    taxonomy = DomainTaxonomy([
+        Domain("ml", ["machine learning"], ["Models"]),
+        Domain("edu", ["learning"], ["Lessons"]),
+        Domain("voice", ["speech-to-text"], ["Transcripts"]),
+    ])
+    assert [domain.id for domain in taxonomy.match("A Machine Learning platform")] == ['ml']
+    assert [domain.id for domain in taxonomy.match("learning with speech to text")] == ['edu', 'voice']
+    assert taxonomy.match("machine") == []
+    print("✓ Phrases matched leftmost-longest")
+
+def test_taxonomy_file_and_validation():
+    """Taxonomies load from any file, and duplicate domains are rejected"""
+    print("\nTesting taxonomy files...")
+    path = os.path.join(tempfile.mkdtemp(), "domains.json")
+    with open(path, "w") as f:
+        json.dump({"default": {"features": ["Basics"]},
+                   "domains": [{"id": "pets", "synonyms": ["pet", "dog"], "features": ["Vet booking"],
+                                "audience": "Pet owners"}]}, f)
+    taxonomy = DomainTaxonomy.load(path)
+    assert taxonomy.components("an app for my dog")['audience'] == "Pet owners"
+    assert taxonomy.components("an app")['features'] == ["Basics"]
+
+    try:
+        DomainTaxonomy([Domain("a", ["x"], []), Domain("a", ["y"], [])])
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    print("✓ Custom taxonomy loaded and duplicates rejected")
+
+if __name__ == "__main__":
+    print("Testing domain taxonomy...")
+
+    test_builtin_domains()
+    test_leftmost_longest_phrases()
+    test_taxonomy_file_and_validation()
+
+    print("\n✓ All taxonomy tests passed!")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test the shared tokenizer and keyword extraction
+"""
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.tokenizer import TokenCache, iter_words, keyword_counts, tokenize
+from agents.tech_architect_agent import TechArchitectAgent
+
+def test_tokens_are_shared():
+    """The same message is tokenized once and every reader gets the same arrays"""
+    print("Testing shared tokens...")
+    message = "Design the API gateway. The gateway handles auth and the API rate limits."
+    tokens = tokenize(message)
+    assert tokenize(message) is tokens
+    assert tokens.keywords == ('design', 'api', 'gateway', 'handles', 'auth', 'rate', 'limits')
+    assert tokens.counts['gateway'] == 2
+    assert TechArchitectAgent()._extract_keywords(message) == list(tokens.keywords)
+    print(f"✓ {len(tokens.keywords)} keywords shared")
+
+def test_pronouns_are_stop_words():
+    """Pronouns and demonstratives are dropped along with the other common words"""
+    print("\nTesting stop words...")
+    message = "Can you build this for our team? That would help your users and it helps us."
+    assert tokenize(message).keywords == ('build', 'team', 'help', 'users', 'helps')
+    assert TechArchitectAgent()._extract_keywords(message) == ['build', 'team', 'help', 'users', 'helps']
+    print("✓ this, that, you, your and our dropped")
+
+def test_streaming_matches_whole_text():
+    """Chunked input gives the same words as the whole text, even across chunk boundaries"""
+    print("\nTesting streaming mode...")
+    text = "Invoice reconciliation, anomaly detection and cash-flow forecasting. " * 50
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    assert list(iter_words(chunks)) == list(iter_words(text)) == list(tokenize(text).words)
+    assert keyword_counts(chunks) == tokenize(text).counts
+    print("✓ Streaming counts match")
+
+def test_cache_is_bounded():
+    """The cache evicts by total characters as well as entry count"""
+    print("\nTesting the cache budget...")
+    cache = TokenCache(max_entries=10, max_chars=100)
+    for index in range(5):
+        cache.get(f"{index}" * 40)
+    assert cache.chars <= 100 and len(cache._entries) == 2
+    cache.get("x" * 500)
+    assert cache.chars <= 100
+    print("✓ Cache stayed within its budget")
+
+if __name__ == "__main__":
+    print("Testing tokenizer...")
+
+    test_tokens_are_shared()
+    test_pronouns_are_stop_words()
+    test_streaming_matches_whole_text()
+    test_cache_is_bounded()
+
+    print("\n✓ All tokenizer tests passed!")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test request-scoped tracing and JSONL export
+"""
+import asyncio
+import json
+import sys
+import os
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.latency import ZeroLatency
+from services.tracing import JsonlTraceExporter, NOOP_SPAN, tracer
+from agents.agent_manager import AgentManager
+
+def test_sampling_off_is_noop():
+    """With sampling disabled every span is the shared no-op"""
+    print("Testing disabled tracing...")
+    tracer.sample_rate = 0.0
+    with tracer.span("ws.message") as span:
+        assert span is NOOP_SPAN
+        assert tracer.span("agent.intent") is NOOP_SPAN
+    print("✓ Disabled tracing returns the no-op span")
+
+def test_trace_exported_with_nested_spans():
+    """A sampled chat turn exports one trace covering the agent and intent spans"""
+    print("\nTesting trace export...")
+    path = os.path.join(tempfile.mkdtemp(), "traces.jsonl")
+    exporter = JsonlTraceExporter(path)
+    tracer.sample_rate = 1.0
+    tracer.exporter = exporter
+    try:
+        manager = AgentManager(latency_model=ZeroLatency())
+
+        async def run():
+            with tracer.span("ws.message", type="user_message"):
+                await manager.process_user_message("Build a product idea", ['pm', 'tech'])
+
+        asyncio.run(run())
+    finally:
+        tracer.sample_rate = 0.0
+        tracer.exporter = None
+        exporter.close()
+
+    with open(path, "r", encoding="utf-8") as f:
+        traces = [json.loads(line) for line in f]
+    assert len(traces) == 1
+    spans = traces[0]["spans"]
+    names = {span["name"] for span in spans}
+    assert {"ws.message", "agent.generate_response", "agent.intent", "agent_manager.gather"} <= names
+    assert len({span["span_id"] for span in spans}) == len(spans)
+    intents = {span["attributes"].get("intent") for span in spans if span["name"] == "agent.intent"}
+    assert "analyze_product_idea" in intents
+    print(f"✓ Exported trace with {len(spans)} spans")
+
+if __name__ == "__main__":
+    print("Testing tracing...")
+
+    test_sampling_off_is_noop()
+    test_trace_exported_with_nested_spans()
+
+    print("\n✓ All tracing tests passed!")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test WebSocket subprotocol negotiation and frame codecs
+"""
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.ws_protocol import CODECS, DeflateCodec, FrameCodec, PRESET_DICTIONARY, negotiate
+
+FRAME = {
+    "type": "agent",
+    "id": "pm_1700000000000",
+    "content": "**📋 Product Management Framework I recommend:**\n1. Define the problem clearly\n\n— Product Manager",
+    "sender": "Product Manager",
+    "agentId": "pm",
+    "avatar": "👨‍💼",
+    "confidence": 0.9
+}
+
+def test_negotiation():
+    """The client's first supported subprotocol wins; unknown ones fall back to JSON"""
+    print("Testing subprotocol negotiation...")
+    assert negotiate([]) is None
+    assert negotiate(["unknown"]) is None
+    assert negotiate(["unknown", "json.deflate", "json"]).name == "json.deflate"
+    if "msgpack" in CODECS:
+        assert negotiate(["msgpack", "json"]).name == "msgpack"
+    print(f"✓ Negotiation works with codecs: {sorted(CODECS)}")
+
+def test_codecs_round_trip():
+    """Every codec decodes what a peer codec encoded, across several frames"""
+    print("\nTesting codec round trips...")
+    for name, factory in CODECS.items():
+        sender, receiver = factory(), factory()
+        for i in range(3):
+            frame = dict(FRAME, id=f"pm_{i}")
+            assert receiver.decode(sender.encode(frame)) == frame, name
+    print(f"✓ {len(CODECS)} codecs round-trip")
+
+def test_deflate_shrinks_frames():
+    """The preset dictionary helps from the very first frame"""
+    print("\nTesting deflate with a preset dictionary...")
+    plain = len(FrameCodec().encode(FRAME).encode("utf-8"))
+    without = len(DeflateCodec(FrameCodec(), dictionary=b"").encode(FRAME))
+    with_dictionary = len(DeflateCodec(FrameCodec()).encode(FRAME))
+    assert PRESET_DICTIONARY
+    assert with_dictionary < without < plain
+    print(f"✓ First frame: {plain} bytes JSON, {without} deflated, {with_dictionary} with dictionary")
+
+if __name__ == "__main__":
+    print("Testing WebSocket protocol...")
+
+    test_negotiation()
+    test_codecs_round_trip()
+    test_deflate_shrinks_frames()
+
+    print("\n✓ All WebSocket protocol tests passed!")
@@ -2,6 +2,11 @@
 
 import { useState, useRef, useEffect } from 'react'
 import { Send, Bot, User } from 'lucide-react'
+import { decodeMsgpack } from '@/lib/msgpack'
+
+// Offer compact msgpack framing; the server falls back to JSON text if it can't.
+// The browser negotiates permessage-deflate underneath either way.
+const WS_PROTOCOLS = ['msgpack', 'json']
 
 export default function ChatInterface({ messages, setMessages, agents }) {
   const [inputMessage, setInputMessage] = useState('')
@@ -20,7 +25,8 @@ export default function ChatInterface({ messages, setMessages, agents }) {
 
   useEffect(() => {
     // Initialize WebSocket connection to backend
-    const newSocket = new WebSocket('ws://localhost:8000/ws')
+    const newSocket = new WebSocket('ws://localhost:8000/ws', WS_PROTOCOLS)
+    newSocket.binaryType = 'arraybuffer'
 
     newSocket.onopen = () => {
       setIsConnected(true)
@@ -34,7 +40,9 @@ export default function ChatInterface({ messages, setMessages, agents }) {
 
     newSocket.onmessage = (event) => {
       try {
-        const response = JSON.parse(event.data)
+        const response = typeof event.data === 'string'
+          ? JSON.parse(event.data)
+          : decodeMsgpack(event.data)
         if (response.type === 'agent') {
           setMessages(prev => [...prev, response])
         }
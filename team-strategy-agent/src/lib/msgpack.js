@@ -0,0 +1,77 @@
+// Minimal MessagePack decoder for the /ws "msgpack" subprotocol.
+// Covers the types the backend emits: nil, booleans, ints, floats,
+// strings, binary, arrays and maps.
+
+const textDecoder = new TextDecoder()
+
+export function decodeMsgpack(buffer) {
+  const view = new DataView(buffer)
+  const bytes = new Uint8Array(buffer)
+  let offset = 0
+
+  const readString = (length) => {
+    const value = textDecoder.decode(bytes.subarray(offset, offset + length))
+    offset += length
+    return value
+  }
+
+  const readArray = (length) => {
+    const value = new Array(length)
+    for (let i = 0; i < length; i++) value[i] = read()
+    return value
+  }
+
+  const readMap = (length) => {
+    const value = {}
+    for (let i = 0; i < length; i++) {
+      const key = read()
+      value[key] = read()
+    }
+    return value
+  }
+
+  const next = (size, getter) => {
+    const value = getter.call(view, offset)
+    offset += size
+    return value
+  }
+
+  function read() {
+    const type = bytes[offset++]
+
+    if (type <= 0x7f) return type
+    if (type >= 0xe0) return type - 0x100
+    if ((type & 0xf0) === 0x80) return readMap(type & 0x0f)
+    if ((type & 0xf0) === 0x90) return readArray(type & 0x0f)
+    if ((type & 0xe0) === 0xa0) return readString(type & 0x1f)
+
+    switch (type) {
+      case 0xc0: return null
+      case 0xc2: return false
+      case 0xc3: return true
+      case 0xc4: { const n = next(1, view.getUint8); offset += n; return bytes.slice(offset - n, offset) }
+      case 0xc5: { const n = next(2, view.getUint16); offset += n; return bytes.slice(offset - n, offset) }
+      case 0xc6: { const n = next(4, view.getUint32); offset += n; return bytes.slice(offset - n, offset) }
+      case 0xca: return next(4, view.getFloat32)
+      case 0xcb: return next(8, view.getFloat64)
+      case 0xcc: return next(1, view.getUint8)
+      case 0xcd: return next(2, view.getUint16)
+      case 0xce: return next(4, view.getUint32)
+      case 0xcf: return Number(next(8, view.getBigUint64))
+      case 0xd0: return next(1, view.getInt8)
+      case 0xd1: return next(2, view.getInt16)
+      case 0xd2: return next(4, view.getInt32)
+      case 0xd3: return Number(next(8, view.getBigInt64))
+      case 0xd9: return readString(next(1, view.getUint8))
+      case 0xda: return readString(next(2, view.getUint16))
+      case 0xdb: return readString(next(4, view.getUint32))
+      case 0xdc: return readArray(next(2, view.getUint16))
+      case 0xdd: return readArray(next(4, view.getUint32))
+      case 0xde: return readMap(next(2, view.getUint16))
+      case 0xdf: return readMap(next(4, view.getUint32))
+      default: throw new Error(`Unsupported msgpack type 0x${type.toString(16)}`)
+    }
+  }
+
+  return read()
+}